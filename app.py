@@ -1,4 +1,5 @@
 import ctypes
+import multiprocessing
 import os
 import signal
 import sys
@@ -33,6 +34,9 @@ def excepthook(exc_type: type[BaseException], exc_value: BaseException, exc_trac
     os.kill(os.getpid(), signal.SIGTERM)
 
 if __name__ == "__main__":
+    # 打包后使用进程池时，子进程需要在此处接管执行
+    multiprocessing.freeze_support()
+
     # 捕获全局异常
     sys.excepthook = lambda exc_type, exc_value, exc_traceback: excepthook(exc_type, exc_value, exc_traceback)
 
@@ -76,6 +76,18 @@ class Base():
         EXCLUDED = "EXCLUDED"                                               # 已排除
         DUPLICATED = "DUPLICATED"                                           # 重复条目
 
+    # 请求错误类型
+    class RequestError(StrEnum):
+
+        NONE = "NONE"                                                       # 无错误
+        RATE_LIMIT = "RATE_LIMIT"                                           # 限流
+        AUTH = "AUTH"                                                       # 鉴权失败
+        TIMEOUT = "TIMEOUT"                                                 # 超时
+        NETWORK = "NETWORK"                                                 # 网络错误
+        CLIENT = "CLIENT"                                                   # 请求参数错误
+        SERVER = "SERVER"                                                   # 服务端错误
+        OTHER = "OTHER"                                                     # 其他错误
+
     # 构造函数
     def __init__(self) -> None:
         pass
@@ -0,0 +1,63 @@
+import gc
+import time
+import tracemalloc
+from typing import Any
+from typing import Callable
+
+from rich import box
+from rich.console import Console
+from rich.table import Table
+
+class BenchmarkHelper():
+
+    # 基准测试的公共工具，所有基准测试脚本使用固定的随机种子生成数据，以保证结果可以复现
+    # 在仓库根目录下以 python -m benchmark.<脚本名> 的方式运行
+
+    # 随机种子
+    SEED: int = 42
+
+    # 计时，重复执行多次并返回 (最短耗时, 最后一次的结果)
+    @classmethod
+    def measure(cls, function: Callable[[], Any], repeat: int = 5) -> tuple[float, Any]:
+        best: float = float("inf")
+        result: Any = None
+        for _ in range(repeat):
+            gc.collect()
+            start = time.perf_counter()
+            result = function()
+            best = min(best, time.perf_counter() - start)
+
+        return best, result
+
+    # 统计峰值内存，返回 (峰值内存字节数, 结果)
+    @classmethod
+    def measure_memory(cls, function: Callable[[], Any]) -> tuple[int, Any]:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            result = function()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        return peak, result
+
+    # 打印结果表格，每一行为 (项目, 旧实现, 新实现) 的耗时或内存，自动计算加速比
+    @classmethod
+    def print_table(cls, title: str, unit: str, rows: list[tuple[str, float, float]]) -> None:
+        table = Table(
+            title = title,
+            box = box.ASCII2,
+            expand = False,
+            highlight = True,
+        )
+        table.add_column("Case")
+        table.add_column(f"Legacy ({unit})", justify = "right")
+        table.add_column(f"Current ({unit})", justify = "right")
+        table.add_column("Ratio", justify = "right")
+
+        for name, legacy, current in rows:
+            ratio = legacy / current if current > 0 else float("inf")
+            table.add_row(name, f"{legacy:.3f}", f"{current:.3f}", f"{ratio:.2f}x")
+
+        Console().print(table)
\ No newline at end of file
@@ -0,0 +1,92 @@
+import json
+import random
+
+import json_repair as repair
+
+from benchmark.BenchmarkHelper import BenchmarkHelper
+from module.Response.ResponseDecoder import ResponseDecoder
+
+# 模型回复解析的基准测试
+# 旧实现对每一行都调用 json_repair，与当前先跳过不可能是术语条目的行、再使用标准库解析、失败时才修复的实现对比
+# 语料模拟常见的模型回复：思考内容、说明文字、代码块标记、格式正确的条目与少量格式错误的条目
+# 运行方式：python -m benchmark.bench_decoder
+
+# 回复数量
+RESPONSE_COUNT: int = 2000
+
+# 旧实现的解析
+def legacy_decode(response: str) -> tuple[list[str], list[dict[str, str]]]:
+    dsts: list[str] = []
+    glossary: list[dict[str, str]] = []
+
+    for line in response.splitlines():
+        json_data = repair.loads(line)
+        if isinstance(json_data, dict):
+            if all(v in json_data for v in ("src", "dst", "type")):
+                src: str = json_data.get("src")
+                dst: str = json_data.get("dst")
+                type: str = json_data.get("type")
+                glossary.append(
+                    {
+                        "src": src if isinstance(src, str) else "",
+                        "dst": dst if isinstance(dst, str) else "",
+                        "info": type if isinstance(type, str) else "",
+                    }
+                )
+
+    return dsts, glossary
+
+# 生成语料，broken 为格式错误的条目所占的比例，prose 为是否包含思考内容与说明文字
+def generate_corpus(count: int, entries: tuple[int, int], broken: float, prose: bool) -> list[str]:
+    rng = random.Random(BenchmarkHelper.SEED)
+    names = ["ダリヤ", "ヴォルフ", "カルロ", "イルマ", "マルチェラ", "オルディネ", "王都", "魔物討伐部隊"]
+    dsts = ["达莉亚", "沃尔夫", "卡洛", "伊露玛", "马尔切拉", "奥迪涅", "王都", "魔物讨伐部队"]
+    types = ["女性人名", "男性人名", "地名", "组织"]
+
+    corpus: list[str] = []
+    for _ in range(count):
+        lines: list[str] = []
+
+        # 思考内容与说明文字
+        if prose == True:
+            lines.append("<think>")
+            lines.extend("分析原文中出现的专有名词，并判断其类型。" for _ in range(rng.randint(2, 8)))
+            lines.append("</think>")
+            lines.append("以下是提取到的术语：")
+            lines.append("```jsonl")
+
+        # 术语条目，格式错误的条目缺少结尾的括号或使用单引号
+        for _ in range(rng.randint(*entries)):
+            i = rng.randrange(len(names))
+            entry = json.dumps({"src": names[i], "dst": dsts[i], "type": rng.choice(types)}, ensure_ascii = False)
+            if rng.random() < broken:
+                entry = entry[:-1] if rng.random() < 0.5 else entry.replace("\"", "'")
+            lines.append(entry)
+
+        if prose == True:
+            lines.append("```")
+        corpus.append("\n".join(lines))
+
+    return corpus
+
+def main() -> None:
+    decoder = ResponseDecoder()
+
+    rows: list[tuple[str, float, float]] = []
+    for name, corpus in (
+        ("well-formed entries", generate_corpus(RESPONSE_COUNT, (3, 12), 0.0, False)),
+        ("prose only", generate_corpus(RESPONSE_COUNT, (0, 0), 0.0, True)),
+        ("broken entries", generate_corpus(RESPONSE_COUNT, (3, 12), 1.0, False)),
+        ("mixed (5% broken)", generate_corpus(RESPONSE_COUNT, (3, 12), 0.05, True)),
+    ):
+        line_count = sum(len(v.splitlines()) for v in corpus)
+        legacy_time, legacy_result = BenchmarkHelper.measure(lambda: [legacy_decode(v) for v in corpus], repeat = 3)
+        current_time, current_result = BenchmarkHelper.measure(lambda: [decoder.decode(v) for v in corpus], repeat = 3)
+        assert legacy_result == current_result
+
+        rows.append((f"{name} ({line_count / legacy_time:.0f} -> {line_count / current_time:.0f} lines/s)", legacy_time * 1000, current_time * 1000))
+
+    BenchmarkHelper.print_table(f"Response decode ({RESPONSE_COUNT} responses per case, best of 3)", "ms", rows)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
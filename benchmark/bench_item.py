@@ -0,0 +1,195 @@
+import dataclasses
+import random
+import threading
+
+import tiktoken
+
+from base.Base import Base
+from benchmark.BenchmarkHelper import BenchmarkHelper
+from model.Item import Item
+from module.Filter.RuleFilter import RuleFilter
+from module.ItemTable import ItemTable
+
+# 条目的内存占用、过滤、Token 计数与切分片段的基准测试
+# 旧实现为每个条目持有线程锁、每次调用都重新编码原文的数据类，与当前的条目及 ItemTable 对比
+# 运行方式：python -m benchmark.bench_item
+
+# 条目数量
+ITEM_COUNT: int = 20000
+
+# 片段的 Token 阈值
+TOKEN_THRESHOLD: int = 384
+
+@dataclasses.dataclass
+class LegacyItem():
+
+    # 旧实现的条目，只保留基准测试用到的字段与方法
+
+    src: str = ""
+    dst: str = ""
+    name_src: str | list[str] = None
+    name_dst: str | list[str] = None
+    extra_field: str | dict = ""
+    tag: str = ""
+    row: int = 0
+    file_type: Item.FileType = Item.FileType.NONE
+    file_path: str = ""
+    text_type: Item.TextType = Item.TextType.NONE
+    status: Base.ProjectStatus = Base.ProjectStatus.NONE
+    retry_count: int = 0
+
+    # 线程锁
+    lock: threading.Lock = dataclasses.field(init = False, repr = False, compare = False, default_factory = threading.Lock)
+
+    def get_src(self) -> str:
+        with self.lock:
+            return self.src
+
+    def get_file_path(self) -> str:
+        with self.lock:
+            return self.file_path
+
+    def get_status(self) -> Base.ProjectStatus:
+        with self.lock:
+            return self.status
+
+    def set_status(self, status: Base.ProjectStatus) -> None:
+        with self.lock:
+            self.status = status
+
+    def get_token_count(self) -> int:
+        return len(tiktoken.get_encoding("o200k_base").encode(self.get_src()))
+
+# 生成原文，游戏文本中存在大量重复的短句
+def generate_srcs(count: int) -> list[tuple[str, str]]:
+    rng = random.Random(BenchmarkHelper.SEED)
+    words = ["勇者", "魔王", "スライム", "ポーション", "王都", "騎士団", "こんにちは", "ありがとう", "それでは", "行こう"]
+    pool = [
+        "".join(rng.choice(words) for _ in range(rng.randint(2, 12))) + rng.choice(("。", "！", "？", "……"))
+        for _ in range(count // 4)
+    ]
+    pool.extend(("BGM/battle.ogg", "SE/click.wav", "EV001", "   "))
+
+    srcs: list[tuple[str, str]] = []
+    for i in range(count):
+        src = rng.choice(pool)
+        if rng.random() < 0.1:
+            src = src + "\n" + rng.choice(pool)
+        srcs.append((src, f"data/Map{i // 500:03d}.json"))
+
+    return srcs
+
+# 旧实现的过滤
+def legacy_filter(items: list[LegacyItem]) -> int:
+    count = 0
+    for item in items:
+        if RuleFilter.filter(item.get_src()) == True:
+            count = count + 1
+            item.set_status(Base.ProjectStatus.EXCLUDED)
+
+    return count
+
+# 当前实现的过滤
+def current_filter(items: list[Item]) -> int:
+    table = ItemTable(items)
+    mask = table.filter(RuleFilter.filter)
+
+    return len(table.set_status(mask, Base.ProjectStatus.EXCLUDED))
+
+# 旧实现的切分片段
+def legacy_chunks(items: list[LegacyItem], token_threshold: int) -> list[list[LegacyItem]]:
+    line_limit = max(8, int(token_threshold / 16))
+
+    line_length: int = 0
+    token_length: int = 0
+    chunk: list[LegacyItem] = []
+    chunks: list[list[LegacyItem]] = []
+    for item in items:
+        if item.get_status() != Base.ProjectStatus.NONE:
+            continue
+
+        current_line_length = sum(1 for line in item.get_src().splitlines() if line.strip())
+        current_token_length = item.get_token_count()
+        if len(chunk) == 0:
+            pass
+        elif (
+            line_length + current_line_length > line_limit
+            or token_length + current_token_length > token_threshold
+            or item.get_file_path() != chunk[-1].get_file_path()
+        ):
+            chunks.append(chunk)
+
+            chunk = []
+            line_length = 0
+            token_length = 0
+
+        chunk.append(item)
+        line_length = line_length + current_line_length
+        token_length = token_length + current_token_length
+
+    if len(chunk) > 0:
+        chunks.append(chunk)
+
+    return chunks
+
+# 当前实现的切分片段，cold 为 True 时清除已计算的 Token 数量
+def current_chunks(items: list[Item], token_threshold: int, cold: bool) -> list[list[Item]]:
+    if cold == True:
+        for item in items:
+            item.token_count = -1
+
+    return ItemTable(items).generate_chunks(token_threshold, max(8, int(token_threshold / 16)), 8)
+
+# 当前实现的 Token 计数
+def current_count_tokens(items: list[Item]) -> list[int]:
+    for item in items:
+        item.token_count = -1
+    Item.count_tokens(items)
+
+    return [item.token_count for item in items]
+
+def main() -> None:
+    srcs = generate_srcs(ITEM_COUNT)
+
+    # 预热编码器
+    tiktoken.get_encoding("o200k_base").encode("warmup")
+    Item.get_encoder()
+
+    # 内存占用
+    legacy_memory, legacy_items = BenchmarkHelper.measure_memory(lambda: [LegacyItem(src = s, file_path = p) for s, p in srcs])
+    current_memory, current_items = BenchmarkHelper.measure_memory(lambda: [Item(src = s, file_path = p) for s, p in srcs])
+    BenchmarkHelper.print_table(
+        f"Item memory ({ITEM_COUNT} items)",
+        "bytes/item",
+        [("construct", legacy_memory / ITEM_COUNT, current_memory / ITEM_COUNT)],
+    )
+
+    # Token 计数
+    legacy_count_time, legacy_counts = BenchmarkHelper.measure(lambda: [item.get_token_count() for item in legacy_items], repeat = 3)
+    current_count_time, current_counts = BenchmarkHelper.measure(lambda: current_count_tokens(current_items), repeat = 3)
+    assert legacy_counts == current_counts
+
+    # 过滤
+    legacy_filter_time, legacy_excluded = BenchmarkHelper.measure(lambda: legacy_filter(legacy_items), repeat = 3)
+    current_filter_time, current_excluded = BenchmarkHelper.measure(lambda: current_filter(current_items), repeat = 3)
+    assert legacy_excluded == current_excluded
+
+    # 切分片段
+    legacy_chunk_time, legacy_result = BenchmarkHelper.measure(lambda: legacy_chunks(legacy_items, TOKEN_THRESHOLD), repeat = 3)
+    cold_chunk_time, cold_result = BenchmarkHelper.measure(lambda: current_chunks(current_items, TOKEN_THRESHOLD, True), repeat = 3)
+    warm_chunk_time, warm_result = BenchmarkHelper.measure(lambda: current_chunks(current_items, TOKEN_THRESHOLD, False), repeat = 3)
+    assert [len(v) for v in legacy_result] == [len(v) for v in cold_result] == [len(v) for v in warm_result]
+
+    BenchmarkHelper.print_table(
+        f"Item throughput ({ITEM_COUNT} items, best of 3)",
+        "ms",
+        [
+            ("count tokens", legacy_count_time * 1000, current_count_time * 1000),
+            ("rule filter", legacy_filter_time * 1000, current_filter_time * 1000),
+            ("generate chunks (cold)", legacy_chunk_time * 1000, cold_chunk_time * 1000),
+            ("generate chunks (re-split)", legacy_chunk_time * 1000, warm_chunk_time * 1000),
+        ],
+    )
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
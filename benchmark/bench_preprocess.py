@@ -0,0 +1,151 @@
+import random
+import re
+import unicodedata
+
+from benchmark.BenchmarkHelper import BenchmarkHelper
+from model.Item import Item
+from module.Config import Config
+from module.FakeNameHelper import FakeNameHelper
+from module.Normalizer import Normalizer
+from module.RubyCleaner import RubyCleaner
+from module.Text.Replacer import Replacer
+from module.TextPreprocessor import TextPreprocessor
+
+# 文本预处理的基准测试
+# 旧实现在请求线程中逐行依次执行逐字符的正规化、十条注音规则与逐条的前置替换，每行都重新编译正则规则
+# 与当前预先编译一次、相同原文只处理一次的 TextPreprocessor 对比
+# 运行方式：python -m benchmark.bench_preprocess
+
+# 条目数量
+ITEM_COUNT: int = 20000
+
+# 普通替换规则的数量
+LITERAL_RULE_COUNT: int = 500
+
+# 生成片假名词语，任意两个词语之间不存在包含关系，以保证逐条替换与单次替换的结果一致
+def generate_words(rng: random.Random, count: int) -> list[str]:
+    katakana = [chr(i) for i in range(0x30A2, 0x30F3)]
+
+    words: set[str] = set()
+    while len(words) < count:
+        words.add("".join(rng.choice(katakana) for _ in range(rng.randint(4, 6))))
+
+    words: list[str] = sorted(words)
+    return [v for v in words if not any(v != w and v in w for w in words)]
+
+# 生成替换规则
+def generate_rules(rng: random.Random, words: list[str]) -> list[dict[str, str | bool]]:
+    rules: list[dict[str, str | bool]] = [
+        {"src": word, "dst": f"替换{i}", "regex": False}
+        for i, word in enumerate(words)
+    ]
+    rules.extend((
+        {"src": r"\\C\[\d+\]", "dst": "", "regex": True},
+        {"src": r"\\I\[\d+\]", "dst": "", "regex": True},
+        {"src": r"<br\s*/?>", "dst": " ", "regex": True},
+        {"src": r"\{(\w+)\}", "dst": r"\1", "regex": True},
+        {"src": r"[ \t]{2,}", "dst": " ", "regex": True},
+    ))
+
+    return rules
+
+# 生成原文，包含全角字母数字、注音、控制代码与替换规则中的词语
+def generate_items(rng: random.Random, words: list[str], count: int) -> list[tuple[str, str]]:
+    fragments = [
+        "勇者は王都へ向かった。",
+        "ＨＰが１２０回復した！",
+        "\\C[2]警告\\C[0]：魔物が現れた。",
+        "\\I[45]ポーションを手に入れた。",
+        "|漢字[かんじ]の読み方を覚えた。",
+        "<ruby = まおう>魔王</ruby>が笑う。",
+        "[ruby text=きし]騎士団が到着した。",
+        "{player}は静かに頷いた。<br>",
+        "\\n[1]「こんにちは」",
+        "それでは、  行こう。",
+    ]
+
+    pool: list[tuple[str, str]] = []
+    for _ in range(count // 4):
+        parts = [rng.choice(fragments) if rng.random() < 0.6 else rng.choice(words) for _ in range(rng.randint(2, 6))]
+        name = rng.choice(words) if rng.random() < 0.3 else None
+        pool.append((name, "\n".join(parts) if rng.random() < 0.2 else "".join(parts)))
+
+    return [rng.choice(pool) for _ in range(count)]
+
+# 旧实现的正规化
+def legacy_normalize(text: str) -> str:
+    text = unicodedata.normalize("NFC", text)
+    return "".join([Normalizer.CUSTOM_RULE.get(char, char) for char in text])
+
+# 旧实现的注音清理
+def legacy_clean(text: str) -> str:
+    for pattern, replacement in RubyCleaner.RULE:
+        text = re.sub(pattern, replacement, text)
+
+    return text
+
+# 旧实现的前置替换
+def legacy_replace(rules: list[dict[str, str | bool]], src: str) -> str:
+    for v in rules:
+        if v.get("regex", False) != True:
+            src = src.replace(v.get("src"), v.get("dst"))
+        else:
+            src = re.sub(rf"{v.get("src")}", rf"{v.get("dst")}", src)
+
+    return src
+
+# 旧实现的预处理流水线
+def legacy_pipeline(rules: list[dict[str, str | bool]], items: list[tuple[str, str]]) -> list[str]:
+    FakeNameHelper.reset()
+
+    srcs: list[str] = []
+    for name, src in items:
+        if name is not None:
+            src = f"【{name}】{src}"
+
+        for line in src.split("\n"):
+            line = legacy_normalize(line)
+            line = legacy_clean(line)
+            line = legacy_replace(rules, line)
+            line = FakeNameHelper.inject(line)
+            if line.strip() != "":
+                srcs.append(line)
+
+    return srcs
+
+# 当前实现的预处理流水线，清除条目中已保存的预处理结果
+def current_pipeline(config: Config, items: list[Item]) -> list[str]:
+    FakeNameHelper.reset()
+    for item in items:
+        item.set_preprocessed_src("", None)
+
+    return TextPreprocessor(config).get(items)
+
+def main() -> None:
+    rng = random.Random(BenchmarkHelper.SEED)
+    words = generate_words(rng, LITERAL_RULE_COUNT)
+    rules = generate_rules(rng, words)
+    pairs = generate_items(rng, words, ITEM_COUNT)
+    lines = [line for _, src in pairs for line in src.split("\n")]
+
+    config = Config(pre_replacement_enable = True, pre_replacement_data = rules)
+    items = [Item(src = src, name_src = name) for name, src in pairs]
+    replacer = Replacer([(v.get("src"), v.get("dst"), v.get("regex")) for v in rules])
+
+    rows: list[tuple[str, float, float]] = []
+    for name, legacy, current in (
+        ("normalize", lambda: [legacy_normalize(v) for v in lines], lambda: [Normalizer.normalize(v) for v in lines]),
+        ("ruby clean", lambda: [legacy_clean(v) for v in lines], lambda: [RubyCleaner.clean(v) for v in lines]),
+        (f"pre-replacement ({len(rules)} rules)", lambda: [legacy_replace(rules, v) for v in lines], lambda: [replacer.replace(v) for v in lines]),
+        ("full pipeline", lambda: legacy_pipeline(rules, pairs), lambda: current_pipeline(config, items)),
+    ):
+        legacy_time, legacy_result = BenchmarkHelper.measure(legacy, repeat = 3)
+        current_time, current_result = BenchmarkHelper.measure(current, repeat = 3)
+        assert legacy_result == current_result
+
+        rows.append((name, legacy_time * 1000, current_time * 1000))
+
+    BenchmarkHelper.print_table(f"Text preprocess ({ITEM_COUNT} items, {len(lines)} lines, best of 3)", "ms", rows)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,104 @@
+import os
+import random
+import tempfile
+
+import openpyxl
+import openpyxl.worksheet.worksheet
+
+from base.Base import Base
+from benchmark.BenchmarkHelper import BenchmarkHelper
+from model.Item import Item
+from module.Config import Config
+from module.File.XLSX import XLSX
+
+# XLSX 文件读取的基准测试
+# 旧实现以完整模式打开工作簿并逐个单元格读取，与当前以只读模式逐行读取的实现对比
+# 峰值内存由 tracemalloc 统计，只包含 Python 对象的内存
+# 运行方式：python -m benchmark.bench_xlsx
+
+# 行数
+ROW_COUNT: int = 30000
+
+# 除原文与译文以外的列数，Translator++ 等工具导出的文件通常包含额外的列
+EXTRA_COLUMN_COUNT: int = 3
+
+# 生成测试文件
+def generate_xlsx(abs_path: str, row_count: int) -> None:
+    rng = random.Random(BenchmarkHelper.SEED)
+    words = ["勇者", "魔王", "スライム", "ポーション", "王都", "騎士団", "こんにちは", "ありがとう", "それでは", "行こう"]
+
+    # 以普通模式写入，以便文件中记录表格范围，与常见工具导出的文件一致
+    book = openpyxl.Workbook()
+    sheet = book.active
+    for i in range(row_count):
+        src = "".join(rng.choice(words) for _ in range(rng.randint(2, 12)))
+        dst = src if rng.random() < 0.5 else ""
+        sheet.append([src, dst] + [f"extra_{i}_{j}" for j in range(EXTRA_COLUMN_COUNT)])
+    book.save(abs_path)
+
+# 旧实现的读取
+def legacy_read(xlsx: XLSX, abs_path: str) -> list[Item]:
+    items: list[Item] = []
+    rel_path = os.path.relpath(abs_path, xlsx.input_path)
+
+    book: openpyxl.Workbook = openpyxl.load_workbook(abs_path)
+    sheet: openpyxl.worksheet.worksheet.Worksheet = book.active
+    if sheet.max_row == 0 or sheet.max_column == 0:
+        return items
+    if xlsx.is_wold_xlsx(sheet):
+        return items
+
+    for row in range(1, sheet.max_row + 1):
+        src = sheet.cell(row = row, column = 1).value
+        dst = sheet.cell(row = row, column = 2).value
+        if src is None:
+            continue
+
+        src = str(src)
+        dst = str(dst) if dst is not None else ""
+        if src == "":
+            status = Base.ProjectStatus.EXCLUDED
+        elif dst != "" and src != dst:
+            status = Base.ProjectStatus.PROCESSED_IN_PAST
+        else:
+            status = Base.ProjectStatus.NONE
+
+        items.append(
+            Item.from_dict({
+                "src": src,
+                "dst": dst,
+                "row": row,
+                "file_type": Item.FileType.XLSX,
+                "file_path": rel_path,
+                "status": status,
+            })
+        )
+
+    return items
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as folder:
+        abs_path = os.path.join(folder, "benchmark.xlsx")
+        generate_xlsx(abs_path, ROW_COUNT)
+        xlsx = XLSX(Config(input_folder = folder, output_folder = folder))
+
+        legacy_time, legacy_items = BenchmarkHelper.measure(lambda: legacy_read(xlsx, abs_path), repeat = 3)
+        current_time, current_items = BenchmarkHelper.measure(lambda: xlsx.read_from_path([abs_path]), repeat = 3)
+        assert [v.to_dict() for v in legacy_items] == [v.to_dict() for v in current_items]
+
+        legacy_memory, _ = BenchmarkHelper.measure_memory(lambda: legacy_read(xlsx, abs_path))
+        current_memory, _ = BenchmarkHelper.measure_memory(lambda: xlsx.read_from_path([abs_path]))
+
+    BenchmarkHelper.print_table(
+        f"XLSX read ({ROW_COUNT} rows, {2 + EXTRA_COLUMN_COUNT} columns, best of 3)",
+        "ms",
+        [(f"read ({ROW_COUNT / legacy_time:.0f} -> {ROW_COUNT / current_time:.0f} rows/s)", legacy_time * 1000, current_time * 1000)],
+    )
+    BenchmarkHelper.print_table(
+        f"XLSX read ({ROW_COUNT} rows, {2 + EXTRA_COLUMN_COUNT} columns)",
+        "MiB",
+        [("peak memory", legacy_memory / 1024 / 1024, current_memory / 1024 / 1024)],
+    )
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
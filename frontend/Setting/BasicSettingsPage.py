@@ -41,6 +41,7 @@ class BasicSettingsPage(QWidget, Base):
         # 添加控件
         self.add_widget_max_workers(scroll_area_vbox, config, window)
         self.add_widget_rpm_threshold(scroll_area_vbox, config, window)
+        self.add_widget_tpm_threshold(scroll_area_vbox, config, window)
         self.add_widget_token_threshold(scroll_area_vbox, config, window)
         self.add_widget_request_timeout(scroll_area_vbox, config, window)
         self.add_widget_max_round(scroll_area_vbox, config, window)
@@ -90,6 +91,27 @@ class BasicSettingsPage(QWidget, Base):
             )
         )
 
+    # 每分钟 Token 数阈值
+    def add_widget_tpm_threshold(self, parent: QLayout, config: Config, window: FluentWindow) -> None:
+
+        def init(widget: SpinCard) -> None:
+            widget.get_spin_box().setRange(0, 999999999)
+            widget.get_spin_box().setValue(config.tpm_threshold)
+
+        def value_changed(widget: SpinCard) -> None:
+            config = Config().load()
+            config.tpm_threshold = widget.get_spin_box().value()
+            config.save()
+
+        parent.addWidget(
+            SpinCard(
+                title = Localizer.get().basic_settings_page_tpm_threshold_title,
+                description = Localizer.get().basic_settings_page_tpm_threshold_content,
+                init = init,
+                value_changed = value_changed,
+            )
+        )
+
     # 翻译任务长度阈值
     def add_widget_token_threshold(self, parent: QLayout, config: Config, window: FluentWindow)-> None:
 
@@ -42,6 +42,11 @@ class ExpertSettingsPage(QWidget, Base):
         # 添加控件
         self.add_widget_output_choices(scroll_area_vbox, config, window)
         self.add_widget_output_kvjson(scroll_area_vbox, config, window)
+        self.add_widget_response_cache_enable(scroll_area_vbox, config, window)
+        self.add_widget_async_request_enable(scroll_area_vbox, config, window)
+        self.add_widget_cache_database_enable(scroll_area_vbox, config, window)
+        self.add_widget_request_hedge_enable(scroll_area_vbox, config, window)
+        self.add_widget_stream_request_enable(scroll_area_vbox, config, window)
 
         # 填充
         scroll_area_vbox.addStretch(1)
@@ -88,4 +93,114 @@ class ExpertSettingsPage(QWidget, Base):
                 init = init,
                 checked_changed = checked_changed,
             )
+        )
+
+    # 请求结果缓存
+    def add_widget_response_cache_enable(self, parent: QLayout, config: Config, windows: FluentWindow) -> None:
+
+        def init(widget: SwitchButtonCard) -> None:
+            widget.get_switch_button().setChecked(
+                config.response_cache_enable
+            )
+
+        def checked_changed(widget: SwitchButtonCard) -> None:
+            config = Config().load()
+            config.response_cache_enable = widget.get_switch_button().isChecked()
+            config.save()
+
+        parent.addWidget(
+            SwitchButtonCard(
+                title = Localizer.get().expert_settings_page_response_cache_enable_title,
+                description = Localizer.get().expert_settings_page_response_cache_enable_description,
+                init = init,
+                checked_changed = checked_changed,
+            )
+        )
+
+    # 异步请求模式
+    def add_widget_async_request_enable(self, parent: QLayout, config: Config, windows: FluentWindow) -> None:
+
+        def init(widget: SwitchButtonCard) -> None:
+            widget.get_switch_button().setChecked(
+                config.async_request_enable
+            )
+
+        def checked_changed(widget: SwitchButtonCard) -> None:
+            config = Config().load()
+            config.async_request_enable = widget.get_switch_button().isChecked()
+            config.save()
+
+        parent.addWidget(
+            SwitchButtonCard(
+                title = Localizer.get().expert_settings_page_async_request_enable_title,
+                description = Localizer.get().expert_settings_page_async_request_enable_description,
+                init = init,
+                checked_changed = checked_changed,
+            )
+        )
+
+    # 数据库缓存
+    def add_widget_cache_database_enable(self, parent: QLayout, config: Config, windows: FluentWindow) -> None:
+
+        def init(widget: SwitchButtonCard) -> None:
+            widget.get_switch_button().setChecked(
+                config.cache_database_enable
+            )
+
+        def checked_changed(widget: SwitchButtonCard) -> None:
+            config = Config().load()
+            config.cache_database_enable = widget.get_switch_button().isChecked()
+            config.save()
+
+        parent.addWidget(
+            SwitchButtonCard(
+                title = Localizer.get().expert_settings_page_cache_database_enable_title,
+                description = Localizer.get().expert_settings_page_cache_database_enable_description,
+                init = init,
+                checked_changed = checked_changed,
+            )
+        )
+
+    # 对冲请求
+    def add_widget_request_hedge_enable(self, parent: QLayout, config: Config, windows: FluentWindow) -> None:
+
+        def init(widget: SwitchButtonCard) -> None:
+            widget.get_switch_button().setChecked(
+                config.request_hedge_enable
+            )
+
+        def checked_changed(widget: SwitchButtonCard) -> None:
+            config = Config().load()
+            config.request_hedge_enable = widget.get_switch_button().isChecked()
+            config.save()
+
+        parent.addWidget(
+            SwitchButtonCard(
+                title = Localizer.get().expert_settings_page_request_hedge_enable_title,
+                description = Localizer.get().expert_settings_page_request_hedge_enable_description,
+                init = init,
+                checked_changed = checked_changed,
+            )
+        )
+
+    # 流式请求
+    def add_widget_stream_request_enable(self, parent: QLayout, config: Config, windows: FluentWindow) -> None:
+
+        def init(widget: SwitchButtonCard) -> None:
+            widget.get_switch_button().setChecked(
+                config.stream_request_enable
+            )
+
+        def checked_changed(widget: SwitchButtonCard) -> None:
+            config = Config().load()
+            config.stream_request_enable = widget.get_switch_button().isChecked()
+            config.save()
+
+        parent.addWidget(
+            SwitchButtonCard(
+                title = Localizer.get().expert_settings_page_stream_request_enable_title,
+                description = Localizer.get().expert_settings_page_stream_request_enable_description,
+                init = init,
+                checked_changed = checked_changed,
+            )
         )
\ No newline at end of file
@@ -278,6 +278,18 @@ class TaskPage(QWidget, Base):
             self.task.set_unit("KTask")
             self.task.set_value(f"{(task / 1000):.2f}")
 
+        # 并发上限
+        limit = Engine.get().get_concurrency_limit()
+        if limit == 0:
+            self.limit.set_unit("")
+            self.limit.set_value(Localizer.get().none)
+        elif limit < 1000:
+            self.limit.set_unit("Task")
+            self.limit.set_value(f"{limit}")
+        else:
+            self.limit.set_unit("KTask")
+            self.limit.set_value(f"{(limit / 1000):.2f}")
+
     # 更新 Token 数据
     def update_token(self, data: dict) -> None:
         if Engine.get().get_status() not in (Base.TaskStatus.STOPPING, Base.TaskStatus.NERING):
@@ -367,6 +379,7 @@ class TaskPage(QWidget, Base):
         self.add_speed_card(self.flow_layout, config, window)
         self.add_token_card(self.flow_layout, config, window)
         self.add_task_card(self.flow_layout, config, window)
+        self.add_limit_card(self.flow_layout, config, window)
 
         self.container.addWidget(self.flow_container, 1)
 
@@ -477,6 +490,17 @@ class TaskPage(QWidget, Base):
         self.task.setFixedSize(204, 204)
         parent.addWidget(self.task)
 
+    # 并发上限
+    def add_limit_card(self, parent: QLayout, config: Config, window: FluentWindow) -> None:
+        self.limit = DashboardCard(
+            parent = self,
+            title = Localizer.get().task_page_card_limit,
+            value = Localizer.get().none,
+            unit = "",
+        )
+        self.limit.setFixedSize(204, 204)
+        parent.addWidget(self.limit)
+
     # 开始
     def add_command_bar_action_start(self, parent: CommandBarCard, config: Config, window: FluentWindow) -> None:
         def triggered() -> None:
@@ -1,4 +1,6 @@
+import concurrent.futures
 import dataclasses
+import itertools
 import re
 import threading
 from enum import StrEnum
@@ -13,9 +15,12 @@ from tiktoken_ext import openai_public
 from base.Base import Base
 from module.Text.TextBase import TextBase
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots = True)
 class Item():
 
+    # 条目使用 __slots__ 存储以降低内存占用，且不持有线程锁
+    # 同一时间只有一个任务会修改同一个条目，需要跨线程保证一致性时由 CacheManager 统一加锁
+
     # 必须显式的引用这两个库，否则打包后会报错
     tiktoken_ext
     openai_public
@@ -57,9 +62,13 @@ class Item():
     text_type: TextType = TextType.NONE                                                         # 文本的实际类型
     status: Base.ProjectStatus = Base.ProjectStatus.NONE                                        # 翻译状态
     retry_count: int = 0                                                                        # 重试次数，当前只有单独重试的时候才增加此计数
+    token_count: int = -1                                                                       # 原文的 Token 数量，-1 表示尚未计算
+    preprocessed_src: list[str] = None                                                          # 预处理后的原文，None 表示尚未预处理
+    preprocessed_key: str = ""                                                                  # 预处理结果对应的预处理流水线指纹
 
-    # 线程锁
-    lock: threading.Lock = dataclasses.field(init = False, repr = False, compare = False, default_factory = threading.Lock)
+    # Token 编码器，所有条目共用，首次使用时创建
+    ENCODER: ClassVar[tiktoken.Encoding] = None
+    ENCODER_LOCK: ClassVar[threading.Lock] = threading.Lock()
 
     # WOLF
     REGEX_WOLF: ClassVar[tuple[re.Pattern]] = (
@@ -88,12 +97,11 @@ class Item():
         return cls(**filtered_data)
 
     def to_dict(self) -> dict[str, Any]:
-        with self.lock:
-            return {
-                v.name: getattr(self, v.name)
-                for v in dataclasses.fields(self)
-                if v.init != False
-            }
+        return {
+            v.name: getattr(self, v.name)
+            for v in dataclasses.fields(self)
+            if v.init != False
+        }
 
     def __post_init__(self) -> None:
         # 如果文件类型是 XLSX、TRANS、KVJSON、MESSAGEJSON，且没有文本类型，则判断实际的文本类型
@@ -110,132 +118,154 @@ class Item():
 
     # 获取原文
     def get_src(self) -> str:
-        with self.lock:
-            return self.src
+        return self.src
 
     # 设置原文
     def set_src(self, src: str) -> None:
-        with self.lock:
-            self.src = src
+        if self.src != src:
+            self.token_count = -1
+            self.preprocessed_src = None
+        self.src = src
 
     # 获取译文
     def get_dst(self) -> str:
-        with self.lock:
-            return self.dst
+        return self.dst
 
     # 设置译文
     def set_dst(self, dst: str) -> None:
-        with self.lock:
-            # 有时候模型的回复反序列化以后会是 int 等非字符类型，所以这里要强制转换成字符串
-            # TODO:可能需要更好的处理方式
-            if isinstance(dst, str):
-                self.dst = dst
-            else:
-                self.dst = str(dst)
+        # 有时候模型的回复反序列化以后会是 int 等非字符类型，所以这里要强制转换成字符串
+        # TODO:可能需要更好的处理方式
+        if isinstance(dst, str):
+            self.dst = dst
+        else:
+            self.dst = str(dst)
 
     # 获取角色姓名原文
     def get_name_src(self) -> str | list[str]:
-        with self.lock:
-            return self.name_src
+        return self.name_src
 
     # 设置角色姓名原文
     def set_name_src(self, name_src: str | list[str]) -> None:
-        with self.lock:
-            self.name_src = name_src
+        if self.name_src != name_src:
+            self.preprocessed_src = None
+        self.name_src = name_src
 
     # 获取角色姓名译文
     def get_name_dst(self) -> str | list[str]:
-        with self.lock:
-            return self.name_dst
+        return self.name_dst
 
     # 设置角色姓名译文
     def set_name_dst(self, name_dst: str | list[str]) -> None:
-        with self.lock:
-            self.name_dst = name_dst
+        self.name_dst = name_dst
 
     # 获取额外字段原文
     def get_extra_field(self) -> str | dict:
-        with self.lock:
-            return self.extra_field
+        return self.extra_field
 
     # 设置额外字段原文
     def set_extra_field(self, extra_field: str | dict) -> None:
-        with self.lock:
-            self.extra_field = extra_field
+        self.extra_field = extra_field
 
     # 获取标签
     def get_tag(self) -> str:
-        with self.lock:
-            return self.tag
+        return self.tag
 
     # 设置标签
     def set_tag(self, tag: str) -> None:
-        with self.lock:
-            self.tag = tag
+        self.tag = tag
 
     # 获取行号
     def get_row(self) -> int:
-        with self.lock:
-            return self.row
+        return self.row
 
     # 设置行号
     def set_row(self, row: int) -> None:
-        with self.lock:
-            self.row = row
+        self.row = row
 
     # 获取文件类型
     def get_file_type(self) -> FileType:
-        with self.lock:
-            return self.file_type
+        return self.file_type
 
     # 设置文件类型
     def set_file_type(self, type: FileType) -> None:
-        with self.lock:
-            self.file_type = type
+        self.file_type = type
 
     # 获取文件路径
     def get_file_path(self) -> str:
-        with self.lock:
-            return self.file_path
+        return self.file_path
 
     # 设置文件路径
     def set_file_path(self, path: str) -> None:
-        with self.lock:
-            self.file_path = path
+        self.file_path = path
 
     # 获取文本类型
     def get_text_type(self) -> TextType:
-        with self.lock:
-            return self.text_type
+        return self.text_type
 
     # 设置文本类型
     def set_text_type(self, type: TextType) -> None:
-        with self.lock:
-            self.text_type = type
+        self.text_type = type
 
     # 获取翻译状态
     def get_status(self) -> Base.ProjectStatus:
-        with self.lock:
-            return self.status
+        return self.status
 
     # 设置翻译状态
     def set_status(self, status: Base.ProjectStatus) -> None:
-        with self.lock:
-            self.status = status
+        self.status = status
 
     # 获取重试次数
     def get_retry_count(self) -> int:
-        with self.lock:
-            return self.retry_count
+        return self.retry_count
 
     # 设置重试次数
     def set_retry_count(self, retry_count: int) -> None:
-        with self.lock:
-            self.retry_count = retry_count
+        self.retry_count = retry_count
 
     # 获取 Token 数量
     def get_token_count(self) -> int:
-        return len(tiktoken.get_encoding("o200k_base").encode(self.get_src()))
+        if self.token_count < 0:
+            self.token_count = len(self.get_encoder().encode(self.src))
+        return self.token_count
+
+    # 获取预处理后的原文，预处理流水线指纹不一致时返回 None
+    def get_preprocessed_src(self, key: str) -> list[str] | None:
+        if self.preprocessed_key != key:
+            return None
+        return self.preprocessed_src
+
+    # 设置预处理后的原文
+    def set_preprocessed_src(self, key: str, preprocessed_src: list[str]) -> None:
+        self.preprocessed_key = key
+        self.preprocessed_src = preprocessed_src
+
+    # 获取 Token 编码器
+    @classmethod
+    def get_encoder(cls) -> tiktoken.Encoding:
+        if cls.ENCODER is None:
+            with cls.ENCODER_LOCK:
+                if cls.ENCODER is None:
+                    cls.ENCODER = tiktoken.get_encoding("o200k_base")
+
+        return cls.ENCODER
+
+    # 批量计算 Token 数量，只计算尚未计算过的条目
+    # 相同的原文只计算一次，原文按线程数均分后每个线程依次计算一份，避免逐条提交任务的开销
+    @classmethod
+    def count_tokens(cls, items: list[Self], num_threads: int = 8) -> None:
+        items = [item for item in items if item.token_count < 0]
+        if len(items) == 0:
+            return None
+
+        encoder = cls.get_encoder()
+        srcs = list(dict.fromkeys(item.get_src() for item in items))
+        size = -(-len(srcs) // max(1, num_threads))
+        with concurrent.futures.ThreadPoolExecutor(max(1, num_threads)) as executor:
+            results = executor.map(lambda v: [len(encoder.encode(src)) for src in v], (srcs[i : i + size] for i in range(0, len(srcs), size)))
+            counts = dict(zip(srcs, itertools.chain.from_iterable(results)))
+
+        for item in items:
+            item.token_count = counts.get(item.get_src())
 
     # 获取第一个角色姓名原文
     def get_first_name_src(self) -> str:
@@ -0,0 +1,145 @@
+import json
+import os
+import sqlite3
+import threading
+from typing import Any
+from typing import Iterable
+
+from model.Item import Item
+from model.Project import Project
+
+class CacheDatabase():
+
+    # 数据库文件名
+    FILE_NAME: str = "cache.db"
+
+    # 批量写入时每批的条目数量
+    BATCH_SIZE: int = 4096
+
+    def __init__(self, output_folder: str) -> None:
+        super().__init__()
+
+        # 初始化
+        self.output_folder = output_folder
+        self.path = f"{output_folder}/cache/{__class__.FILE_NAME}"
+
+        # 线程锁
+        self.lock = threading.Lock()
+
+        # 连接数据库
+        # 连接由多个线程共用，所有操作都需要持有线程锁
+        os.makedirs(os.path.dirname(self.path), exist_ok = True)
+        self.connection = sqlite3.connect(self.path, check_same_thread = False)
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.execute("PRAGMA synchronous = NORMAL")
+        self.connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS items (
+                id INTEGER PRIMARY KEY,
+                status TEXT NOT NULL,
+                file_path TEXT NOT NULL,
+                data TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_items_status ON items (status);
+            CREATE INDEX IF NOT EXISTS idx_items_file_path ON items (file_path);
+            CREATE TABLE IF NOT EXISTS project (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+            """
+        )
+        self.connection.commit()
+
+    # 判断数据库文件是否存在
+    @classmethod
+    def exists(cls, output_folder: str) -> bool:
+        return os.path.isfile(f"{output_folder}/cache/{cls.FILE_NAME}")
+
+    # 关闭连接
+    def close(self) -> None:
+        with self.lock:
+            self.connection.close()
+
+    # 生成条目行数据，参数为 (序号, 条目数据) 的序列
+    def generate_rows(self, items: Iterable[tuple[int, dict[str, Any]]]) -> Iterable[tuple[int, str, str, str]]:
+        for i, data in items:
+            yield (
+                i,
+                data.get("status"),
+                data.get("file_path"),
+                json.dumps(data, indent = None, ensure_ascii = False),
+            )
+
+    # 批量执行
+    def execute_in_batches(self, sql: str, rows: Iterable[tuple]) -> None:
+        batch: list[tuple] = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= __class__.BATCH_SIZE:
+                self.connection.executemany(sql, batch)
+                batch = []
+
+        if len(batch) > 0:
+            self.connection.executemany(sql, batch)
+
+    # 写入全部条目，替换已有的数据
+    def replace_items(self, items: list[Item], project: Project) -> None:
+        with self.lock:
+            with self.connection:
+                self.connection.execute("DELETE FROM items")
+                self.execute_in_batches(
+                    "INSERT INTO items (id, status, file_path, data) VALUES (?, ?, ?, ?)",
+                    self.generate_rows((i, item.to_dict()) for i, item in enumerate(items)),
+                )
+                self.write_project(self.generate_project_rows(project))
+
+    # 写入发生变化的条目
+    # 参数为调用方在持有锁时生成的数据快照，写入期间不需要访问内存中的条目
+    def upsert_items(self, items: list[tuple[int, dict[str, Any]]], project_rows: list[tuple[str, str]] | None) -> None:
+        with self.lock:
+            with self.connection:
+                self.execute_in_batches(
+                    (
+                        "INSERT INTO items (id, status, file_path, data) VALUES (?, ?, ?, ?) "
+                        "ON CONFLICT (id) DO UPDATE SET status = excluded.status, file_path = excluded.file_path, data = excluded.data"
+                    ),
+                    self.generate_rows(items),
+                )
+                if project_rows is not None:
+                    self.write_project(project_rows)
+
+    # 生成项目数据行
+    # 任务状态单独存储，检查项目状态时不需要读取体积较大的额外数据
+    def generate_project_rows(self, project: Project) -> list[tuple[str, str]]:
+        return [(k, json.dumps(v, indent = None, ensure_ascii = False)) for k, v in project.to_dict().items()]
+
+    # 写入项目数据
+    def write_project(self, rows: list[tuple[str, str]]) -> None:
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO project (key, value) VALUES (?, ?)",
+            rows,
+        )
+
+    # 读取全部条目
+    def load_items(self) -> list[Item]:
+        with self.lock:
+            cursor = self.connection.execute("SELECT data FROM items ORDER BY id")
+            return [Item.from_dict(json.loads(data)) for data, in cursor]
+
+    # 读取项目数据
+    def load_project(self) -> Project:
+        with self.lock:
+            cursor = self.connection.execute("SELECT key, value FROM project")
+            return Project.from_dict({k: json.loads(v) for k, v in cursor})
+
+    # 读取项目的任务状态
+    def load_project_status(self) -> str | None:
+        with self.lock:
+            row = self.connection.execute("SELECT value FROM project WHERE key = ?", ("status",)).fetchone()
+
+        return json.loads(row[0]) if row is not None else None
+
+    # 获取条目数量（根据翻译状态）
+    def get_item_count_by_status(self, status: str) -> int:
+        with self.lock:
+            return self.connection.execute("SELECT COUNT(*) FROM items WHERE status = ?", (status,)).fetchone()[0]
\ No newline at end of file
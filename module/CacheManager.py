@@ -6,6 +6,8 @@ import time
 from base.Base import Base
 from model.Project import Project
 from model.Item import Item
+from module.CacheDatabase import CacheDatabase
+from module.ItemTable import ItemTable
 from module.Localizer.Localizer import Localizer
 
 class CacheManager(Base):
@@ -13,6 +15,25 @@ class CacheManager(Base):
     # 缓存文件保存周期（秒）
     SAVE_INTERVAL = 15
 
+    # 日志条目数量超过条目总数的该比例时，在后台合并为新的快照
+    COMPACT_RATIO = 0.25
+    COMPACT_MIN = 4096
+
+    # JSON 缓存文件
+    JSON_FILES = (
+        "items.json",
+        "items.journal",
+        "items.journal.old",
+        "project.json",
+    )
+
+    # 数据库缓存文件
+    DATABASE_FILES = (
+        CacheDatabase.FILE_NAME,
+        f"{CacheDatabase.FILE_NAME}-wal",
+        f"{CacheDatabase.FILE_NAME}-shm",
+    )
+
     # 类线程锁
     LOCK = threading.Lock()
 
@@ -22,12 +43,29 @@ class CacheManager(Base):
         # 默认值
         self.project: Project = Project()
         self.items: list[Item] = []
+        self.item_table: ItemTable = None
 
         # 初始化
         self.require_flag: bool = False
         self.require_path: str = ""
         self.last_require_time: float = 0
 
+        # 增量保存
+        # 条目按其在列表中的位置记录，自上次保存以来发生变化的条目只需要追加到日志文件中
+        self.index: dict[int, int] = {}
+        self.dirty: set[int] = set()
+        self.snapshot_required: bool = True
+
+        # 条目本身不持有线程锁，由缓存管理器统一加锁
+        # 替换条目列表、记录变化、序列化变化的条目时需要持有此锁
+        self.items_lock = threading.RLock()
+        self.journal_count: int = 0
+        self.compact_thread: threading.Thread = None
+
+        # 数据库存储
+        self.database: CacheDatabase = None
+        self.database_enable: bool = False
+
         # 启动定时任务
         if service == True:
             threading.Thread(target = self.task).start()
@@ -46,10 +84,9 @@ class CacheManager(Base):
                 folder_path = f"{self.require_path}/cache"
                 os.makedirs(folder_path, exist_ok = True)
 
-                # 保存缓存到文件
-                self.save_to_file(
+                # 增量保存缓存到文件
+                self.checkpoint(
                     project = self.project,
-                    items = self.items,
                     output_folder = self.require_path,
                 )
 
@@ -61,55 +98,296 @@ class CacheManager(Base):
                 self.last_require_time = time.time()
 
     # 保存缓存到文件
+    # 写入完整的快照，并清空日志文件
     def save_to_file(self, project: Project, items: list[Item], output_folder: str) -> None:
         # 创建上级文件夹
         os.makedirs(f"{output_folder}/cache", exist_ok = True)
 
+        # 使用数据库存储时
+        if self.database_enable == True:
+            with self.items_lock:
+                self.dirty.clear()
+                self.snapshot_required = False
+
+                try:
+                    self.get_database(output_folder).replace_items(items, project)
+                except Exception as e:
+                    self.debug(Localizer.get().log_write_file_fail, e)
+
+            # 移除 JSON 缓存文件，保证同一时间只存在一种缓存
+            self.wait_for_compact()
+            self.remove_files(output_folder, __class__.JSON_FILES)
+
+            # 重置标志
+            self.require_flag = False
+            self.last_require_time = time.time()
+
+            return None
+
+        # 等待后台合并任务完成，避免旧的快照覆盖新的快照
+        self.wait_for_compact()
+
+        # 在序列化快照的同时取出变化记录，之后发生的变化会在下次保存时写入日志
+        with self.items_lock:
+            self.dirty.clear()
+            self.snapshot_required = False
+            data = json.dumps([item.to_dict() for item in items], indent = None, ensure_ascii = False)
+
         # 保存缓存到文件
         path = f"{output_folder}/cache/items.json"
         with __class__.LOCK:
             try:
-                with open(path, "w", encoding = "utf-8") as writer:
-                    writer.write(json.dumps([item.to_dict() for item in items], indent = None, ensure_ascii = False))
+                with open(f"{path}.tmp", "w", encoding = "utf-8") as writer:
+                    writer.write(data)
+                os.replace(f"{path}.tmp", path)
+
+                # 快照已包含所有数据，移除日志文件
+                for journal_path in (f"{output_folder}/cache/items.journal", f"{output_folder}/cache/items.journal.old"):
+                    if os.path.isfile(journal_path):
+                        os.remove(journal_path)
+                self.journal_count = 0
+            except Exception as e:
+                self.debug(Localizer.get().log_write_file_fail, e)
+
+        # 保存项目数据到文件
+        self.save_project_to_file(project, output_folder)
+
+        # 移除数据库缓存文件，保证同一时间只存在一种缓存
+        self.close_database()
+        self.remove_files(output_folder, __class__.DATABASE_FILES)
+
+        # 重置标志
+        self.require_flag = False
+        self.last_require_time = time.time()
+
+    # 增量保存缓存到文件
+    # 只将自上次保存以来发生变化的条目追加到日志文件中，耗时与变化的条目数量成正比
+    def checkpoint(self, project: Project, output_folder: str) -> None:
+        if self.snapshot_required == True:
+            return self.save_to_file(project, self.items, output_folder)
+
+        # 使用数据库存储时，将变化的条目批量写入数据库
+        if self.database_enable == True:
+            return self.flush_to_database(project, output_folder)
+
+        # 取出变化记录并序列化
+        with self.items_lock:
+            dirty = sorted(self.dirty)
+            self.dirty.clear()
+            data = "".join(
+                json.dumps({"index": i, "item": self.items[i].to_dict()}, indent = None, ensure_ascii = False) + "\n"
+                for i in dirty
+            )
+
+        # 追加到日志文件，写入失败时恢复变化记录，以便在下次保存时重新写入
+        path = f"{output_folder}/cache/items.journal"
+        with __class__.LOCK:
+            try:
+                with open(path, "a", encoding = "utf-8") as writer:
+                    writer.write(data)
+                self.journal_count = self.journal_count + len(dirty)
+                written = True
             except Exception as e:
+                with self.items_lock:
+                    self.dirty.update(dirty)
                 self.debug(Localizer.get().log_write_file_fail, e)
+                written = False
 
         # 保存项目数据到文件
+        self.save_project_to_file(project, output_folder)
+
+        # 日志过长时，在后台将其合并到快照中
+        if written == True and self.journal_count > max(__class__.COMPACT_MIN, len(self.items) * __class__.COMPACT_RATIO):
+            self.compact(output_folder)
+
+    # 保存项目数据到文件
+    def save_project_to_file(self, project: Project, output_folder: str) -> None:
+        # 项目的额外数据可能在其他线程中被原地更新，序列化时需要持有锁
+        with self.items_lock:
+            data = json.dumps(project.to_dict(), indent = None, ensure_ascii = False)
+
         path = f"{output_folder}/cache/project.json"
         with __class__.LOCK:
             try:
-                with open(path, "w", encoding = "utf-8") as writer:
-                    writer.write(json.dumps(project.to_dict(), indent = None, ensure_ascii = False))
+                with open(f"{path}.tmp", "w", encoding = "utf-8") as writer:
+                    writer.write(data)
+                os.replace(f"{path}.tmp", path)
             except Exception as e:
                 self.debug(Localizer.get().log_write_file_fail, e)
 
-        # 重置标志
-        self.require_flag = False
-        self.last_require_time = time.time()
+    # 在后台将日志合并到快照中
+    # 合并只读写文件，不访问内存中的条目，因此不会阻塞任务的执行
+    def compact(self, output_folder: str) -> None:
+        if self.compact_thread is not None and self.compact_thread.is_alive():
+            return None
+
+        # 轮换日志文件，后续的变化写入新的日志文件
+        path = f"{output_folder}/cache/items.journal"
+        with __class__.LOCK:
+            try:
+                if os.path.isfile(f"{path}.old"):
+                    return None
+                os.replace(path, f"{path}.old")
+                self.journal_count = 0
+            except Exception as e:
+                self.debug(Localizer.get().log_write_file_fail, e)
+                return None
+
+        def task() -> None:
+            try:
+                data = self.read_snapshot(output_folder)
+                self.replay_journal(data, f"{path}.old")
+
+                snapshot_path = f"{output_folder}/cache/items.json"
+                with open(f"{snapshot_path}.compact", "w", encoding = "utf-8") as writer:
+                    writer.write(json.dumps(data, indent = None, ensure_ascii = False))
+
+                with __class__.LOCK:
+                    os.replace(f"{snapshot_path}.compact", snapshot_path)
+                    os.remove(f"{path}.old")
+            except Exception as e:
+                self.debug(Localizer.get().log_write_file_fail, e)
+
+        self.compact_thread = threading.Thread(target = task)
+        self.compact_thread.start()
+
+    # 将变化的条目批量写入数据库
+    # 只在持有条目锁时生成数据快照，写入数据库期间不阻塞任务的执行，写入失败时变化记录会在下次保存时重新写入
+    # 快照与写入整体持有文件锁，避免较早的快照覆盖较新的数据
+    def flush_to_database(self, project: Project, output_folder: str) -> None:
+        with __class__.LOCK:
+            database = self.get_database(output_folder)
+            with self.items_lock:
+                dirty = sorted(self.dirty)
+                self.dirty.clear()
+                items = [(i, self.items[i].to_dict()) for i in dirty]
+                project_rows = database.generate_project_rows(project) if project is not None else None
+
+            try:
+                database.upsert_items(items, project_rows)
+            except Exception as e:
+                with self.items_lock:
+                    self.dirty.update(dirty)
+                self.debug(Localizer.get().log_write_file_fail, e)
+
+    # 设置是否使用数据库存储
+    def set_database_enable(self, enable: bool) -> None:
+        self.database_enable = enable
+
+    # 获取数据库连接
+    def get_database(self, output_folder: str) -> CacheDatabase:
+        if self.database is None or self.database.output_folder != output_folder:
+            self.close_database()
+            self.database = CacheDatabase(output_folder)
+
+        return self.database
+
+    # 关闭数据库连接
+    def close_database(self) -> None:
+        if self.database is not None:
+            self.database.close()
+            self.database = None
+
+    # 移除缓存文件
+    def remove_files(self, output_folder: str, names: tuple[str, ...]) -> None:
+        with __class__.LOCK:
+            for name in names:
+                try:
+                    path = f"{output_folder}/cache/{name}"
+                    if os.path.isfile(path):
+                        os.remove(path)
+                except Exception as e:
+                    self.debug(Localizer.get().log_write_file_fail, e)
+
+    # 等待后台合并任务完成
+    def wait_for_compact(self) -> None:
+        if self.compact_thread is not None:
+            self.compact_thread.join()
+            self.compact_thread = None
 
     # 请求保存缓存到文件
     def require_save_to_file(self, output_path: str) -> None:
         self.require_flag = True
         self.require_path = output_path
 
+    # 标记发生变化的条目，在下次保存时写入日志文件
+    def mark_dirty(self, items: list[Item]) -> None:
+        with self.items_lock:
+            for item in items:
+                i = self.index.get(id(item))
+                if i is not None:
+                    self.dirty.add(i)
+
     # 从文件读取数据
     def load_from_file(self, output_path: str) -> None:
         self.load_items_from_file(output_path)
         self.load_project_from_file(output_path)
 
     # 从文件读取项目数据
+    # 先读取快照，再依次重放未合并的日志文件
     def load_items_from_file(self, output_path: str) -> None:
-        path = f"{output_path}/cache/items.json"
+        self.wait_for_compact()
+
+        # 存在数据库缓存时，从数据库读取
+        # 读取的缓存与当前的存储方式不一致时，在下次保存时写入完整的缓存
+        if CacheDatabase.exists(output_path):
+            try:
+                items = self.get_database(output_path).load_items()
+                if len(items) > 0:
+                    self.set_items(items)
+                    self.snapshot_required = self.database_enable == False
+            except Exception as e:
+                self.debug(Localizer.get().log_read_file_fail, e)
+
+            return None
+
         with __class__.LOCK:
             try:
-                if os.path.isfile(path):
-                    with open(path, "r", encoding = "utf-8-sig") as reader:
-                        self.items = [Item.from_dict(item) for item in json.load(reader)]
+                data = self.read_snapshot(output_path)
+                self.replay_journal(data, f"{output_path}/cache/items.journal.old")
+                self.replay_journal(data, f"{output_path}/cache/items.journal")
+                if len(data) > 0:
+                    self.set_items([Item.from_dict(item) for item in data])
+                    self.snapshot_required = self.database_enable == True
             except Exception as e:
                 self.debug(Localizer.get().log_read_file_fail, e)
 
+    # 读取快照
+    def read_snapshot(self, output_path: str) -> list[dict]:
+        path = f"{output_path}/cache/items.json"
+        if not os.path.isfile(path):
+            return []
+
+        with open(path, "r", encoding = "utf-8-sig") as reader:
+            return json.load(reader)
+
+    # 重放日志
+    def replay_journal(self, data: list[dict], path: str) -> None:
+        if not os.path.isfile(path):
+            return None
+
+        with open(path, "r", encoding = "utf-8") as reader:
+            for line in reader:
+                # 中断时最后一行可能没有完整写入，跳过无法解析的行
+                try:
+                    entry: dict = json.loads(line)
+                except Exception:
+                    continue
+
+                i: int = entry.get("index", -1)
+                if 0 <= i < len(data):
+                    data[i] = entry.get("item")
+
     # 从文件读取项目数据
     def load_project_from_file(self, output_path: str) -> None:
+        if CacheDatabase.exists(output_path):
+            try:
+                self.project = self.get_database(output_path).load_project()
+            except Exception as e:
+                self.debug(Localizer.get().log_read_file_fail, e)
+
+            return None
+
         path = f"{output_path}/cache/project.json"
         with __class__.LOCK:
             try:
@@ -121,12 +399,24 @@ class CacheManager(Base):
 
     # 设置缓存数据
     def set_items(self, items: list[Item]) -> None:
-        self.items = items
+        with self.items_lock:
+            self.items = items
+            self.index = {id(item): i for i, item in enumerate(items)}
+            self.dirty.clear()
+            self.snapshot_required = True
 
     # 获取缓存数据
     def get_items(self) -> list[Item]:
         return self.items
 
+    # 获取缓存数据的列式视图
+    def get_item_table(self) -> ItemTable:
+        with self.items_lock:
+            if self.item_table is None or self.item_table.items is not self.items:
+                self.item_table = ItemTable(self.items)
+
+            return self.item_table
+
     # 设置项目数据
     def set_project(self, project: Project) -> None:
         self.project = project
@@ -143,51 +433,41 @@ class CacheManager(Base):
     def copy_items(self) -> list[Item]:
         return [Item.from_dict(item.to_dict()) for item in self.items]
 
+    # 从文件读取项目的任务状态
+    # 使用数据库存储时只读取状态字段，不需要读取完整的项目数据
+    def load_project_status_from_file(self, output_path: str) -> Base.ProjectStatus:
+        if CacheDatabase.exists(output_path):
+            try:
+                status = self.get_database(output_path).load_project_status()
+                self.close_database()
+                if status is not None:
+                    return Base.ProjectStatus(status)
+            except Exception as e:
+                self.debug(Localizer.get().log_read_file_fail, e)
+
+            return Base.ProjectStatus.NONE
+
+        self.load_project_from_file(output_path)
+        return self.get_project().get_status()
+
     # 获取缓存数据数量（根据翻译状态）
+    # 使用数据库存储时，先写入变化的条目，再通过索引查询
     def get_item_count_by_status(self, status: int) -> int:
-        return len([item for item in self.items if item.get_status() == status])
+        if self.database_enable == True and self.database is not None and self.snapshot_required == False:
+            try:
+                self.flush_to_database(None, self.database.output_folder)
+                return self.database.get_item_count_by_status(status)
+            except Exception as e:
+                self.debug(Localizer.get().log_read_file_fail, e)
+
+        return self.get_item_table().get_count_by_status(status)
 
     # 生成缓存数据条目片段
-    def generate_item_chunks(self, token_threshold: int) -> list[list[Item]]:
+    # 未指定条目时切分全部条目
+    def generate_item_chunks(self, token_threshold: int, items: list[Item] = None) -> list[list[Item]]:
         # 根据 Token 阈值计算行数阈值，避免大量短句导致行数太多
         line_limit = max(8, int(token_threshold / 16))
 
-        skip: int = 0
-        line_length: int = 0
-        token_length: int = 0
-        chunk: list[Item] = []
-        chunks: list[list[Item]] = []
-        for item in self.items:
-            # 跳过状态不是 未翻译 的数据
-            if item.get_status() != Base.ProjectStatus.NONE:
-                skip = skip + 1
-                continue
-
-            # 每个片段的第一条不判断是否超限，以避免特别长的文本导致死循环
-            current_line_length = sum(1 for line in item.get_src().splitlines() if line.strip())
-            current_token_length = item.get_token_count()
-            if len(chunk) == 0:
-                pass
-            # 如果 行数超限、Token 超限、数据来源跨文件，则结束此片段
-            elif (
-                line_length + current_line_length > line_limit
-                or token_length + current_token_length > token_threshold
-                or item.get_file_path() != chunk[-1].get_file_path()
-            ):
-                chunks.append(chunk)
-                skip = 0
-
-                chunk = []
-                line_length = 0
-                token_length = 0
-
-            chunk.append(item)
-            line_length = line_length + current_line_length
-            token_length = token_length + current_token_length
-
-        # 如果还有剩余数据，则添加到列表中
-        if len(chunk) > 0:
-            chunks.append(chunk)
-            skip = 0
-
-        return chunks
\ No newline at end of file
+        # 尚未计算过的 Token 数量会被批量计算并保存在条目中，重新切分时无需重复计算
+        table = self.get_item_table() if items is None else ItemTable(items)
+        return table.generate_chunks(token_threshold, line_limit, os.cpu_count() or 8)
\ No newline at end of file
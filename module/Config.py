@@ -38,12 +38,20 @@ class Config():
     token_threshold: int = 2048
     max_workers: int = 0
     rpm_threshold: int = 0
+    tpm_threshold: int = 0
     request_timeout: int = 120
     max_round: int = 16
 
     # ExpertSettingsPage
     output_kvjson: bool = False
     output_choices: bool = False
+    response_cache_enable: bool = True
+    async_request_enable: bool = False
+    cache_database_enable: bool = False
+    request_hedge_enable: bool = False
+    request_hedge_percentile: float = 0.95
+    request_hedge_budget: float = 0.10
+    stream_request_enable: bool = False
 
     # ProjectPage
     source_language: BaseLanguage.Enum = BaseLanguage.Enum.JA
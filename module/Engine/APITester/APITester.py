@@ -69,7 +69,7 @@ class APITester(Base):
             self.print("")
             self.info(Localizer.get().api_tester_key + "\n" + f"[green]{key}[/]")
             self.info(Localizer.get().api_tester_messages + "\n" + f"{messages}")
-            skip, response_think, response_result, _, _ = requester.request(messages)
+            skip, response_think, response_result, _, _ = requester.request(messages, key = key)
 
             # 提取回复内容
             if skip == True:
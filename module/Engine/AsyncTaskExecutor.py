@@ -0,0 +1,92 @@
+import asyncio
+import concurrent.futures
+import threading
+from types import TracebackType
+from typing import Any
+from typing import Callable
+from typing import Coroutine
+from typing import Self
+
+from module.Engine.Engine import Engine
+from module.Engine.TaskRequester import TaskRequester
+
+class AsyncTaskExecutor():
+
+    # 在单个事件循环中并发执行协程任务，使用方式与 ThreadPoolExecutor 保持一致
+    # 所有请求共用一个线程，即使同时执行数千个请求，内存占用与线程切换开销也不会随之增长
+    # 任务完成后在回调线程池中设置结果，调用方注册的回调不会在事件循环中执行，以免阻塞其他请求
+
+    # 回调线程池的线程数量
+    CALLBACK_WORKERS: int = 4
+
+    def __init__(self, max_workers: int) -> None:
+        super().__init__()
+
+        # 初始化
+        self.futures: set[concurrent.futures.Future] = set()
+        self.semaphore = threading.BoundedSemaphore(max_workers)
+        self.callback_executor = concurrent.futures.ThreadPoolExecutor(max_workers = __class__.CALLBACK_WORKERS, thread_name_prefix = "ASYNC_CALLBACK_")
+
+        # 线程锁
+        self.lock = threading.Lock()
+
+        # 启动事件循环
+        # 事件循环线程本身不计入实时任务数，实时任务数由执行中的协程数量决定
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target = self.loop.run_forever)
+        self.thread.start()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type: BaseException, exc_val: BaseException, exc_tb: TracebackType) -> None:
+        self.shutdown(wait = True)
+
+    # 提交任务，同时执行的任务数量达到上限时阻塞等待
+    def submit(self, function: Callable[[], Coroutine[Any, Any, Any]]) -> concurrent.futures.Future:
+        self.semaphore.acquire()
+
+        Engine.get().increase_async_task_count()
+        future = concurrent.futures.Future()
+        with self.lock:
+            self.futures.add(future)
+
+        inner = asyncio.run_coroutine_threadsafe(function(), self.loop)
+        inner.add_done_callback(lambda inner: self.callback_executor.submit(self.done_callback, inner, future))
+
+        return future
+
+    # 任务完成时，在回调线程池中设置结果并执行调用方注册的回调，回调执行完毕后任务才算结束
+    def done_callback(self, inner: concurrent.futures.Future, future: concurrent.futures.Future) -> None:
+        try:
+            if inner.cancelled():
+                future.cancel()
+            elif inner.exception() is not None:
+                future.set_exception(inner.exception())
+            else:
+                future.set_result(inner.result())
+        finally:
+            with self.lock:
+                self.futures.discard(future)
+
+            self.semaphore.release()
+            Engine.get().decrease_async_task_count()
+
+    # 等待所有任务完成后关闭事件循环
+    def shutdown(self, wait: bool = True) -> None:
+        if wait == True:
+            with self.lock:
+                futures = list(self.futures)
+            concurrent.futures.wait(futures)
+
+        # 异步客户端与事件循环绑定，需要在事件循环关闭前释放
+        try:
+            asyncio.run_coroutine_threadsafe(TaskRequester.close_async_clients(), self.loop).result()
+            asyncio.run_coroutine_threadsafe(self.loop.shutdown_default_executor(), self.loop).result()
+        except Exception:
+            pass
+        self.callback_executor.shutdown(wait = wait)
+
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
@@ -0,0 +1,125 @@
+import threading
+import time
+from typing import Callable
+
+from base.Base import Base
+from module.Engine.Engine import Engine
+
+class ConcurrencyController():
+
+    # 基于 AIMD（加性增、乘性减）的自适应并发控制
+    # 每完成一个成功的请求，并发上限增加 1 / 上限，即每一轮并发全部成功后上限增加 1
+    # 出现限流、服务端错误、超时、网络错误或延迟明显高于基线时，并发上限按比例下降，并在冷却时间内不再重复下降
+    # 延迟基线在出现更低的延迟时立即下降，否则缓慢向当前延迟靠拢
+    # 收到限流时，在服务端要求的等待时间内暂停派发新的任务
+
+    # 乘性减的比例
+    DECREASE_RATIO_RATE_LIMIT: float = 0.50
+    DECREASE_RATIO_ERROR: float = 0.75
+    DECREASE_RATIO_LATENCY: float = 0.90
+
+    # 两次下降之间的最短间隔
+    DECREASE_COOLDOWN: float = 5.0
+
+    # 延迟的平滑系数，以及判定延迟升高的倍率
+    LATENCY_ALPHA: float = 0.2
+    LATENCY_RATIO: float = 2.0
+
+    # 延迟基线向当前延迟靠拢的平滑系数，使基线能够缓慢跟随请求内容的变化，而不是永远停留在历史最低值
+    BASELINE_ALPHA: float = 0.02
+
+    # 限流且服务端未给出等待时间时的默认等待时间
+    RETRY_AFTER_DEFAULT: float = 1.0
+
+    def __init__(self, max_limit: int, clock: Callable[[], float] = time.monotonic) -> None:
+        super().__init__()
+
+        # 初始化
+        self.max_limit: int = max(1, max_limit)
+        self.limit: float = float(self.max_limit)
+        self.in_flight: int = 0
+        self.clock = clock
+        self.pause_until: float = 0.0
+        self.last_decrease: float = float("-inf")
+        self.latency_ewma: float = None
+        self.latency_baseline: float = None
+
+        # 线程锁
+        self.condition = threading.Condition()
+
+        # 同步到引擎，以便在界面上显示
+        Engine.get().set_concurrency_limit(self.get_limit())
+
+    # 获取当前的并发上限
+    def get_limit(self) -> int:
+        return max(1, int(self.limit))
+
+    # 等待直到可以派发新的任务
+    def acquire(self, timeout: float = None) -> bool:
+        deadline = None if timeout is None else self.clock() + timeout
+
+        with self.condition:
+            while True:
+                now = self.clock()
+                if self.in_flight < self.get_limit() and now >= self.pause_until:
+                    self.in_flight = self.in_flight + 1
+                    return True
+
+                # 计算等待时间，暂停期间等待到暂停结束，否则等待任务完成时的通知
+                wait = self.pause_until - now if now < self.pause_until else None
+                if deadline is not None:
+                    if now >= deadline:
+                        return False
+                    wait = deadline - now if wait is None else min(wait, deadline - now)
+
+                self.condition.wait(wait)
+
+    # 归还名额但不调整并发上限，用于对冲请求等不单独反馈结果的请求
+    def cancel(self) -> None:
+        with self.condition:
+            self.in_flight = max(0, self.in_flight - 1)
+            self.condition.notify_all()
+
+    # 任务完成时调用，根据结果调整并发上限
+    def release(self, latency: float, error_type: Base.RequestError, retry_after: float = None) -> None:
+        with self.condition:
+            self.in_flight = max(0, self.in_flight - 1)
+            now = self.clock()
+
+            if error_type == Base.RequestError.RATE_LIMIT:
+                wait = retry_after if retry_after is not None and retry_after > 0 else __class__.RETRY_AFTER_DEFAULT
+                self.pause_until = max(self.pause_until, now + wait)
+                self.decrease(now, __class__.DECREASE_RATIO_RATE_LIMIT)
+            elif error_type in (Base.RequestError.SERVER, Base.RequestError.TIMEOUT, Base.RequestError.NETWORK):
+                self.decrease(now, __class__.DECREASE_RATIO_ERROR)
+            elif error_type == Base.RequestError.NONE:
+                self.update_latency(now, latency)
+                self.limit = min(float(self.max_limit), self.limit + 1 / self.limit)
+
+            Engine.get().set_concurrency_limit(self.get_limit())
+            self.condition.notify_all()
+
+    # 更新延迟，延迟明显高于基线时降低并发上限
+    def update_latency(self, now: float, latency: float) -> None:
+        if latency is None or latency <= 0:
+            return None
+
+        if self.latency_ewma is None:
+            self.latency_ewma = latency
+        else:
+            self.latency_ewma = self.latency_ewma + __class__.LATENCY_ALPHA * (latency - self.latency_ewma)
+
+        if self.latency_baseline is None or self.latency_ewma < self.latency_baseline:
+            self.latency_baseline = self.latency_ewma
+        else:
+            self.latency_baseline = self.latency_baseline + __class__.BASELINE_ALPHA * (self.latency_ewma - self.latency_baseline)
+            if self.latency_ewma > self.latency_baseline * __class__.LATENCY_RATIO:
+                self.decrease(now, __class__.DECREASE_RATIO_LATENCY)
+
+    # 乘性减
+    def decrease(self, now: float, ratio: float) -> None:
+        if now - self.last_decrease < __class__.DECREASE_COOLDOWN:
+            return None
+
+        self.limit = max(1.0, self.limit * ratio)
+        self.last_decrease = now
\ No newline at end of file
@@ -12,6 +12,8 @@ class Engine():
 
         # 初始化
         self.status: Base.TaskStatus = Base.TaskStatus.IDLE
+        self.async_task_count: int = 0
+        self.concurrency_limit: int = 0
 
         # 线程锁
         self.lock = threading.Lock()
@@ -39,4 +41,23 @@ class Engine():
             self.status = status
 
     def get_running_task_count(self) -> int:
-        return sum(1 for t in threading.enumerate() if t.name.startswith(__class__.TASK_PREFIX))
\ No newline at end of file
+        with self.lock:
+            async_task_count = self.async_task_count
+
+        return async_task_count + sum(1 for t in threading.enumerate() if t.name.startswith(__class__.TASK_PREFIX))
+
+    def increase_async_task_count(self) -> None:
+        with self.lock:
+            self.async_task_count = self.async_task_count + 1
+
+    def decrease_async_task_count(self) -> None:
+        with self.lock:
+            self.async_task_count = self.async_task_count - 1
+
+    def get_concurrency_limit(self) -> int:
+        with self.lock:
+            return self.concurrency_limit
+
+    def set_concurrency_limit(self, limit: int) -> None:
+        with self.lock:
+            self.concurrency_limit = limit
\ No newline at end of file
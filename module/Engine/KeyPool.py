@@ -0,0 +1,121 @@
+import threading
+import time
+from typing import Callable
+
+from base.Base import Base
+
+class KeyPool():
+
+    # 记录每个密钥的 执行中的请求数、近期延迟 与 失败情况，每次请求选择最健康的密钥
+    # 鉴权失败、限流或连续出错的密钥会被暂时隔离，隔离期间不参与调度
+    # 所有密钥都处于隔离期时，选择最早结束隔离的密钥，由并发控制器负责降低请求速率
+
+    # 没有密钥时使用的占位密钥
+    NO_KEY: str = "no_key_required"
+
+    # 鉴权失败时的隔离时间
+    QUARANTINE_AUTH: float = 300.0
+
+    # 限流且服务端未给出等待时间时的隔离时间
+    QUARANTINE_RATE_LIMIT: float = 10.0
+
+    # 连续出错时的隔离时间，按连续出错次数指数增长
+    QUARANTINE_ERROR: float = 2.0
+    QUARANTINE_ERROR_MAX: float = 60.0
+
+    # 连续出错多少次后开始隔离
+    ERROR_THRESHOLD: int = 3
+
+    # 延迟的平滑系数
+    LATENCY_ALPHA: float = 0.2
+
+    # 密钥状态
+    class KeyState():
+
+        def __init__(self, key: str) -> None:
+            self.key: str = key
+            self.in_flight: int = 0
+            self.latency: float = None
+            self.errors: int = 0
+            self.quarantine_until: float = 0.0
+            self.last_used: int = 0
+
+    def __init__(self, keys: list[str], clock: Callable[[], float] = time.monotonic) -> None:
+        super().__init__()
+
+        # 初始化
+        self.clock = clock
+        self.counter: int = 0
+        self.states: dict[str, __class__.KeyState] = {
+            key: __class__.KeyState(key) for key in (keys if len(keys) > 0 else [__class__.NO_KEY])
+        }
+
+        # 线程锁
+        self.lock = threading.Lock()
+
+    # 选择最健康的密钥
+    def acquire(self) -> str:
+        with self.lock:
+            now = self.clock()
+            healthy = [v for v in self.states.values() if v.quarantine_until <= now]
+            if len(healthy) > 0:
+                # 未测量过延迟的密钥优先，其余按 (执行中的请求数 + 1) * 延迟 排序，相同时选择最久未使用的密钥
+                state = min(
+                    healthy,
+                    key = lambda v: (
+                        (v.in_flight + 1) * (v.latency if v.latency is not None else 0.0),
+                        v.in_flight,
+                        v.last_used,
+                    ),
+                )
+            else:
+                state = min(self.states.values(), key = lambda v: v.quarantine_until)
+
+            self.counter = self.counter + 1
+            state.in_flight = state.in_flight + 1
+            state.last_used = self.counter
+
+            return state.key
+
+    # 选择的密钥最终没有用于请求时调用，只归还执行中的请求数
+    def cancel(self, key: str) -> None:
+        with self.lock:
+            state = self.states.get(key)
+            if state is not None:
+                state.in_flight = max(0, state.in_flight - 1)
+
+    # 请求完成时调用，更新密钥的健康状态
+    def release(self, key: str, latency: float, error_type: Base.RequestError, retry_after: float = None) -> None:
+        with self.lock:
+            state = self.states.get(key)
+            if state is None:
+                return None
+
+            now = self.clock()
+            state.in_flight = max(0, state.in_flight - 1)
+
+            if error_type == Base.RequestError.NONE:
+                state.errors = 0
+                if latency is not None and latency > 0:
+                    if state.latency is None:
+                        state.latency = latency
+                    else:
+                        state.latency = state.latency + __class__.LATENCY_ALPHA * (latency - state.latency)
+            elif error_type == Base.RequestError.AUTH:
+                state.errors = state.errors + 1
+                state.quarantine_until = max(state.quarantine_until, now + __class__.QUARANTINE_AUTH)
+            elif error_type == Base.RequestError.RATE_LIMIT:
+                state.errors = state.errors + 1
+                wait = retry_after if retry_after is not None and retry_after > 0 else __class__.QUARANTINE_RATE_LIMIT
+                state.quarantine_until = max(state.quarantine_until, now + wait)
+            elif error_type == Base.RequestError.CLIENT:
+                # 请求参数错误与密钥无关
+                pass
+            else:
+                state.errors = state.errors + 1
+                if state.errors >= __class__.ERROR_THRESHOLD:
+                    wait = min(
+                        __class__.QUARANTINE_ERROR_MAX,
+                        __class__.QUARANTINE_ERROR * 2 ** (state.errors - __class__.ERROR_THRESHOLD),
+                    )
+                    state.quarantine_until = max(state.quarantine_until, now + wait)
\ No newline at end of file
@@ -0,0 +1,51 @@
+from typing import Any
+
+class GlossaryAggregator():
+
+    # 按原文累计模型给出的 译文 与 类型 的票数，每个结果只在到达时处理一次
+    # 数据格式为 {原文: [[译文, 类型, 票数], ...]}，可以直接序列化保存在项目数据中
+
+    def __init__(self, data: dict[str, list[list]] | list[dict[str, str]] = None) -> None:
+        super().__init__()
+
+        # 初始化
+        self.data: dict[str, list[list]] = {}
+        self.index: dict[tuple[str, str, str], list] = {}
+
+        # 载入已有数据
+        if isinstance(data, dict):
+            for src, votes in data.items():
+                for dst, info, count in votes:
+                    self.vote(src, dst, info, count)
+        # 兼容旧版本保存的原始结果列表
+        elif isinstance(data, list):
+            self.add(data)
+
+    # 添加结果
+    def add(self, glossary: list[dict[str, Any]]) -> None:
+        for v in glossary:
+            src: str = v.get("src")
+            dst: str = v.get("dst")
+            info: str = v.get("info")
+            if not isinstance(src, str) or not isinstance(dst, str) or not isinstance(info, str):
+                continue
+
+            self.vote(src.strip(), dst.strip(), info.strip(), 1)
+
+    # 计票
+    def vote(self, src: str, dst: str, info: str, count: int) -> None:
+        entry = self.index.get((src, dst, info))
+        if entry is None:
+            entry = [dst, info, 0]
+            self.index[(src, dst, info)] = entry
+            self.data.setdefault(src, []).append(entry)
+
+        entry[2] = entry[2] + count
+
+    # 获取数据
+    def get_data(self) -> dict[str, list[list]]:
+        return self.data
+
+    # 获取所有 (原文, 译文, 类型, 票数)
+    def get_votes(self) -> list[tuple[str, str, str, int]]:
+        return [(src, dst, info, count) for src, votes in self.data.items() for dst, info, count in votes]
\ No newline at end of file
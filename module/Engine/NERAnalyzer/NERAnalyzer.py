@@ -1,11 +1,13 @@
 import concurrent.futures
-import copy
 import os
+import queue
+import random
 import re
 import shutil
 import threading
 import time
 import webbrowser
+from typing import Iterable
 
 import httpx
 import opencc
@@ -16,18 +18,26 @@ from base.BaseLanguage import BaseLanguage
 from model.Item import Item
 from module.CacheManager import CacheManager
 from module.Config import Config
+from module.Engine.AsyncTaskExecutor import AsyncTaskExecutor
+from module.Engine.ConcurrencyController import ConcurrencyController
 from module.Engine.Engine import Engine
+from module.Engine.NERAnalyzer.GlossaryAggregator import GlossaryAggregator
 from module.Engine.NERAnalyzer.NERAnalyzerTask import NERAnalyzerTask
+from module.Engine.RequestHedger import RequestHedger
+from module.Engine.ResponseCache import ResponseCache
 from module.Engine.TaskLimiter import TaskLimiter
 from module.Engine.TaskRequester import TaskRequester
 from module.FakeNameHelper import FakeNameHelper
 from module.File.FileManager import FileManager
 from module.Filter.LanguageFilter import LanguageFilter
 from module.Filter.RuleFilter import RuleFilter
+from module.ItemTable import ItemTable
 from module.Localizer.Localizer import Localizer
 from module.ProgressBar import ProgressBar
 from module.PromptBuilder import PromptBuilder
+from module.Text.Automaton import Automaton
 from module.Text.TextHelper import TextHelper
+from module.TextPreprocessor import TextPreprocessor
 
 class NERAnalyzer(Base):
 
@@ -38,6 +48,20 @@ class NERAnalyzer(Base):
         "others",
     }
 
+    # 可重试的请求错误，鉴权失败与请求参数错误重试也不会成功
+    RETRYABLE_ERRORS: tuple[Base.RequestError, ...] = (
+        Base.RequestError.RATE_LIMIT,
+        Base.RequestError.TIMEOUT,
+        Base.RequestError.NETWORK,
+        Base.RequestError.SERVER,
+        Base.RequestError.OTHER,
+    )
+
+    # 单个任务原样重试的最大次数，以及退避时间（秒）
+    RETRY_LIMIT: int = 3
+    RETRY_BACKOFF_BASE: float = 1.0
+    RETRY_BACKOFF_MAX: float = 30.0
+
     # 类变量
     OPENCCT2S: opencc.OpenCC = opencc.OpenCC("t2s")
     OPENCCS2T: opencc.OpenCC = opencc.OpenCC("s2tw")
@@ -47,6 +71,7 @@ class NERAnalyzer(Base):
 
         # 初始化
         self.cache_manager = CacheManager(service = True)
+        self.glossary = GlossaryAggregator()
 
         # 线程锁
         self.lock = threading.Lock()
@@ -65,8 +90,7 @@ class NERAnalyzer(Base):
                 status = Base.ProjectStatus.NONE
             else:
                 cache_manager = CacheManager(service = False)
-                cache_manager.load_project_from_file(Config().load().output_folder)
-                status = cache_manager.get_project().get_status()
+                status = cache_manager.load_project_status_from_file(Config().load().output_folder)
 
             self.emit(Base.Event.PROJECT_CHECK_DONE, {
                 "status" : status,
@@ -91,12 +115,9 @@ class NERAnalyzer(Base):
         if Engine.get().get_status() != Base.TaskStatus.NERING:
             return None
 
-        # 复制一份以避免影响原始数据
+        # 导出时使用当前票数的快照，避免受到后续更新的影响
         def task(event: str, data: dict) -> None:
-            self.save_ouput(
-                copy.deepcopy(self.cache_manager.get_project().get_extras().get("glossary", [])),
-                end = False,
-            )
+            self.save_ouput(self.get_glossary_votes(), end = False)
         threading.Thread(target = task, args = (event, data)).start()
 
     # 请求停止事件
@@ -131,6 +152,7 @@ class NERAnalyzer(Base):
 
                     # 更新运行状态
                     Engine.get().set_status(Base.TaskStatus.IDLE)
+                    Engine.get().set_concurrency_limit(0)
                     self.emit(Base.Event.NER_ANALYZER_DONE, {})
                     break
         threading.Thread(target = task, args = (event, data)).start()
@@ -150,16 +172,19 @@ class NERAnalyzer(Base):
 
         # 重置
         TaskRequester.reset()
+        ResponseCache.reset(self.config.output_folder)
+        RequestHedger.reset(self.config.request_hedge_percentile, self.config.request_hedge_budget)
         PromptBuilder.reset()
         FakeNameHelper.reset()
 
         # 生成缓存列表
+        self.cache_manager.set_database_enable(self.config.cache_database_enable)
         if status == Base.ProjectStatus.PROCESSING:
             self.cache_manager.load_from_file(self.config.output_folder)
         else:
-            shutil.rmtree(f"{self.config.output_folder}/cache", ignore_errors = True)
-            project, items = FileManager(self.config).read_from_path()
-            self.cache_manager.set_items(items)
+            self.clear_cache(self.config.output_folder)
+            project, items = FileManager(self.config).iter_from_path()
+            self.cache_manager.set_items(self.read_items(items))
             self.cache_manager.set_project(project)
 
         # 检查数据是否为空
@@ -177,6 +202,7 @@ class NERAnalyzer(Base):
         for item in self.cache_manager.get_items():
             if item.get_status() == Base.ProjectStatus.PROCESSED_IN_PAST:
                 item.set_status(Base.ProjectStatus.NONE)
+                self.cache_manager.mark_dirty((item,))
 
         # 从头翻译时加载默认数据
         if status == Base.ProjectStatus.PROCESSING:
@@ -190,105 +216,133 @@ class NERAnalyzer(Base):
                 "total_tokens": 0,
                 "total_output_tokens": 0,
                 "time": 0,
-                "glossary": [],
+                "glossary": {},
             }
 
+        # 载入已有的术语表票数，旧版本保存的原始结果列表会被转换为票数
+        self.glossary = GlossaryAggregator(self.extras.get("glossary"))
+        self.extras["glossary"] = self.glossary.get_data()
+
         # 更新翻译进度
         self.emit(Base.Event.NER_ANALYZER_UPDATE, self.extras)
 
         # 规则过滤
-        self.rule_filter(self.cache_manager.get_items())
+        self.rule_filter(self.cache_manager.get_item_table())
 
         # 语言过滤
-        self.language_filter(self.cache_manager.get_items())
+        self.language_filter(self.cache_manager.get_item_table())
 
-        # 开始循环
-        for current_round in range(self.config.max_round):
-            # 检测是否需要停止任务
-            # 目的是避免用户正好在两轮之间停止任务
-            if Engine.get().get_status() == Base.TaskStatus.STOPPING:
-                return None
+        # 记录任务的总行数（不是继续翻译时）
+        if status == Base.ProjectStatus.NONE:
+            self.extras["total_line"] = self.cache_manager.get_item_count_by_status(Base.ProjectStatus.NONE)
 
-            # 第一轮且不是继续翻译时，记录任务的总行数
-            if current_round == 0 and status == Base.ProjectStatus.NONE:
-                self.extras["total_line"] = self.cache_manager.get_item_count_by_status(Base.ProjectStatus.NONE)
+        # 文本预处理
+        self.text_preprocess(self.cache_manager.get_item_table())
 
-            # 第二轮开始切分
-            if current_round > 0:
-                self.config.token_threshold = max(1, int(self.config.token_threshold / 2))
+        # 生成缓存数据条目片段
+        chunks = self.cache_manager.generate_item_chunks(self.config.token_threshold)
 
-            # 生成缓存数据条目片段
-            chunks = self.cache_manager.generate_item_chunks(self.config.token_threshold)
+        # 生成翻译任务
+        self.print("")
+        tasks: list[NERAnalyzerTask] = []
+        with ProgressBar(transient = False) as progress:
+            pid = progress.new()
+            for items in chunks:
+                progress.update(pid, advance = 1, total = len(chunks))
+                tasks.append(NERAnalyzerTask(self.config, self.platform, items, self.preprocessor.get(items)))
 
-            # 生成翻译任务
-            self.print("")
-            tasks: list[NERAnalyzerTask] = []
-            with ProgressBar(transient = False) as progress:
-                pid = progress.new()
-                for items in chunks:
-                    progress.update(pid, advance = 1, total = len(chunks))
-                    tasks.append(NERAnalyzerTask(self.config, self.platform, items))
+        # 打印日志
+        self.info(Localizer.get().engine_task_generation.replace("{COUNT}", str(len(chunks))))
 
-            # 打印日志
-            self.info(Localizer.get().engine_task_generation.replace("{COUNT}", str(len(chunks))))
+        # 输出开始翻译的日志
+        self.print("")
+        self.print("")
+        self.info(f"{Localizer.get().engine_max_attempts} - {self.config.max_round}")
+        self.print("")
+        self.info(f"{Localizer.get().engine_api_name} - {self.platform.get("name")}")
+        self.info(f"{Localizer.get().engine_api_url} - {self.platform.get("api_url")}")
+        self.info(f"{Localizer.get().engine_api_model} - {self.platform.get("model")}")
+        self.print("")
+        self.info(PromptBuilder(self.config).build_main())
+        self.print("")
 
-            # 输出开始翻译的日志
-            self.print("")
-            self.print("")
-            self.info(f"{Localizer.get().engine_current_round} - {current_round + 1}")
-            self.info(f"{Localizer.get().engine_max_round} - {self.config.max_round}")
-            self.print("")
-            self.info(f"{Localizer.get().engine_api_name} - {self.platform.get("name")}")
-            self.info(f"{Localizer.get().engine_api_url} - {self.platform.get("api_url")}")
-            self.info(f"{Localizer.get().engine_api_model} - {self.platform.get("model")}")
-            self.print("")
-            self.info(PromptBuilder(self.config).build_main())
-            self.print("")
+        # 开始执行翻译任务
+        # 所有任务在同一个队列中连续执行，没有轮次之间的等待
+        # 失败的任务先按退避时间原样重试，重试次数用尽后，其中未完成的条目立即重新切分为更小的任务放回队列
+        # 每个条目最多被执行 max_round 次，队列中的任务全部完成后结束
+        self.task_limiter = TaskLimiter(rps = max_workers, rpm = rpm_threshold, tpm = self.config.tpm_threshold)
+        self.controller = ConcurrencyController(max_limit = max_workers)
+        self.key_pool = TaskRequester.get_key_pool(self.platform.get("api_key"))
+        self.task_queue: queue.Queue[NERAnalyzerTask] = queue.Queue()
+        self.task_pending = len(tasks)
+        self.item_attempts: dict[int, int] = {}
+        for task in tasks:
+            self.task_queue.put(task)
+
+        with ProgressBar(transient = True) as progress:
+            with self.create_executor(max_workers) as executor:
+                pid = progress.new()
+                while self.get_task_pending() > 0:
+                    # 检测是否需要停止任务
+                    # 目的是绕过限流器，快速结束所有剩余任务
+                    if Engine.get().get_status() == Base.TaskStatus.STOPPING:
+                        return None
+
+                    # 获取任务，队列为空时说明剩余的任务正在执行或等待重试
+                    try:
+                        task = self.task_queue.get(timeout = 1.0)
+                    except queue.Empty:
+                        continue
 
-            # 开始执行翻译任务
-            task_limiter = TaskLimiter(rps = max_workers, rpm = rpm_threshold)
-            with ProgressBar(transient = True) as progress:
-                with concurrent.futures.ThreadPoolExecutor(max_workers = max_workers, thread_name_prefix = Engine.TASK_PREFIX) as executor:
-                    pid = progress.new()
-                    for task in tasks:
-                        # 检测是否需要停止任务
-                        # 目的是绕过限流器，快速结束所有剩余任务
+                    # 等待并发控制器放行，等待期间同样需要检测是否需要停止任务
+                    while self.controller.acquire(timeout = 1.0) == False:
                         if Engine.get().get_status() == Base.TaskStatus.STOPPING:
                             return None
 
-                        task_limiter.wait()
+                    # 从密钥池中选择密钥，并等待该密钥的限流器放行，等待期间同样需要检测是否需要停止任务
+                    task.task_limiter, task.controller = self.task_limiter, self.controller
+                    task.key = self.key_pool.acquire()
+                    if self.task_limiter.wait(tokens = task.token_estimate, key = task.key) == False:
+                        self.key_pool.cancel(task.key)
+                        return None
+
+                    if self.config.async_request_enable == True:
+                        future = executor.submit(task.start_async)
+                    else:
                         future = executor.submit(task.start)
-                        future.add_done_callback(lambda future: self.task_done_callback(future, pid, progress))
-
-            # 判断是否需要继续翻译
-            if self.cache_manager.get_item_count_by_status(Base.ProjectStatus.NONE) == 0:
-                self.cache_manager.get_project().set_status(Base.ProjectStatus.PROCESSED)
-
-                # 日志
-                self.print("")
-                self.info(Localizer.get().engine_task_done)
-                self.info(Localizer.get().engine_task_save)
-
-                # 通知
-                self.emit(Base.Event.TOAST, {
-                    "type": Base.ToastType.SUCCESS,
-                    "message": Localizer.get().engine_task_done,
-                })
-                break
-
-            # 检查是否达到最大轮次
-            if current_round >= self.config.max_round - 1:
-                # 日志
-                self.print("")
-                self.warning(Localizer.get().engine_task_fail)
-                self.warning(Localizer.get().engine_task_save)
-
-                # 通知
-                self.emit(Base.Event.TOAST, {
-                    "type": Base.ToastType.SUCCESS,
-                    "message": Localizer.get().engine_task_fail,
-                })
-                break
+                    future.add_done_callback(lambda future, task = task: self.task_done_callback(future, task, pid, progress))
+
+        # 对冲请求的统计
+        if self.config.request_hedge_enable == True:
+            issued, won = RequestHedger.get_stats()
+            self.print("")
+            self.info(Localizer.get().engine_task_hedge.replace("{ISSUED}", str(issued)).replace("{WON}", str(won)))
+
+        # 判断任务是否全部完成
+        if self.cache_manager.get_item_count_by_status(Base.ProjectStatus.NONE) == 0:
+            self.cache_manager.get_project().set_status(Base.ProjectStatus.PROCESSED)
+
+            # 日志
+            self.print("")
+            self.info(Localizer.get().engine_task_done)
+            self.info(Localizer.get().engine_task_save)
+
+            # 通知
+            self.emit(Base.Event.TOAST, {
+                "type": Base.ToastType.SUCCESS,
+                "message": Localizer.get().engine_task_done,
+            })
+        else:
+            # 日志
+            self.print("")
+            self.warning(Localizer.get().engine_task_fail)
+            self.warning(Localizer.get().engine_task_save)
+
+            # 通知
+            self.emit(Base.Event.TOAST, {
+                "type": Base.ToastType.SUCCESS,
+                "message": Localizer.get().engine_task_fail,
+            })
 
         # 等待回调执行完毕
         time.sleep(1.0)
@@ -301,17 +355,52 @@ class NERAnalyzer(Base):
         )
 
         # 检查结果并写入文件
-        self.save_ouput(
-            self.cache_manager.get_project().get_extras().get("glossary", []),
-            end = True,
-        )
+        self.save_ouput(self.get_glossary_votes(), end = True)
 
         # 重置内部状态（正常完成翻译）
         Engine.get().set_status(Base.TaskStatus.IDLE)
+        Engine.get().set_concurrency_limit(0)
 
         # 触发翻译停止完成的事件
         self.emit(Base.Event.NER_ANALYZER_DONE, {})
 
+    # 接收读取到的条目，读取期间实时显示已读取的条目数量
+    def read_items(self, items: Iterable[Item]) -> list[Item]:
+        result: list[Item] = []
+
+        self.print("")
+        with ProgressBar(transient = True) as progress:
+            pid = progress.new()
+            for item in items:
+                result.append(item)
+                progress.update(pid, completed = len(result))
+
+        return result
+
+    # 清理缓存，保留请求结果缓存以便重复执行时复用
+    def clear_cache(self, output_folder: str) -> None:
+        # 关闭数据库连接，否则无法移除数据库文件
+        self.cache_manager.close_database()
+
+        path = f"{output_folder}/cache"
+        if not os.path.isdir(path):
+            return None
+
+        for entry in os.scandir(path):
+            if entry.is_dir() and entry.name == "response":
+                continue
+            elif entry.is_dir():
+                shutil.rmtree(entry.path, ignore_errors = True)
+            else:
+                os.remove(entry.path)
+
+    # 创建任务执行器
+    def create_executor(self, max_workers: int) -> concurrent.futures.ThreadPoolExecutor | AsyncTaskExecutor:
+        if self.config.async_request_enable == True:
+            return AsyncTaskExecutor(max_workers = max_workers)
+        else:
+            return concurrent.futures.ThreadPoolExecutor(max_workers = max_workers, thread_name_prefix = Engine.TASK_PREFIX)
+
     # 初始化速度控制器
     def initialize_max_workers(self) -> tuple[int, int]:
         max_workers: int = self.config.max_workers
@@ -341,53 +430,86 @@ class NERAnalyzer(Base):
         return max_workers, rpm_threshold
 
     # 规则过滤
-    def rule_filter(self, items: list[Item]) -> None:
-        if len(items) == 0:
+    def rule_filter(self, table: ItemTable) -> None:
+        if len(table.items) == 0:
             return None
 
         # 筛选
+        # 相同的原文只判断一次，判断结果以掩码的形式批量应用
         self.print("")
-        count: int = 0
         with ProgressBar(transient = False) as progress:
             pid = progress.new()
-            for item in items:
-                progress.update(pid, advance = 1, total = len(items))
-                if RuleFilter.filter(item.get_src()) == True:
-                    count = count + 1
-                    item.set_status(Base.ProjectStatus.EXCLUDED)
+            mask = table.filter(
+                lambda src: RuleFilter.filter(src),
+                lambda completed, total: progress.update(pid, completed = completed, total = total),
+            )
+            items = table.set_status(mask, Base.ProjectStatus.EXCLUDED)
+            self.cache_manager.mark_dirty(items)
 
         # 打印日志
-        self.info(Localizer.get().engine_task_rule_filter.replace("{COUNT}", str(count)))
+        self.info(Localizer.get().engine_task_rule_filter.replace("{COUNT}", str(len(items))))
 
     # 语言过滤
-    def language_filter(self, items: list[Item]) -> None:
-        if len(items) == 0:
+    def language_filter(self, table: ItemTable) -> None:
+        if len(table.items) == 0:
             return None
 
         # 筛选
+        # 相同的原文只判断一次，判断结果以掩码的形式批量应用
         self.print("")
-        count: int = 0
         with ProgressBar(transient = False) as progress:
             pid = progress.new()
-            for item in items:
-                progress.update(pid, advance = 1, total = len(items))
-                if LanguageFilter.filter(item.get_src(), self.config.source_language) == True:
-                    count = count + 1
-                    item.set_status(Base.ProjectStatus.EXCLUDED)
+            mask = table.filter(
+                lambda src: LanguageFilter.filter(src, self.config.source_language),
+                lambda completed, total: progress.update(pid, completed = completed, total = total),
+            )
+            items = table.set_status(mask, Base.ProjectStatus.EXCLUDED)
+            self.cache_manager.mark_dirty(items)
 
         # 打印日志
-        self.info(Localizer.get().engine_task_language_filter.replace("{COUNT}", str(count)))
+        self.info(Localizer.get().engine_task_language_filter.replace("{COUNT}", str(len(items))))
+
+    # 文本预处理
+    # 在派发任务之前一次性完成所有未处理条目的预处理，请求线程中不再重复处理
+    # 预处理结果保存在条目中，继续任务时复用，结果发生变化的条目在下次保存时写入缓存
+    def text_preprocess(self, table: ItemTable) -> None:
+        self.preprocessor = TextPreprocessor(self.config)
+
+        items = [item for item in table.items if item.get_status() == Base.ProjectStatus.NONE]
+        if len(items) == 0:
+            return None
+
+        self.print("")
+        with ProgressBar(transient = False) as progress:
+            pid = progress.new()
+            changed = self.preprocessor.prepare(
+                items,
+                lambda completed, total: progress.update(pid, completed = completed, total = total),
+            )
+            self.cache_manager.mark_dirty(changed)
+
+        # 打印日志
+        self.info(Localizer.get().engine_task_preprocess.replace("{COUNT}", str(len(items))))
+
+        # 前置替换规则的命中次数，每条规则的详细数据只写入日志文件
+        hits = [v for v in self.preprocessor.get_replacement_hits() if v[2] > 0]
+        if len(hits) > 0:
+            self.info(
+                Localizer.get().engine_task_pre_replacement_hit.replace("{RULE}", str(len(hits))).replace("{HIT}", str(sum(v[2] for v in hits)))
+            )
+            self.info("\n" + "\n".join(f"{src} -> {dst} : {hit}" for src, dst, hit in hits), file = True, console = False)
+
+    # 获取术语表票数的快照
+    def get_glossary_votes(self) -> list[tuple[str, str, str, int]]:
+        with self.cache_manager.items_lock:
+            return self.glossary.get_votes()
 
     # 输出结果
-    def save_ouput(self, glossary: list[dict[str, str]], end: bool) -> None:
+    # 每组相同的 (原文, 译文, 类型) 只处理一次，票数用于选出最佳结果
+    def save_ouput(self, votes: list[tuple[str, str, str, int]], end: bool) -> None:
         group: dict[str, list[dict[str, str]]] = {}
         with self.lock:
-            v: dict[str, str] = {}
-            for v in glossary:
-                src: str = v.get("src").strip()
-                dst: str = v.get("dst").strip()
-                info: str = v.get("info").strip()
-
+            for src, dst, info, count in votes:
                 # 简繁转换
                 dst = self.convert_chinese_character_form(dst)
                 info = self.convert_chinese_character_form(info)
@@ -418,6 +540,7 @@ class NERAnalyzer(Base):
                         "src": src,
                         "dst": dst,
                         "info": info,
+                        "votes": count,
                     })
 
         glossary: list[dict[str, str]] = []
@@ -461,7 +584,7 @@ class NERAnalyzer(Base):
         for choice in choices:
             dst: str = choice.get("dst")
             dst_choices.add(dst)
-            dst_count[dst] = dst_count.setdefault(dst, 0) + 1
+            dst_count[dst] = dst_count.setdefault(dst, 0) + choice.get("votes", 1)
         dst = max(dst_count, key = dst_count.get)
 
         info_count: dict[str, int] = {}
@@ -469,7 +592,7 @@ class NERAnalyzer(Base):
         for choice in choices:
             info: str = choice.get("info")
             info_choices.add(info)
-            info_count[info] = info_count.setdefault(info, 0) + 1
+            info_count[info] = info_count.setdefault(info, 0) + choice.get("votes", 1)
         info = max(info_count, key = info_count.get)
 
         return {
@@ -482,35 +605,42 @@ class NERAnalyzer(Base):
 
     # 搜索参考文本，并按出现次数排序
     def search_for_context(self, glossary: list[dict[str, str]], items: list[Item], end: bool) -> list[dict[str, str | int | list[str]]]:
-        lines: list[str] = [item.get_src().strip() for item in items if item.get_status() == Base.ProjectStatus.PROCESSED]
-        lines_cp: list[str] = lines.copy()
+        # 相同的文本行只需要搜索一次
+        lines: list[str] = list(dict.fromkeys(
+            item.get_src().strip() for item in items if item.get_status() == Base.ProjectStatus.PROCESSED
+        ))
 
-        # 按实体词语的长度降序排序
+        # 按实体词语的长度降序排序，排序后的索引即为匹配的优先级
         glossary = sorted(glossary, key = lambda x: len(x.get("src")), reverse = True)
+        srcs: list[str] = [entry.get("src") for entry in glossary]
+        contexts: list[list[str]] = [[] for _ in glossary]
+
+        # 构建多模式匹配自动机，对所有文本行只进行一次扫描
+        automaton = Automaton(srcs)
 
         self.print("")
         with ProgressBar(transient = False) as progress:
             pid = progress.new() if end == True else None
-            for entry in glossary:
-                progress.update(pid, advance = 1, total = len(glossary)) if end == True else None
-                src: str = entry.get("src")
-
-                # 找出匹配的行
-                index = {i for i, line in enumerate(lines) if src in line}
-
-                # 获取匹配的参考文本，去重，并按长度降序排序
-                entry["context"] = sorted(
-                    list({line for i, line in enumerate(lines_cp) if i in index}),
-                    key = lambda x: len(x),
-                    reverse = True,
-                )
-                entry["count"] = len(entry.get("context"))
-
-                # 掩盖已命中的实体词语文本，避免其子串错误的与父串匹配
-                lines = [
-                    line.replace(src, len(src) * "#") if i in index else line
-                    for i, line in enumerate(lines)
-                ]
+            for line in lines:
+                progress.update(pid, advance = 1, total = len(lines)) if end == True else None
+
+                # 找出当前行中出现过的实体词语
+                indexes = automaton.search(line)
+                if len(indexes) == 0:
+                    continue
+
+                # 按优先级依次匹配，并掩盖已命中的实体词语文本，避免其子串错误的与父串匹配
+                masked: str = line
+                for i in sorted(indexes):
+                    src: str = srcs[i]
+                    if src in masked:
+                        contexts[i].append(line)
+                        masked = masked.replace(src, len(src) * "#")
+
+        for entry, context in zip(glossary, contexts):
+            # 获取匹配的参考文本，并按长度降序排序
+            entry["context"] = sorted(context, key = lambda x: len(x), reverse = True)
+            entry["count"] = len(entry.get("context"))
 
         # 打印日志
         self.info(Localizer.get().engine_task_context_search.replace("{COUNT}", str(len(glossary))))
@@ -531,20 +661,93 @@ class NERAnalyzer(Base):
         else:
             return __class__.OPENCCT2S.convert(src)
 
+    # 获取尚未结束的任务数量
+    def get_task_pending(self) -> int:
+        with self.lock:
+            return self.task_pending
+
+    # 重试任务，返回是否已安排重试
+    # 退避时间按重试次数指数增长并加入随机抖动，服务端给出等待时间时至少等待该时间
+    def retry_task(self, task: NERAnalyzerTask) -> bool:
+        if task.error_type not in __class__.RETRYABLE_ERRORS or task.retry_count >= __class__.RETRY_LIMIT:
+            return False
+        if Engine.get().get_status() == Base.TaskStatus.STOPPING:
+            return False
+
+        delay = min(__class__.RETRY_BACKOFF_MAX, __class__.RETRY_BACKOFF_BASE * 2 ** task.retry_count) * random.uniform(0.5, 1.0)
+        if task.retry_after is not None:
+            delay = max(delay, task.retry_after)
+        task.retry_count = task.retry_count + 1
+
+        timer = threading.Timer(delay, self.task_queue.put, args = (task,))
+        timer.daemon = True
+        timer.start()
+
+        return True
+
+    # 将任务中未完成的条目切分为更小的任务，每个条目最多执行 max_round 次
+    def generate_requeue_tasks(self, task: NERAnalyzerTask) -> list[NERAnalyzerTask]:
+        items: list[Item] = []
+        for item in task.items:
+            if item.get_status() != Base.ProjectStatus.NONE:
+                continue
+
+            attempts = self.item_attempts.get(id(item), 0) + 1
+            self.item_attempts[id(item)] = attempts
+            if attempts < self.config.max_round:
+                items.append(item)
+
+        if len(items) == 0 or Engine.get().get_status() == Base.TaskStatus.STOPPING:
+            return []
+
+        return [
+            NERAnalyzerTask(self.config, self.platform, chunk, self.preprocessor.get(chunk))
+            for chunk in self.cache_manager.generate_item_chunks(max(1, task.token_estimate // 2), items)
+        ]
+
     # 翻译任务完成时
-    def task_done_callback(self, future: concurrent.futures.Future, pid: TaskID, progress: ProgressBar) -> None:
+    def task_done_callback(self, future: concurrent.futures.Future, task: NERAnalyzerTask, pid: TaskID, progress: ProgressBar) -> None:
+        # 根据请求结果调整并发上限
+        self.controller.release(task.latency, task.error_type, task.retry_after)
+
+        # 任务重新派发时会覆盖其密钥与请求结果，因此需要在重新派发之前读取结果并修正额度
         try:
             # 获取结果
             result = future.result()
 
+            # 按实际消耗修正请求所用密钥预留的 Token 数量，请求失败时无法得知实际消耗，保留预留的额度
+            if isinstance(result, dict) and task.error_type == Base.RequestError.NONE:
+                self.task_limiter.adjust(
+                    result.get("input_tokens", 0) + result.get("output_tokens", 0) - task.token_estimate,
+                    key = task.key,
+                )
+        except Exception as e:
+            result = None
+            self.error(f"{Localizer.get().log_task_fail}", e)
+
+        # 可重试的错误在退避时间后重新放入任务队列，否则任务结束，未完成的条目重新切分后放入任务队列
+        if self.retry_task(task) == False:
+            with self.lock:
+                requeue = self.generate_requeue_tasks(task)
+                self.task_pending = self.task_pending - 1 + len(requeue)
+                for v in requeue:
+                    self.task_queue.put(v)
+
+        try:
+            # 标记任务条目已变化，下次保存缓存时只写入这些条目
+            self.cache_manager.mark_dirty(task.items)
+
             # 结果为空则跳过后续的更新步骤
             if not isinstance(result, dict) or len(result) == 0:
                 return
 
             # 记录数据
-            with self.lock:
+            # 术语表票数与缓存数据共用缓存管理器的锁，保证保存缓存时不会读取到修改中的数据
+            with self.lock, self.cache_manager.items_lock:
+                self.glossary.add(result.get("glossary", []))
+
                 new = {}
-                new["glossary"] = self.extras.get("glossary", []) + result.get("glossary", 0)
+                new["glossary"] = self.glossary.get_data()
                 new["start_time"] = self.extras.get("start_time", 0)
                 new["total_line"] = self.extras.get("total_line", 0)
                 new["line"] = self.extras.get("line", 0) + result.get("row_count", 0)
@@ -1,4 +1,4 @@
-import re
+import asyncio
 import time
 
 import rich
@@ -10,17 +10,17 @@ from base.Base import Base
 from base.LogManager import LogManager
 from model.Item import Item
 from module.Config import Config
+from module.Engine.ConcurrencyController import ConcurrencyController
+from module.Engine.ResponseCache import ResponseCache
+from module.Engine.TaskLimiter import TaskLimiter
 from module.Engine.TaskRequester import TaskRequester
-from module.FakeNameHelper import FakeNameHelper
 from module.Localizer.Localizer import Localizer
-from module.Normalizer import Normalizer
 from module.PromptBuilder import PromptBuilder
 from module.Response.ResponseDecoder import ResponseDecoder
-from module.RubyCleaner import RubyCleaner
 
 class NERAnalyzerTask(Base):
 
-    def __init__(self, config: Config, platform: dict, items: list[Item]) -> None:
+    def __init__(self, config: Config, platform: dict, items: list[Item], srcs: list[str]) -> None:
         super().__init__()
 
         # 初始化
@@ -29,63 +29,146 @@ class NERAnalyzerTask(Base):
         self.platform = platform
         self.prompt_builder = PromptBuilder(self.config)
 
+        # 预估的 Token 数量，用于在派发前预留额度
+        self.token_estimate: int = sum(item.get_token_count() for item in items)
+
+        # 预处理后的原文
+        self.srcs: list[str] = srcs
+
+        # 已重试的次数
+        self.retry_count: int = 0
+
+        # 请求使用的密钥，派发任务时从密钥池中选定，并按该密钥预留限流器的额度
+        self.key: str = None
+
+        # 限流器与并发控制器，派发任务时设置，发起对冲请求前同样需要预留额度
+        self.task_limiter: TaskLimiter = None
+        self.controller: ConcurrencyController = None
+
+        # 请求结果，用于并发控制
+        self.latency: float = 0.0
+        self.error_type: Base.RequestError = Base.RequestError.NONE
+        self.retry_after: float = None
+
+        # 流式请求解码出的术语条目，以及解码出第一个条目的耗时
+        self.stream_glossary: list[dict[str, str]] = None
+        self.first_entry_latency: float = None
+
     # 启动任务
     def start(self) -> dict[str, str]:
         return self.request(self.items)
 
+    # 启动异步任务
+    async def start_async(self) -> dict[str, str]:
+        return await self.request_async(self.items)
+
     # 请求
     def request(self, items: list[Item]) -> dict[str, str]:
         # 任务开始的时间
         start_time = time.time()
 
-        # 文本预处理
-        srcs: list[str] = []
-        for item in items:
-            # 注入姓名
-            if item.get_first_name_src() is not None:
-                item.set_src(f"【{item.get_first_name_src()}】{item.get_src()}")
-
-            # 拆分文本
-            for src in item.get_src().split("\n"):
-                # 正规化
-                src = Normalizer.normalize(src)
+        # 预处理后的原文
+        srcs: list[str] = self.srcs
 
-                # 清理注音
-                src = RubyCleaner.clean(src)
+        # 如果没有任何有效原文文本，则直接完成当前任务
+        if len(srcs) == 0:
+            return self.complete_without_request(items)
 
-                # 前置替换
-                src = self.pre_replacement(src)
+        # 生成请求提示词
+        messages, console_log = self.prompt_builder.generate_prompt(srcs)
 
-                # 注入伪名
-                src = FakeNameHelper.inject(src)
+        # 查询请求结果缓存，命中时直接使用缓存的回复，不产生任何消耗
+        cache_key, cache_data = self.get_response_cache(messages)
+        if cache_data is not None:
+            response = (False, *cache_data, 0, 0)
+            self.latency, self.error_type, self.retry_after = None, Base.RequestError.NONE, None
+            self.stream_glossary, self.first_entry_latency = None, None
+            self.cancel_key()
+        else:
+            # 发起请求
+            requester = TaskRequester(self.config, self.platform, self.task_limiter, self.controller, self.token_estimate)
+            response = requester.request(messages, self.key, TaskRequester.get_key_pool(self.platform.get("api_key")))
+            self.key = requester.key
+            self.latency, self.error_type, self.retry_after = requester.latency, requester.error_type, requester.retry_after
+            self.stream_glossary, self.first_entry_latency = requester.glossary, requester.first_entry_latency
+
+            # 写入请求结果缓存
+            self.set_response_cache(cache_key, response)
+
+        return self.complete(items, srcs, start_time, console_log, *response)
+
+    # 异步请求
+    async def request_async(self, items: list[Item]) -> dict[str, str]:
+        # 任务开始的时间
+        start_time = time.time()
 
-                if src == "":
-                    pass
-                elif src.strip() == "":
-                    pass
-                else:
-                    srcs.append(src)
+        # 预处理后的原文
+        srcs: list[str] = self.srcs
 
         # 如果没有任何有效原文文本，则直接完成当前任务
         if len(srcs) == 0:
-            for item in items:
-                item.set_dst(item.get_src())
-                item.set_status(Base.ProjectStatus.PROCESSED)
-
-            return {
-                "glossary": [],
-                "row_count": len(items),
-                "input_tokens": 0,
-                "output_tokens": 0,
-            }
+            return self.complete_without_request(items)
 
         # 生成请求提示词
         messages, console_log = self.prompt_builder.generate_prompt(srcs)
 
-        # 发起请求
-        requester = TaskRequester(self.config, self.platform)
-        skip, response_think, response_result, input_tokens, output_tokens = requester.request(messages)
+        # 查询请求结果缓存，命中时直接使用缓存的回复，不产生任何消耗
+        # 读写缓存文件、解析回复与打印日志均为阻塞操作，在线程池中执行，以免阻塞事件循环中的其他请求
+        cache_key, cache_data = await asyncio.to_thread(self.get_response_cache, messages)
+        if cache_data is not None:
+            response = (False, *cache_data, 0, 0)
+            self.latency, self.error_type, self.retry_after = None, Base.RequestError.NONE, None
+            self.stream_glossary, self.first_entry_latency = None, None
+            self.cancel_key()
+        else:
+            # 发起请求
+            requester = TaskRequester(self.config, self.platform, self.task_limiter, self.controller, self.token_estimate)
+            response = await requester.request_async(messages, self.key, TaskRequester.get_key_pool(self.platform.get("api_key")))
+            self.key = requester.key
+            self.latency, self.error_type, self.retry_after = requester.latency, requester.error_type, requester.retry_after
+            self.stream_glossary, self.first_entry_latency = requester.glossary, requester.first_entry_latency
+
+            # 写入请求结果缓存
+            await asyncio.to_thread(self.set_response_cache, cache_key, response)
+
+        return await asyncio.to_thread(self.complete, items, srcs, start_time, console_log, *response)
+
+    # 归还派发时选定但没有用于请求的密钥，预留的额度在任务完成后按实际消耗返还
+    def cancel_key(self) -> None:
+        if self.key is not None:
+            TaskRequester.get_key_pool(self.platform.get("api_key")).cancel(self.key)
+
+    # 没有任何有效原文文本时，直接完成当前任务
+    def complete_without_request(self, items: list[Item]) -> dict[str, str]:
+        self.cancel_key()
+
+        for item in items:
+            item.set_dst(item.get_src())
+            item.set_status(Base.ProjectStatus.PROCESSED)
+
+        return {
+            "glossary": [],
+            "row_count": len(items),
+            "input_tokens": 0,
+            "output_tokens": 0,
+        }
+
+    # 查询请求结果缓存，返回 (缓存键, 缓存数据)
+    def get_response_cache(self, messages: list[dict]) -> tuple[str, tuple[str, str] | None]:
+        if self.config.response_cache_enable == False:
+            return "", None
+
+        key = ResponseCache.get_key(self.platform, messages)
+        return key, ResponseCache.get(key)
+
+    # 写入请求结果缓存，只缓存成功的请求
+    def set_response_cache(self, key: str, response: tuple[bool, str, str, int, int]) -> None:
+        skip, response_think, response_result, _, _ = response
+        if key != "" and skip == False and response_result != "":
+            ResponseCache.set(key, response_think, response_result)
 
+    # 处理请求结果
+    def complete(self, items: list[Item], srcs: list[str], start_time: float, console_log: list[str], skip: bool, response_think: str, response_result: str, input_tokens: int, output_tokens: int) -> dict[str, str]:
         # 如果请求结果标记为 skip，即有错误发生，则跳过本次循环
         if skip == True:
             return {
@@ -95,8 +178,11 @@ class NERAnalyzerTask(Base):
                 "output_tokens": 0,
             }
 
-        # 提取回复内容
-        _, glossary = ResponseDecoder().decode(response_result)
+        # 提取回复内容，流式请求时直接使用接收回复时解码出的术语条目
+        if self.stream_glossary is not None:
+            glossary = self.stream_glossary
+        else:
+            _, glossary = ResponseDecoder().decode(response_result)
 
         # 模型回复日志
         # 在这里将日志分成打印在控制台和写入文件的两份，按不同逻辑处理
@@ -129,19 +215,6 @@ class NERAnalyzerTask(Base):
             "output_tokens": output_tokens,
         }
 
-    # 前置替换
-    def pre_replacement(self, src: str) -> str:
-        if self.config.pre_replacement_enable == False:
-            return src
-
-        for v in self.config.pre_replacement_data:
-            if v.get("regex", False) != True:
-                src = src.replace(v.get("src"), v.get("dst"))
-            else:
-                src = re.sub(rf"{v.get("src")}", rf"{v.get("dst")}", src)
-
-        return src
-
     # 打印日志表格
     def print_log_table(self, start: int, input: int, output: int, srcs: list[str], file_log: list[str], console_log: list[str]) -> None:
         # 拼接错误原因文本
@@ -150,6 +223,10 @@ class NERAnalyzerTask(Base):
         message = message.replace("{LINES}", f"{len(srcs)}")
         message = message.replace("{PT}", f"{input}")
         message = message.replace("{CT}", f"{output}")
+        if self.config.response_cache_enable == True:
+            message = message + Localizer.get().engine_task_cache_hit.replace("{RATIO}", f"{(ResponseCache.get_hit_ratio() * 100):.2f}")
+        if self.first_entry_latency is not None:
+            message = message + Localizer.get().engine_task_first_entry.replace("{TIME}", f"{self.first_entry_latency:.2f}")
         log_func = self.info
 
         # 添加日志
@@ -0,0 +1,129 @@
+import collections
+import heapq
+import itertools
+import threading
+import time
+from typing import Callable
+
+class RequestHedger():
+
+    # 对冲请求：请求的耗时超过近期请求耗时的指定分位数时，再发送一个相同的请求，先成功返回的结果胜出
+    # 对冲请求的数量不超过请求总数的指定比例，以限制额外的消耗
+
+    # 用于计算分位数的近期请求耗时的数量
+    WINDOW: int = 256
+
+    # 开始对冲前至少需要的请求耗时样本数量
+    MIN_SAMPLES: int = 16
+
+    # 配置
+    PERCENTILE: float = 0.95
+    BUDGET: float = 0.10
+
+    # 近期请求耗时
+    LATENCIES: collections.deque[float] = collections.deque(maxlen = WINDOW)
+
+    # 统计
+    REQUESTS: int = 0
+    ISSUED: int = 0
+    WON: int = 0
+
+    # 类线程锁
+    LOCK: threading.Lock = threading.Lock()
+
+    # 定时器，所有请求共用一个线程，按到期时间依次执行回调
+    TIMERS: list[list] = []
+    TIMER_COUNTER: itertools.count = itertools.count()
+    TIMER_CONDITION: threading.Condition = threading.Condition()
+    TIMER_THREAD: threading.Thread = None
+
+    # 重置
+    @classmethod
+    def reset(cls, percentile: float, budget: float) -> None:
+        with cls.LOCK:
+            cls.PERCENTILE = min(0.99, max(0.50, percentile))
+            cls.BUDGET = max(0.0, budget)
+            cls.LATENCIES = collections.deque(maxlen = cls.WINDOW)
+            cls.REQUESTS = 0
+            cls.ISSUED = 0
+            cls.WON = 0
+
+    # 获取开始对冲前的等待时间，样本不足时返回 None
+    @classmethod
+    def get_delay(cls) -> float | None:
+        with cls.LOCK:
+            cls.REQUESTS = cls.REQUESTS + 1
+            if len(cls.LATENCIES) < cls.MIN_SAMPLES:
+                return None
+
+            latencies = sorted(cls.LATENCIES)
+            return latencies[min(len(latencies) - 1, int(len(latencies) * cls.PERCENTILE))]
+
+    # 记录成功请求的耗时
+    @classmethod
+    def record(cls, latency: float) -> None:
+        with cls.LOCK:
+            cls.LATENCIES.append(latency)
+
+    # 尝试发送对冲请求，超出额外消耗的上限时返回 False
+    @classmethod
+    def try_issue(cls) -> bool:
+        with cls.LOCK:
+            if cls.ISSUED + 1 > cls.REQUESTS * cls.BUDGET:
+                return False
+
+            cls.ISSUED = cls.ISSUED + 1
+            return True
+
+    # 撤销已计入配额的对冲请求，对冲请求最终没有发出时调用
+    @classmethod
+    def cancel_issue(cls) -> None:
+        with cls.LOCK:
+            cls.ISSUED = max(0, cls.ISSUED - 1)
+
+    # 记录对冲请求胜出
+    @classmethod
+    def record_win(cls) -> None:
+        with cls.LOCK:
+            cls.WON = cls.WON + 1
+
+    # 在指定的时间后执行回调，回调在定时器线程中执行，不应长时间阻塞，返回用于取消的句柄
+    @classmethod
+    def schedule(cls, delay: float, callback: Callable[[], None]) -> list:
+        timer = [time.monotonic() + delay, next(cls.TIMER_COUNTER), callback]
+        with cls.TIMER_CONDITION:
+            heapq.heappush(cls.TIMERS, timer)
+            if cls.TIMER_THREAD is None:
+                cls.TIMER_THREAD = threading.Thread(target = cls.run_timers, name = "HEDGE_TIMER", daemon = True)
+                cls.TIMER_THREAD.start()
+            cls.TIMER_CONDITION.notify()
+
+        return timer
+
+    # 取消尚未执行的回调
+    @classmethod
+    def unschedule(cls, timer: list) -> None:
+        with cls.TIMER_CONDITION:
+            timer[2] = None
+
+    # 定时器线程
+    @classmethod
+    def run_timers(cls) -> None:
+        while True:
+            with cls.TIMER_CONDITION:
+                while len(cls.TIMERS) == 0 or cls.TIMERS[0][0] > time.monotonic():
+                    cls.TIMER_CONDITION.wait(None if len(cls.TIMERS) == 0 else cls.TIMERS[0][0] - time.monotonic())
+
+                _, _, callback = heapq.heappop(cls.TIMERS)
+
+            if callback is not None:
+                try:
+                    callback()
+                except Exception:
+                    pass
+
+    # 获取统计数据，返回 (已发送的对冲请求数量, 胜出的对冲请求数量)
+    @classmethod
+    def get_stats(cls) -> tuple[int, int]:
+        with cls.LOCK:
+            return cls.ISSUED, cls.WON
\ No newline at end of file
@@ -0,0 +1,152 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+from base.LogManager import LogManager
+from module.Localizer.Localizer import Localizer
+
+class ResponseCache():
+
+    # 缓存容量上限（字节），超出后按最近使用时间淘汰
+    MAX_SIZE: int = 512 * 1024 * 1024
+
+    # 缓存文件夹
+    PATH: str = ""
+
+    # 缓存文件索引 {文件名: (最近使用时间, 文件大小)}
+    FILES: dict[str, tuple[float, int]] = {}
+    SIZE: int = 0
+
+    # 命中统计
+    HIT: int = 0
+    MISS: int = 0
+
+    # 类线程锁
+    LOCK: threading.Lock = threading.Lock()
+
+    # 重置
+    @classmethod
+    def reset(cls, output_folder: str) -> None:
+        with cls.LOCK:
+            cls.PATH = f"{output_folder}/cache/response"
+            cls.FILES = {}
+            cls.SIZE = 0
+            cls.HIT = 0
+            cls.MISS = 0
+
+            # 载入已有的缓存文件索引
+            try:
+                os.makedirs(cls.PATH, exist_ok = True)
+                for entry in os.scandir(cls.PATH):
+                    if entry.is_file() and entry.name.endswith(".json"):
+                        stat = entry.stat()
+                        cls.FILES[entry.name] = (stat.st_mtime, stat.st_size)
+                        cls.SIZE = cls.SIZE + stat.st_size
+            except Exception as e:
+                LogManager.get().debug(Localizer.get().log_read_file_fail, e)
+
+    # 计算缓存键，同样的请求内容与生成参数得到同样的结果
+    @classmethod
+    def get_key(cls, platform: dict, messages: list[dict]) -> str:
+        args: dict[str, float] = {}
+        if platform.get("top_p_custom_enable") == True:
+            args["top_p"] = platform.get("top_p")
+        if platform.get("temperature_custom_enable") == True:
+            args["temperature"] = platform.get("temperature")
+        if platform.get("presence_penalty_custom_enable") == True:
+            args["presence_penalty"] = platform.get("presence_penalty")
+        if platform.get("frequency_penalty_custom_enable") == True:
+            args["frequency_penalty"] = platform.get("frequency_penalty")
+
+        data = json.dumps(
+            {
+                "model": platform.get("model"),
+                "api_format": platform.get("api_format"),
+                "thinking": platform.get("thinking"),
+                "args": args,
+                "messages": messages,
+            },
+            indent = None,
+            sort_keys = True,
+            ensure_ascii = False,
+        )
+
+        return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+    # 读取缓存，返回 (思考内容, 回复内容)，未命中时返回 None
+    @classmethod
+    def get(cls, key: str) -> tuple[str, str] | None:
+        name = f"{key}.json"
+        with cls.LOCK:
+            if cls.PATH == "" or name not in cls.FILES:
+                cls.MISS = cls.MISS + 1
+                return None
+
+        try:
+            with open(f"{cls.PATH}/{name}", "r", encoding = "utf-8") as reader:
+                data: dict[str, str] = json.load(reader)
+            os.utime(f"{cls.PATH}/{name}")
+        except Exception as e:
+            LogManager.get().debug(Localizer.get().log_read_file_fail, e)
+            with cls.LOCK:
+                cls.MISS = cls.MISS + 1
+            return None
+
+        with cls.LOCK:
+            cls.HIT = cls.HIT + 1
+            if name in cls.FILES:
+                cls.FILES[name] = (time.time(), cls.FILES.get(name)[1])
+
+        return data.get("think", ""), data.get("result", "")
+
+    # 写入缓存
+    @classmethod
+    def set(cls, key: str, response_think: str, response_result: str) -> None:
+        if cls.PATH == "":
+            return None
+
+        name = f"{key}.json"
+        path = f"{cls.PATH}/{name}"
+        try:
+            # 先写入临时文件再替换，避免中断时留下不完整的缓存文件
+            data = json.dumps(
+                {
+                    "think": response_think,
+                    "result": response_result,
+                },
+                indent = None,
+                ensure_ascii = False,
+            ).encode("utf-8")
+            with open(f"{path}.{threading.get_ident()}.tmp", "wb") as writer:
+                writer.write(data)
+            os.replace(f"{path}.{threading.get_ident()}.tmp", path)
+        except Exception as e:
+            LogManager.get().debug(Localizer.get().log_write_file_fail, e)
+            return None
+
+        with cls.LOCK:
+            if name in cls.FILES:
+                cls.SIZE = cls.SIZE - cls.FILES.get(name)[1]
+            cls.FILES[name] = (time.time(), len(data))
+            cls.SIZE = cls.SIZE + len(data)
+
+            # 超出容量上限时，淘汰最久未使用的缓存
+            if cls.SIZE > cls.MAX_SIZE:
+                for name, (_, size) in sorted(cls.FILES.items(), key = lambda x: x[1][0]):
+                    if cls.SIZE <= cls.MAX_SIZE * 0.9:
+                        break
+
+                    try:
+                        os.remove(f"{cls.PATH}/{name}")
+                    except Exception:
+                        pass
+                    cls.FILES.pop(name, None)
+                    cls.SIZE = cls.SIZE - size
+
+    # 获取缓存命中率
+    @classmethod
+    def get_hit_ratio(cls) -> float:
+        with cls.LOCK:
+            return cls.HIT / max(1, cls.HIT + cls.MISS)
@@ -1,45 +1,132 @@
+import threading
 import time
+from typing import Callable
+
+from base.Base import Base
+from module.Engine.Engine import Engine
 
 class TaskLimiter:
 
-    def __init__(self, rps: int, rpm: int) -> None:
+    # 同时限制 每秒请求数、每分钟请求数 与 每分钟 Token 数，所有限制均为令牌桶
+    # 每个 API 密钥拥有独立的一组令牌桶，请求在从密钥池中选定密钥之后按该密钥预留额度，不指定密钥时所有请求共用一组令牌桶
+    # 请求的 Token 数量在派发前按估算值预留，请求完成后按实际消耗修正
+
+    # 每分钟限制的令牌桶允许的突发量，以秒为单位，即最多可以积攒多少秒的额度
+    BURST_SECONDS: float = 6.0
+
+    # 等待额度时单次休眠的最长时间，以便及时响应停止任务的请求
+    SLEEP_SLICE: float = 0.5
+
+    # 令牌桶
+    class Bucket:
+
+        def __init__(self, capacity: float, rate: float, now: float) -> None:
+            self.capacity = capacity
+            self.rate = rate
+            self.available = capacity
+            self.last_time = now
+
+        # 恢复额度
+        def refill(self, now: float) -> None:
+            self.available = min(self.capacity, self.available + (now - self.last_time) * self.rate)
+            self.last_time = now
+
+        # 计算获取额度所需的等待时间
+        # 超过容量的请求在令牌桶装满时放行，超出的部分记为欠额，以避免永远无法满足
+        def get_wait_time(self, amount: float) -> float:
+            return max(0.0, (min(amount, self.capacity) - self.available) / self.rate)
+
+        # 扣减额度
+        def consume(self, amount: float) -> None:
+            self.available = self.available - amount
+
+    def __init__(self, rps: int, rpm: int, tpm: int = 0, burst: float = None, clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep) -> None:
         self.rps = rps
         self.rpm = rpm
-        self.max_tokens = self._calculate_max_tokens()
-        self.rate_per_second = self._calculate_stricter_rate()
-        self.available_tokens = self.max_tokens
-        self.last_request_time = time.time()
-
-    # 计算最大令牌数
-    def _calculate_max_tokens(self) -> float:
-        return min(
-            self.rps if self.rps > 0 else 0,
-            self.rpm / 60 if self.rpm > 0 else 0,
-        )
+        self.tpm = tpm
+        self.burst = burst if burst is not None else __class__.BURST_SECONDS
+        self.clock = clock
+        self.sleep = sleep
+
+        # 每个密钥的令牌桶
+        self.buckets: dict[str, tuple[__class__.Bucket, __class__.Bucket]] = {}
 
-    # 计算每秒恢复的请求额度
-    def _calculate_stricter_rate(self) -> float:
-        return min(
+        # 线程锁
+        self.lock = threading.Lock()
+
+    # 获取密钥对应的令牌桶，分别为 请求数 与 Token 数 的令牌桶
+    def get_buckets(self, key: str, now: float) -> tuple[Bucket | None, Bucket | None]:
+        buckets = self.buckets.get(key)
+        if buckets is None:
+            buckets = (self.create_request_bucket(now), self.create_token_bucket(now))
+            self.buckets[key] = buckets
+
+        return buckets
+
+    # 创建请求数令牌桶，每秒与每分钟的限制同时存在时取更严格的速率
+    def create_request_bucket(self, now: float) -> Bucket | None:
+        rate = min(
             self.rps if self.rps > 0 else float("inf"),
             self.rpm / 60 if self.rpm > 0 else float("inf"),
         )
+        if rate == float("inf"):
+            return None
 
-    # 等待直到有足够的请求额度
-    def wait(self) -> None:
-        current_time = time.time()
-        elapsed_time = current_time - self.last_request_time
+        capacity = min(
+            self.rps if self.rps > 0 else float("inf"),
+            self.rpm / 60 * self.burst if self.rpm > 0 else float("inf"),
+        )
+        return __class__.Bucket(max(1.0, capacity), rate, now)
 
-        # 恢复额度
-        self.available_tokens = self.available_tokens + elapsed_time * self.rate_per_second
-        self.available_tokens = min(self.available_tokens, self.max_tokens)
+    # 创建 Token 数令牌桶
+    def create_token_bucket(self, now: float) -> Bucket | None:
+        if self.tpm <= 0:
+            return None
+
+        return __class__.Bucket(max(1.0, self.tpm / 60 * self.burst), self.tpm / 60, now)
+
+    # 尝试获取额度，成功时返回 0，否则返回需要等待的时间
+    def try_acquire(self, tokens: int = 0, key: str = "") -> float:
+        with self.lock:
+            now = self.clock()
+            request_bucket, token_bucket = self.get_buckets(key, now)
+
+            wait = 0.0
+            if request_bucket is not None:
+                request_bucket.refill(now)
+                wait = max(wait, request_bucket.get_wait_time(1))
+            if token_bucket is not None and tokens > 0:
+                token_bucket.refill(now)
+                wait = max(wait, token_bucket.get_wait_time(tokens))
+
+            # 所有令牌桶的额度都足够时才同时扣减
+            if wait == 0:
+                if request_bucket is not None:
+                    request_bucket.consume(1)
+                if token_bucket is not None and tokens > 0:
+                    token_bucket.consume(tokens)
+
+            return wait
+
+    # 等待直到有足够的额度，获得额度时返回 True，等待期间任务停止时返回 False
+    def wait(self, tokens: int = 0, key: str = "") -> bool:
+        while True:
+            wait = self.try_acquire(tokens, key)
+            if wait <= 0:
+                return True
+            if Engine.get().get_status() == Base.TaskStatus.STOPPING:
+                return False
 
-        # 如果额度不足，等待
-        if self.available_tokens < 1:
-            time.sleep((1 - self.available_tokens) / self.rate_per_second)
-            self.available_tokens = 1
+            self.sleep(min(wait, __class__.SLEEP_SLICE))
 
-        # 扣减令牌
-        self.available_tokens = self.available_tokens - 1
+    # 按实际消耗修正预留的 Token 数量，差值为正时扣减，为负时返还
+    def adjust(self, tokens: int, key: str = "") -> None:
+        with self.lock:
+            now = self.clock()
+            _, token_bucket = self.get_buckets(key, now)
+            if token_bucket is None:
+                return None
 
-        # 更新最后请求时间
-        self.last_request_time = time.time()
\ No newline at end of file
+            token_bucket.refill(now)
+            token_bucket.consume(tokens)
+            token_bucket.available = min(token_bucket.capacity, token_bucket.available)
\ No newline at end of file
@@ -1,7 +1,13 @@
+import asyncio
+import concurrent.futures
 import json
 import re
 import threading
+import time
 from functools import lru_cache
+from typing import AsyncIterator
+from typing import Iterator
+from typing import Self
 
 import anthropic
 import httpx
@@ -12,12 +18,21 @@ from google.genai import types
 from base.Base import Base
 from base.VersionManager import VersionManager
 from module.Config import Config
+from module.Engine.ConcurrencyController import ConcurrencyController
+from module.Engine.Engine import Engine
+from module.Engine.KeyPool import KeyPool
+from module.Engine.RequestHedger import RequestHedger
+from module.Engine.TaskLimiter import TaskLimiter
 from module.Localizer.Localizer import Localizer
+from module.Response.ResponseDecoder import ResponseDecoder
 
 class TaskRequester(Base):
 
-    # 密钥索引
-    API_KEY_INDEX: int = 0
+    # 密钥池
+    KEY_POOLS: dict[tuple[str, ...], KeyPool] = {}
+
+    # 对冲请求使用的线程池
+    HEDGE_EXECUTOR: concurrent.futures.ThreadPoolExecutor = None
 
     # qwen3_instruct_8b_q6k
     RE_QWEN3: re.Pattern = re.compile(r"qwen3", flags = re.IGNORECASE)
@@ -41,35 +56,71 @@ class TaskRequester(Base):
     # 类线程锁
     LOCK: threading.Lock = threading.Lock()
 
-    def __init__(self, config: Config, platform: dict[str, str | bool | int | float | list]) -> None:
+    # 异步客户端，与创建时的事件循环绑定，事件循环结束前需要关闭
+    ASYNC_CLIENTS: dict[tuple, openai.AsyncOpenAI | genai.Client | anthropic.AsyncAnthropic] = {}
+
+    # 不支持 stream_options 参数的接口地址
+    STREAM_OPTIONS_UNSUPPORTED: set[str] = set()
+
+    def __init__(self, config: Config, platform: dict[str, str | bool | int | float | list], task_limiter: TaskLimiter = None, controller: ConcurrencyController = None, tokens: int = 0) -> None:
         super().__init__()
 
         # 初始化
         self.config = config
         self.platform = platform
 
+        # 发起对冲请求前需要预留额度的限流器与并发控制器，以及请求预估的 Token 数量
+        self.task_limiter = task_limiter
+        self.controller = controller
+        self.tokens = tokens
+
+        # 对冲请求落败时由胜出方设置，流式请求收到取消标记后提前结束
+        self.cancelled: bool = False
+
+        # 最近一次请求使用的密钥与请求结果，用于密钥调度与并发控制
+        self.key: str = ""
+        self.latency: float = 0.0
+        self.error_type: Base.RequestError = Base.RequestError.NONE
+        self.retry_after: float = None
+
+        # 流式请求解码出的术语条目，以及从发起请求到解码出第一个条目的耗时，非流式请求时为 None
+        self.decoder: ResponseDecoder = None
+        self.glossary: list[dict[str, str]] = None
+        self.first_entry_latency: float = None
+
     # 重置
     @classmethod
     def reset(cls) -> None:
-        cls.API_KEY_INDEX: int = 0
+        cls.KEY_POOLS.clear()
         cls.get_client.cache_clear()
+        cls.ASYNC_CLIENTS.clear()
+        cls.STREAM_OPTIONS_UNSUPPORTED.clear()
 
+        # 关闭上一次任务的对冲请求线程池，仍在执行的请求会在后台结束
+        with cls.LOCK:
+            if cls.HEDGE_EXECUTOR is not None:
+                cls.HEDGE_EXECUTOR.shutdown(wait = False, cancel_futures = True)
+                cls.HEDGE_EXECUTOR = None
+
+    # 获取对冲请求使用的线程池
     @classmethod
-    def get_key(cls, keys: list[str]) -> str:
-        key: str = ""
-
-        if len(keys) == 0:
-            key = "no_key_required"
-        elif len(keys) == 1:
-            key = keys[0]
-        elif cls.API_KEY_INDEX >= len(keys) - 1:
-            key = keys[0]
-            cls.API_KEY_INDEX = 0
-        else:
-            key = keys[cls.API_KEY_INDEX]
-            cls.API_KEY_INDEX = cls.API_KEY_INDEX + 1
+    def get_hedge_executor(cls) -> concurrent.futures.ThreadPoolExecutor:
+        with cls.LOCK:
+            if cls.HEDGE_EXECUTOR is None:
+                cls.HEDGE_EXECUTOR = concurrent.futures.ThreadPoolExecutor(max_workers = 1024, thread_name_prefix = "HEDGE_")
 
-        return key
+            return cls.HEDGE_EXECUTOR
+
+    # 获取密钥池，相同的密钥列表共用一个密钥池
+    @classmethod
+    def get_key_pool(cls, keys: list[str]) -> KeyPool:
+        with cls.LOCK:
+            pool = cls.KEY_POOLS.get(tuple(keys))
+            if pool is None:
+                pool = KeyPool(keys)
+                cls.KEY_POOLS[tuple(keys)] = pool
+
+            return pool
 
     # 获取客户端
     @classmethod
@@ -139,8 +190,119 @@ class TaskRequester(Base):
                 max_retries = 0,
             )
 
-    # 发起请求
-    def request(self, messages: list[dict]) -> tuple[bool, str, int, int]:
+    # 获取异步客户端
+    @classmethod
+    def get_async_client(cls, url: str, key: str, format: Base.APIFormat, timeout: int) -> openai.AsyncOpenAI | genai.Client | anthropic.AsyncAnthropic:
+        k = (url, key, format, timeout)
+        if k in cls.ASYNC_CLIENTS:
+            return cls.ASYNC_CLIENTS.get(k)
+
+        if format == Base.APIFormat.GOOGLE:
+            # Google 的客户端通过 aio 属性发起异步请求
+            client = genai.Client(
+                api_key = key,
+                http_options = types.HttpOptions(
+                    base_url = url,
+                    timeout = timeout * 1000,
+                    headers = {
+                        "User-Agent": f"KeywordGacha/{VersionManager.get().get_version()} (https://github.com/neavo/KeywordGacha)",
+                    },
+                ),
+            )
+        elif format == Base.APIFormat.ANTHROPIC:
+            client = anthropic.AsyncAnthropic(
+                base_url = url,
+                api_key = key,
+                timeout = httpx.Timeout(
+                    read = timeout,
+                    pool = 8.00,
+                    write = 8.00,
+                    connect = 8.00,
+                ),
+                max_retries = 0,
+            )
+        else:
+            client = openai.AsyncOpenAI(
+                base_url = url,
+                api_key = key,
+                timeout = httpx.Timeout(
+                    read = timeout,
+                    pool = 8.00,
+                    write = 8.00,
+                    connect = 8.00,
+                ),
+                max_retries = 0,
+            )
+
+        cls.ASYNC_CLIENTS[k] = client
+        return client
+
+    # 关闭异步客户端，需要在创建客户端的事件循环中执行
+    @classmethod
+    async def close_async_clients(cls) -> None:
+        with cls.LOCK:
+            clients = list(cls.ASYNC_CLIENTS.values())
+            cls.ASYNC_CLIENTS.clear()
+
+        for client in clients:
+            try:
+                if isinstance(client, genai.Client):
+                    await client.aio.aclose()
+                else:
+                    await client.close()
+            except Exception:
+                pass
+
+    # 判断错误类型，并获取服务端要求的等待时间
+    @classmethod
+    def classify_error(cls, e: Exception) -> tuple[Base.RequestError, float]:
+        # 超时
+        if isinstance(e, (openai.APITimeoutError, anthropic.APITimeoutError, httpx.TimeoutException, TimeoutError)):
+            return Base.RequestError.TIMEOUT, None
+
+        # 网络错误
+        if isinstance(e, (openai.APIConnectionError, anthropic.APIConnectionError, httpx.TransportError, ConnectionError)):
+            return Base.RequestError.NETWORK, None
+
+        # 状态码，OpenAI 与 Anthropic 为 status_code，Google 为 code
+        status = getattr(e, "status_code", None)
+        if not isinstance(status, int):
+            status = getattr(e, "code", None)
+        if not isinstance(status, int):
+            return Base.RequestError.OTHER, None
+
+        if status == 429:
+            return Base.RequestError.RATE_LIMIT, cls.get_retry_after(getattr(e, "response", None))
+        elif status in (401, 403):
+            return Base.RequestError.AUTH, None
+        elif status == 408:
+            return Base.RequestError.TIMEOUT, None
+        elif status >= 500:
+            return Base.RequestError.SERVER, cls.get_retry_after(getattr(e, "response", None))
+        elif status >= 400:
+            return Base.RequestError.CLIENT, None
+        else:
+            return Base.RequestError.OTHER, None
+
+    # 从响应头中获取服务端要求的等待时间
+    @classmethod
+    def get_retry_after(cls, response: httpx.Response) -> float:
+        headers = getattr(response, "headers", None)
+        if headers is None:
+            return None
+
+        try:
+            if headers.get("retry-after-ms") is not None:
+                return float(headers.get("retry-after-ms")) / 1000
+            if headers.get("retry-after") is not None:
+                return float(headers.get("retry-after"))
+        except Exception:
+            pass
+
+        return None
+
+    # 生成通用请求参数
+    def generate_args(self) -> dict[str, float]:
         args: dict[str, float] = {}
         if self.platform.get("top_p_custom_enable") == True:
             args["top_p"] = self.platform.get("top_p")
@@ -151,36 +313,418 @@ class TaskRequester(Base):
         if self.platform.get("frequency_penalty_custom_enable") == True:
             args["frequency_penalty"] = self.platform.get("frequency_penalty")
 
-        thinking = self.platform.get("thinking")
+        return args
 
-        # 发起请求
-        if self.platform.get("api_format") == Base.APIFormat.SAKURALLM:
-            skip, response_think, response_result, input_tokens, output_tokens = self.request_sakura(
-                messages,
-                thinking,
-                args,
-            )
-        elif self.platform.get("api_format") == Base.APIFormat.GOOGLE:
-            skip, response_think, response_result, input_tokens, output_tokens = self.request_google(
-                messages,
-                thinking,
-                args,
-            )
-        elif self.platform.get("api_format") == Base.APIFormat.ANTHROPIC:
-            skip, response_think, response_result, input_tokens, output_tokens = self.request_anthropic(
-                messages,
-                thinking,
-                args,
-            )
+    # 发起请求
+    # 调用方已从密钥池中选定密钥时，同时传入密钥与密钥池，请求完成后更新该密钥的健康状态
+    # 启用对冲请求时，请求耗时超过近期请求耗时的分位数后再发送一个相同的请求，先成功返回的结果胜出
+    # 主请求在当前线程中执行，只有对冲请求在线程池中执行，并在结束前计入引擎的任务数量
+    # 落败的流式请求会被取消，非流式请求无法中途取消，主请求为非流式请求时需要等待其结束
+    def request(self, messages: list[dict], key: str = None, pool: KeyPool = None) -> tuple[bool, str, str, int, int]:
+        pool = __class__.get_key_pool(self.platform.get("api_key")) if key is None and pool is None else pool
+        delay = RequestHedger.get_delay() if pool is not None and self.config.request_hedge_enable == True else None
+        if delay is None:
+            return self.request_once(messages, key, pool)
+
+        start_time = time.monotonic()
+        requester = TaskRequester(self.config, self.platform)
+        hedge = TaskRequester(self.config, self.platform)
+        lock = threading.Lock()
+        state: dict[str, bool | concurrent.futures.Future] = {"done": False, "future": None}
+
+        # 超过等待时间主请求仍未完成时，在对冲请求线程池中发起对冲请求
+        def issue() -> None:
+            with lock:
+                if state.get("done") == True:
+                    return None
+
+                hedge_key = self.reserve_hedge(pool)
+                if hedge_key is not None:
+                    state["future"] = self.submit_hedge(requester, hedge, messages, hedge_key, pool)
+        timer = RequestHedger.schedule(delay, issue)
+
+        # 在当前线程中发起主请求，对冲请求先成功时主请求会被取消
+        try:
+            response = requester.request_once(messages, key, pool)
+        finally:
+            RequestHedger.unschedule(timer)
+            with lock:
+                state["done"] = True
+                future: concurrent.futures.Future = state.get("future")
+
+        # 主请求成功时取消对冲请求，否则等待对冲请求的结果
+        requesters = {requester: requester} if future is None else {requester: requester, hedge: hedge}
+        if future is None:
+            winner = requester
+        elif response[0] == False:
+            winner = requester
+            hedge.cancelled = True
         else:
-            skip, response_think, response_result, input_tokens, output_tokens = self.request_openai(
-                messages,
-                thinking,
-                args,
-            )
+            winner, response = hedge, future.result()
+
+        return self.complete_hedge(requesters, winner, response, start_time)
+
+    # 发起异步请求
+    # 调用方已从密钥池中选定密钥时，同时传入密钥与密钥池，请求完成后更新该密钥的健康状态
+    # 启用对冲请求时，请求耗时超过近期请求耗时的分位数后再发送一个相同的请求，先成功返回的结果胜出，落败的请求会被取消
+    async def request_async(self, messages: list[dict], key: str = None, pool: KeyPool = None) -> tuple[bool, str, str, int, int]:
+        pool = __class__.get_key_pool(self.platform.get("api_key")) if key is None and pool is None else pool
+        delay = RequestHedger.get_delay() if pool is not None and self.config.request_hedge_enable == True else None
+        if delay is None:
+            return await self.request_once_async(messages, key, pool)
+
+        start_time = time.monotonic()
+        requesters: dict[asyncio.Task, TaskRequester] = {}
+
+        # 发起主请求，超过等待时间仍未完成时发起对冲请求
+        requester = TaskRequester(self.config, self.platform)
+        requesters[asyncio.ensure_future(requester.request_once_async(messages, key, pool))] = requester
+        done, _ = await asyncio.wait(requesters, timeout = delay)
+        hedge_key = self.reserve_hedge(pool) if len(done) == 0 else None
+        if hedge_key is not None:
+            hedge = TaskRequester(self.config, self.platform)
+            task = asyncio.ensure_future(hedge.request_once_async(messages, hedge_key, pool))
+            task.add_done_callback(lambda task: self.release_hedge())
+            requesters[task] = hedge
+
+        # 等待第一个成功的结果，全部失败时使用最后一个失败的结果
+        winner, response = None, None
+        pending = set(requesters)
+        try:
+            while len(pending) > 0 and (response is None or response[0] == True):
+                done, pending = await asyncio.wait(pending, return_when = asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if response is None or response[0] == True:
+                        winner, response = requesters.get(task), task.result()
+        finally:
+            for task in pending:
+                requesters.get(task).cancelled = True
+                task.cancel()
+
+        return self.complete_hedge(requesters, winner, response, start_time)
+
+    # 为对冲请求预留资源，依次占用对冲请求的配额、并发控制器的名额、密钥以及该密钥的限流器额度
+    # 任意一项不足时归还已占用的部分并放弃对冲，成功时返回对冲请求使用的密钥
+    def reserve_hedge(self, pool: KeyPool) -> str | None:
+        if RequestHedger.try_issue() == False:
+            return None
+
+        if self.controller is not None and self.controller.acquire(timeout = 0) == False:
+            RequestHedger.cancel_issue()
+            return None
+
+        key = pool.acquire()
+        if self.task_limiter is not None and self.task_limiter.try_acquire(self.tokens, key) > 0:
+            pool.cancel(key)
+            self.controller.cancel() if self.controller is not None else None
+            RequestHedger.cancel_issue()
+            return None
+
+        return key
+
+    # 对冲请求结束时归还并发控制器的名额，请求结果由任务统一反馈，预留的额度不再修正
+    def release_hedge(self) -> None:
+        if self.controller is not None:
+            self.controller.cancel()
+
+    # 在对冲请求线程池中发起对冲请求，请求结束前计入引擎的任务数量，以便停止任务时等待其结束
+    def submit_hedge(self, primary: Self, hedge: Self, messages: list[dict], key: str, pool: KeyPool) -> concurrent.futures.Future:
+        Engine.get().increase_async_task_count()
+        try:
+            future = __class__.get_hedge_executor().submit(self.run_hedge, primary, hedge, messages, key, pool)
+        except Exception:
+            Engine.get().decrease_async_task_count()
+            self.release_hedge()
+            pool.cancel(key)
+            raise
+
+        future.add_done_callback(lambda future: self.complete_submit(future, key, pool))
+        return future
+
+    # 执行对冲请求，成功时取消仍在执行的主请求
+    def run_hedge(self, primary: Self, hedge: Self, messages: list[dict], key: str, pool: KeyPool) -> tuple[bool, str, str, int, int]:
+        response = hedge.request_once(messages, key, pool)
+        if response[0] == False:
+            primary.cancelled = True
+
+        return response
+
+    # 对冲请求结束时调用，归还并发控制器的名额，请求在开始前被取消时同时归还选定的密钥
+    def complete_submit(self, future: concurrent.futures.Future, key: str, pool: KeyPool) -> None:
+        if future.cancelled():
+            pool.cancel(key)
+
+        self.release_hedge()
+        Engine.get().decrease_async_task_count()
+
+    # 处理对冲请求的结果
+    def complete_hedge(self, requesters: dict, winner: Self, response: tuple[bool, str, str, int, int], start_time: float) -> tuple[bool, str, str, int, int]:
+        if response[0] == False and len(requesters) > 1 and winner is not next(iter(requesters.values())):
+            RequestHedger.record_win()
+
+        self.key = winner.key
+        self.latency = time.monotonic() - start_time
+        self.error_type = winner.error_type
+        self.retry_after = winner.retry_after
+        self.glossary = winner.glossary
+        self.first_entry_latency = winner.first_entry_latency
+
+        return response
+
+    # 发起单个请求
+    # 指定密钥池且未指定密钥时，从密钥池中选择最健康的密钥，指定密钥池时请求完成后更新密钥的健康状态
+    def request_once(self, messages: list[dict], key: str = None, pool: KeyPool = None) -> tuple[bool, str, str, int, int]:
+        args: dict[str, float] = self.generate_args()
+        thinking = self.platform.get("thinking")
+
+        # 选择密钥
+        self.key = pool.acquire() if pool is not None and key is None else key
+
+        # 重置请求结果
+        self.error_type = Base.RequestError.NONE
+        self.retry_after = None
+        self.decoder = ResponseDecoder()
+        self.glossary = None
+        self.first_entry_latency = None
+        start_time = time.monotonic()
+
+        try:
+            # 发起请求
+            if self.platform.get("api_format") == Base.APIFormat.SAKURALLM:
+                skip, response_think, response_result, input_tokens, output_tokens = self.request_sakura(
+                    messages,
+                    thinking,
+                    args,
+                )
+            elif self.platform.get("api_format") == Base.APIFormat.GOOGLE:
+                skip, response_think, response_result, input_tokens, output_tokens = self.request_google(
+                    messages,
+                    thinking,
+                    args,
+                )
+            elif self.platform.get("api_format") == Base.APIFormat.ANTHROPIC:
+                skip, response_think, response_result, input_tokens, output_tokens = self.request_anthropic(
+                    messages,
+                    thinking,
+                    args,
+                )
+            else:
+                skip, response_think, response_result, input_tokens, output_tokens = self.request_openai(
+                    messages,
+                    thinking,
+                    args,
+                )
+        finally:
+            # 记录请求耗时
+            self.latency = time.monotonic() - start_time
+
+            # 更新密钥的健康状态，请求被取消时同样需要更新，落败后被取消的请求只归还密钥
+            if pool is not None and self.cancelled == True:
+                pool.cancel(self.key)
+            elif pool is not None:
+                pool.release(self.key, self.latency, self.error_type, self.retry_after)
+
+        # 记录成功请求的耗时，用于计算对冲请求的等待时间
+        if skip == False:
+            RequestHedger.record(self.latency)
 
         return skip, response_think, response_result, input_tokens, output_tokens
 
+    # 发起单个异步请求
+    # 指定密钥池且未指定密钥时，从密钥池中选择最健康的密钥，指定密钥池时请求完成后更新密钥的健康状态
+    async def request_once_async(self, messages: list[dict], key: str = None, pool: KeyPool = None) -> tuple[bool, str, str, int, int]:
+        args: dict[str, float] = self.generate_args()
+        thinking = self.platform.get("thinking")
+
+        # 选择密钥
+        self.key = pool.acquire() if pool is not None and key is None else key
+
+        # 重置请求结果
+        self.error_type = Base.RequestError.NONE
+        self.retry_after = None
+        self.decoder = ResponseDecoder()
+        self.glossary = None
+        self.first_entry_latency = None
+        start_time = time.monotonic()
+
+        try:
+            # 发起请求
+            if self.platform.get("api_format") == Base.APIFormat.SAKURALLM:
+                skip, response_think, response_result, input_tokens, output_tokens = await self.request_sakura_async(
+                    messages,
+                    thinking,
+                    args,
+                )
+            elif self.platform.get("api_format") == Base.APIFormat.GOOGLE:
+                skip, response_think, response_result, input_tokens, output_tokens = await self.request_google_async(
+                    messages,
+                    thinking,
+                    args,
+                )
+            elif self.platform.get("api_format") == Base.APIFormat.ANTHROPIC:
+                skip, response_think, response_result, input_tokens, output_tokens = await self.request_anthropic_async(
+                    messages,
+                    thinking,
+                    args,
+                )
+            else:
+                skip, response_think, response_result, input_tokens, output_tokens = await self.request_openai_async(
+                    messages,
+                    thinking,
+                    args,
+                )
+        finally:
+            # 记录请求耗时
+            self.latency = time.monotonic() - start_time
+
+            # 更新密钥的健康状态，请求被取消时同样需要更新，落败后被取消的请求只归还密钥
+            if pool is not None and self.cancelled == True:
+                pool.cancel(self.key)
+            elif pool is not None:
+                pool.release(self.key, self.latency, self.error_type, self.retry_after)
+
+        # 记录成功请求的耗时，用于计算对冲请求的等待时间
+        if skip == False:
+            RequestHedger.record(self.latency)
+
+        return skip, response_think, response_result, input_tokens, output_tokens
+
+    # 消费流式回复，返回 (思考内容, 回复内容, 输入消耗, 输出消耗)，请求停止或被取消时提前结束并返回 None
+    # 回复内容每收到一段即解码其中已经完整的术语条目
+    def consume_stream(self, events: Iterator[tuple[str, str, int, int]]) -> tuple[str, str, int, int] | None:
+        think: list[str] = []
+        result: list[str] = []
+        input_tokens, output_tokens = 0, 0
+        try:
+            for think_delta, result_delta, input_delta, output_delta in events:
+                if self.cancelled == True or Engine.get().get_status() == Base.TaskStatus.STOPPING:
+                    return None
+
+                think.append(think_delta)
+                result.append(result_delta)
+                self.decoder.feed(result_delta)
+                input_tokens = input_delta if input_delta is not None else input_tokens
+                output_tokens = output_delta if output_delta is not None else output_tokens
+        finally:
+            events.close()
+
+        return self.complete_stream("".join(think), "".join(result), input_tokens, output_tokens)
+
+    # 消费异步流式回复
+    async def consume_stream_async(self, events: AsyncIterator[tuple[str, str, int, int]]) -> tuple[str, str, int, int] | None:
+        think: list[str] = []
+        result: list[str] = []
+        input_tokens, output_tokens = 0, 0
+        try:
+            async for think_delta, result_delta, input_delta, output_delta in events:
+                if self.cancelled == True or Engine.get().get_status() == Base.TaskStatus.STOPPING:
+                    return None
+
+                think.append(think_delta)
+                result.append(result_delta)
+                self.decoder.feed(result_delta)
+                input_tokens = input_delta if input_delta is not None else input_tokens
+                output_tokens = output_delta if output_delta is not None else output_tokens
+        finally:
+            await events.aclose()
+
+        return self.complete_stream("".join(think), "".join(result), input_tokens, output_tokens)
+
+    # 流式回复结束
+    def complete_stream(self, response_think: str, response_result: str, input_tokens: int, output_tokens: int) -> tuple[str, str, int, int]:
+        self.decoder.flush()
+        self.glossary = self.decoder.glossary
+        self.first_entry_latency = self.decoder.first_entry_latency
+
+        # 兼容直接在回复内容中输出思考内容的模型
+        if "</think>" in response_result:
+            splited = response_result.split("</think>")
+            response_think = response_think + splited[0].removeprefix("<think>")
+            response_result = splited[-1]
+
+        return __class__.RE_LINE_BREAK.sub("\n", response_think.strip()), response_result.strip(), input_tokens, output_tokens
+
+    # 转换 OpenAI 流式回复，每个事件转换为 (思考内容, 回复内容, 输入消耗, 输出消耗)
+    def iter_openai_stream(self, stream: openai.Stream) -> Iterator[tuple[str, str, int, int]]:
+        try:
+            for chunk in stream:
+                yield self.convert_openai_chunk(chunk)
+        finally:
+            stream.close()
+
+    # 转换 OpenAI 异步流式回复
+    async def iter_openai_stream_async(self, stream: openai.AsyncStream) -> AsyncIterator[tuple[str, str, int, int]]:
+        try:
+            async for chunk in stream:
+                yield self.convert_openai_chunk(chunk)
+        finally:
+            await stream.close()
+
+    # 转换 OpenAI 流式回复的事件
+    def convert_openai_chunk(self, chunk: openai.types.chat.ChatCompletionChunk) -> tuple[str, str, int, int]:
+        input_tokens, output_tokens = self.extract_openai_usage(chunk) if getattr(chunk, "usage", None) is not None else (None, None)
+        if len(chunk.choices) == 0:
+            return "", "", input_tokens, output_tokens
+
+        delta = chunk.choices[0].delta
+        think = getattr(delta, "reasoning_content", None)
+        return think if isinstance(think, str) else "", delta.content or "", input_tokens, output_tokens
+
+    # 转换 Google 流式回复
+    def iter_google_stream(self, stream: Iterator[types.GenerateContentResponse]) -> Iterator[tuple[str, str, int, int]]:
+        for chunk in stream:
+            yield self.convert_google_chunk(chunk)
+
+    # 转换 Google 异步流式回复
+    async def iter_google_stream_async(self, stream: AsyncIterator[types.GenerateContentResponse]) -> AsyncIterator[tuple[str, str, int, int]]:
+        async for chunk in stream:
+            yield self.convert_google_chunk(chunk)
+
+    # 转换 Google 流式回复的事件
+    def convert_google_chunk(self, chunk: types.GenerateContentResponse) -> tuple[str, str, int, int]:
+        input_tokens, output_tokens = self.extract_google_usage(chunk) if chunk.usage_metadata is not None else (None, None)
+
+        think, result = "", ""
+        if chunk.candidates and chunk.candidates[-1].content is not None and chunk.candidates[-1].content.parts:
+            for part in chunk.candidates[-1].content.parts:
+                if not isinstance(part.text, str):
+                    continue
+                elif part.thought == True:
+                    think = think + part.text
+                else:
+                    result = result + part.text
+
+        return think, result, input_tokens, output_tokens
+
+    # 转换 Anthropic 流式回复
+    def iter_anthropic_stream(self, stream: anthropic.Stream) -> Iterator[tuple[str, str, int, int]]:
+        try:
+            for event in stream:
+                yield self.convert_anthropic_event(event)
+        finally:
+            stream.close()
+
+    # 转换 Anthropic 异步流式回复
+    async def iter_anthropic_stream_async(self, stream: anthropic.AsyncStream) -> AsyncIterator[tuple[str, str, int, int]]:
+        try:
+            async for event in stream:
+                yield self.convert_anthropic_event(event)
+        finally:
+            await stream.close()
+
+    # 转换 Anthropic 流式回复的事件
+    def convert_anthropic_event(self, event: anthropic.types.RawMessageStreamEvent) -> tuple[str, str, int, int]:
+        if event.type == "message_start":
+            return "", "", event.message.usage.input_tokens, None
+        elif event.type == "message_delta":
+            return "", "", None, event.usage.output_tokens
+        elif event.type == "content_block_delta" and event.delta.type == "thinking_delta":
+            return event.delta.thinking, "", None, None
+        elif event.type == "content_block_delta" and event.delta.type == "text_delta":
+            return "", event.delta.text, None, None
+        else:
+            return "", "", None, None
+
     # 生成请求参数
     def generate_sakura_args(self, messages: list[dict[str, str]], thinking: bool, args: dict[str, float]) -> dict:
         args: dict = args | {
@@ -201,42 +745,116 @@ class TaskRequester(Base):
             with __class__.LOCK:
                 client: openai.OpenAI = __class__.get_client(
                     url = self.platform.get("api_url"),
-                    key = __class__.get_key(self.platform.get("api_key")),
+                    key = self.key,
                     format = self.platform.get("api_format"),
                     timeout = self.config.request_timeout,
                 )
 
             # 发起请求
-            response: openai.types.completion.Completion = client.chat.completions.create(
-                **self.generate_sakura_args(messages, thinking, args)
-            )
+            if self.config.stream_request_enable == True:
+                # 流式请求，请求停止时提前结束
+                stream = self.create_openai_stream(client, self.generate_sakura_args(messages, thinking, args))
+                streamed = self.consume_stream(self.iter_openai_stream(stream))
+                if streamed is None:
+                    self.error_type = Base.RequestError.OTHER
+                    return True, None, None, None, None
+                _, response_result, input_tokens, output_tokens = streamed
 
-            # 提取回复的文本内容
-            response_result = response.choices[0].message.content
+                # 与非流式请求一样转换回复内容，流式解码出的术语条目基于转换前的文本，因此不再使用
+                response_think, response_result = "", self.convert_sakura_result(response_result)
+                self.glossary, self.first_entry_latency = None, None
+            else:
+                response: openai.types.chat.ChatCompletion = client.chat.completions.create(
+                    **self.generate_sakura_args(messages, thinking, args)
+                )
+
+                # 提取回复内容与消耗
+                response_think, response_result = self.extract_sakura_response(response)
+                input_tokens, output_tokens = self.extract_openai_usage(response)
         except Exception as e:
+            self.error_type, self.retry_after = __class__.classify_error(e)
             self.error(f"{Localizer.get().log_task_fail}", e)
             return True, None, None, None, None
 
-        # 获取输入消耗
-        try:
-            input_tokens = int(response.usage.prompt_tokens)
-        except Exception:
-            input_tokens = 0
+        return False, response_think, response_result, input_tokens, output_tokens
 
-        # 获取输出消耗
+    # 发起异步请求
+    async def request_sakura_async(self, messages: list[dict[str, str]], thinking: bool, args: dict[str, float]) -> tuple[bool, str, str, int, int]:
         try:
-            output_tokens = int(response.usage.completion_tokens)
-        except Exception:
-            output_tokens = 0
+            # 获取客户端
+            with __class__.LOCK:
+                client: openai.AsyncOpenAI = __class__.get_async_client(
+                    url = self.platform.get("api_url"),
+                    key = self.key,
+                    format = self.platform.get("api_format"),
+                    timeout = self.config.request_timeout,
+                )
+
+            # 发起请求
+            if self.config.stream_request_enable == True:
+                # 流式请求，请求停止时提前结束
+                stream = await self.create_openai_stream_async(client, self.generate_sakura_args(messages, thinking, args))
+                streamed = await self.consume_stream_async(self.iter_openai_stream_async(stream))
+                if streamed is None:
+                    self.error_type = Base.RequestError.OTHER
+                    return True, None, None, None, None
+                _, response_result, input_tokens, output_tokens = streamed
+
+                # 与非流式请求一样转换回复内容，流式解码出的术语条目基于转换前的文本，因此不再使用
+                response_think, response_result = "", self.convert_sakura_result(response_result)
+                self.glossary, self.first_entry_latency = None, None
+            else:
+                response: openai.types.chat.ChatCompletion = await client.chat.completions.create(
+                    **self.generate_sakura_args(messages, thinking, args)
+                )
+
+                # 提取回复内容与消耗
+                response_think, response_result = self.extract_sakura_response(response)
+                input_tokens, output_tokens = self.extract_openai_usage(response)
+        except Exception as e:
+            self.error_type, self.retry_after = __class__.classify_error(e)
+            self.error(f"{Localizer.get().log_task_fail}", e)
+            return True, None, None, None, None
+
+        return False, response_think, response_result, input_tokens, output_tokens
+
+    # 提取回复内容
+    def extract_sakura_response(self, response: openai.types.chat.ChatCompletion) -> tuple[str, str]:
+        return "", self.convert_sakura_result(response.choices[0].message.content)
 
-        # Sakura 返回的内容多行文本，将其转换为 JSON 字符串
-        response_result = json.dumps(
+    # Sakura 返回的内容多行文本，将其转换为 JSON 字符串
+    def convert_sakura_result(self, response_result: str) -> str:
+        return json.dumps(
             {str(i): line.strip() for i, line in enumerate(response_result.strip().splitlines())},
             indent = None,
             ensure_ascii = False,
         )
 
-        return False, "", response_result, input_tokens, output_tokens
+    # 发起 OpenAI 流式请求，接口不支持 stream_options 参数时去掉该参数重试，并记住该接口地址
+    def create_openai_stream(self, client: openai.OpenAI, args: dict) -> openai.Stream:
+        url = self.platform.get("api_url")
+        if url not in __class__.STREAM_OPTIONS_UNSUPPORTED:
+            try:
+                return client.chat.completions.create(**args, stream = True, stream_options = {"include_usage": True})
+            except openai.BadRequestError as e:
+                if "stream_options" not in str(e):
+                    raise e
+                __class__.STREAM_OPTIONS_UNSUPPORTED.add(url)
+
+        return client.chat.completions.create(**args, stream = True)
+
+    # 发起 OpenAI 异步流式请求
+    async def create_openai_stream_async(self, client: openai.AsyncOpenAI, args: dict) -> openai.AsyncStream:
+        url = self.platform.get("api_url")
+        if url not in __class__.STREAM_OPTIONS_UNSUPPORTED:
+            try:
+                return await client.chat.completions.create(**args, stream = True, stream_options = {"include_usage": True})
+            except openai.BadRequestError as e:
+                if "stream_options" not in str(e):
+                    raise e
+                __class__.STREAM_OPTIONS_UNSUPPORTED.add(url)
+
+        return await client.chat.completions.create(**args, stream = True)
 
     # 生成请求参数
     def generate_openai_args(self, messages: list[dict[str, str]], thinking: bool, args: dict[str, float]) -> dict:
@@ -274,32 +892,89 @@ class TaskRequester(Base):
             with __class__.LOCK:
                 client: openai.OpenAI = __class__.get_client(
                     url = self.platform.get("api_url"),
-                    key = __class__.get_key(self.platform.get("api_key")),
+                    key = self.key,
                     format = self.platform.get("api_format"),
                     timeout = self.config.request_timeout,
                 )
 
             # 发起请求
-            response: openai.types.completion.Completion = client.chat.completions.create(
-                **self.generate_openai_args(messages, thinking, args)
-            )
+            if self.config.stream_request_enable == True:
+                # 流式请求，请求停止时提前结束
+                stream = self.create_openai_stream(client, self.generate_openai_args(messages, thinking, args))
+                streamed = self.consume_stream(self.iter_openai_stream(stream))
+                if streamed is None:
+                    self.error_type = Base.RequestError.OTHER
+                    return True, None, None, None, None
+                response_think, response_result, input_tokens, output_tokens = streamed
+            else:
+                response: openai.types.chat.ChatCompletion = client.chat.completions.create(
+                    **self.generate_openai_args(messages, thinking, args)
+                )
 
-            # 提取回复内容
-            message = response.choices[0].message
-            if hasattr(message, "reasoning_content") and isinstance(message.reasoning_content, str):
-                response_think = __class__.RE_LINE_BREAK.sub("\n", message.reasoning_content.strip())
-                response_result = message.content.strip()
-            elif "</think>" in message.content:
-                splited = message.content.split("</think>")
-                response_think = __class__.RE_LINE_BREAK.sub("\n", splited[0].removeprefix("<think>").strip())
-                response_result = splited[-1].strip()
+                # 提取回复内容与消耗
+                response_think, response_result = self.extract_openai_response(response)
+                input_tokens, output_tokens = self.extract_openai_usage(response)
+        except Exception as e:
+            self.error_type, self.retry_after = __class__.classify_error(e)
+            self.error(f"{Localizer.get().log_task_fail}", e)
+            return True, None, None, None, None
+
+        return False, response_think, response_result, input_tokens, output_tokens
+
+    # 发起异步请求
+    async def request_openai_async(self, messages: list[dict[str, str]], thinking: bool, args: dict[str, float]) -> tuple[bool, str, str, int, int]:
+        try:
+            # 获取客户端
+            with __class__.LOCK:
+                client: openai.AsyncOpenAI = __class__.get_async_client(
+                    url = self.platform.get("api_url"),
+                    key = self.key,
+                    format = self.platform.get("api_format"),
+                    timeout = self.config.request_timeout,
+                )
+
+            # 发起请求
+            if self.config.stream_request_enable == True:
+                # 流式请求，请求停止时提前结束
+                stream = await self.create_openai_stream_async(client, self.generate_openai_args(messages, thinking, args))
+                streamed = await self.consume_stream_async(self.iter_openai_stream_async(stream))
+                if streamed is None:
+                    self.error_type = Base.RequestError.OTHER
+                    return True, None, None, None, None
+                response_think, response_result, input_tokens, output_tokens = streamed
             else:
-                response_think = ""
-                response_result = message.content.strip()
+                response: openai.types.chat.ChatCompletion = await client.chat.completions.create(
+                    **self.generate_openai_args(messages, thinking, args)
+                )
+
+                # 提取回复内容与消耗
+                response_think, response_result = self.extract_openai_response(response)
+                input_tokens, output_tokens = self.extract_openai_usage(response)
         except Exception as e:
+            self.error_type, self.retry_after = __class__.classify_error(e)
             self.error(f"{Localizer.get().log_task_fail}", e)
             return True, None, None, None, None
 
+        return False, response_think, response_result, input_tokens, output_tokens
+
+    # 提取回复内容
+    def extract_openai_response(self, response: openai.types.chat.ChatCompletion) -> tuple[str, str]:
+        message = response.choices[0].message
+        if hasattr(message, "reasoning_content") and isinstance(message.reasoning_content, str):
+            response_think = __class__.RE_LINE_BREAK.sub("\n", message.reasoning_content.strip())
+            response_result = message.content.strip()
+        elif "</think>" in message.content:
+            splited = message.content.split("</think>")
+            response_think = __class__.RE_LINE_BREAK.sub("\n", splited[0].removeprefix("<think>").strip())
+            response_result = splited[-1].strip()
+        else:
+            response_think = ""
+            response_result = message.content.strip()
+
+        return response_think, response_result
+
+    # 获取输入与输出消耗
+    def extract_openai_usage(self, response: openai.types.chat.ChatCompletion) -> tuple[int, int]:
         # 获取输入消耗
         try:
             input_tokens = int(response.usage.prompt_tokens)
@@ -312,7 +987,7 @@ class TaskRequester(Base):
         except Exception:
             output_tokens = 0
 
-        return False, response_think, response_result, input_tokens, output_tokens
+        return input_tokens, output_tokens
 
     # 生成请求参数
     def generate_google_args(self, messages: list[dict[str, str]], thinking: bool, args: dict[str, float]) -> dict[str, str | int | float]:
@@ -358,37 +1033,98 @@ class TaskRequester(Base):
         }
 
     # 发起请求
-    def request_google(self, messages: list[dict[str, str]], thinking: bool, args: dict[str, float]) -> tuple[bool, str, int, int]:
+    def request_google(self, messages: list[dict[str, str]], thinking: bool, args: dict[str, float]) -> tuple[bool, str, str, int, int]:
         try:
             # 获取客户端
             with __class__.LOCK:
                 client: genai.Client = __class__.get_client(
                     url = self.platform.get("api_url"),
-                    key = __class__.get_key(self.platform.get("api_key")),
+                    key = self.key,
                     format = self.platform.get("api_format"),
                     timeout = self.config.request_timeout,
                 )
 
             # 发起请求
-            response: types.GenerateContentResponse = client.models.generate_content(
-                **self.generate_google_args(messages, thinking, args)
-            )
+            if self.config.stream_request_enable == True:
+                # 流式请求，请求停止时提前结束
+                stream = client.models.generate_content_stream(
+                    **self.generate_google_args(messages, thinking, args)
+                )
+                streamed = self.consume_stream(self.iter_google_stream(stream))
+                if streamed is None:
+                    self.error_type = Base.RequestError.OTHER
+                    return True, None, None, None, None
+                response_think, response_result, input_tokens, output_tokens = streamed
+            else:
+                response: types.GenerateContentResponse = client.models.generate_content(
+                    **self.generate_google_args(messages, thinking, args)
+                )
 
-            # 提取回复内容
-            response_think = ""
-            response_result = ""
-            if len(response.candidates) > 0 and len(response.candidates[-1].content.parts) > 0:
-                parts = response.candidates[-1].content.parts
-                think_messages = [v for v in parts if v.thought == True]
-                if len(think_messages) > 0:
-                    response_think = __class__.RE_LINE_BREAK.sub("\n", think_messages[-1].text.strip())
-                result_messages = [v for v in parts if v.thought != True]
-                if len(result_messages) > 0:
-                    response_result = result_messages[-1].text.strip()
+                # 提取回复内容与消耗
+                response_think, response_result = self.extract_google_response(response)
+                input_tokens, output_tokens = self.extract_google_usage(response)
         except Exception as e:
+            self.error_type, self.retry_after = __class__.classify_error(e)
             self.error(f"{Localizer.get().log_task_fail}", e)
             return True, None, None, None, None
 
+        return False, response_think, response_result, input_tokens, output_tokens
+
+    # 发起异步请求
+    async def request_google_async(self, messages: list[dict[str, str]], thinking: bool, args: dict[str, float]) -> tuple[bool, str, str, int, int]:
+        try:
+            # 获取客户端
+            with __class__.LOCK:
+                client: genai.Client = __class__.get_async_client(
+                    url = self.platform.get("api_url"),
+                    key = self.key,
+                    format = self.platform.get("api_format"),
+                    timeout = self.config.request_timeout,
+                )
+
+            # 发起请求
+            if self.config.stream_request_enable == True:
+                # 流式请求，请求停止时提前结束
+                stream = await client.aio.models.generate_content_stream(
+                    **self.generate_google_args(messages, thinking, args)
+                )
+                streamed = await self.consume_stream_async(self.iter_google_stream_async(stream))
+                if streamed is None:
+                    self.error_type = Base.RequestError.OTHER
+                    return True, None, None, None, None
+                response_think, response_result, input_tokens, output_tokens = streamed
+            else:
+                response: types.GenerateContentResponse = await client.aio.models.generate_content(
+                    **self.generate_google_args(messages, thinking, args)
+                )
+
+                # 提取回复内容与消耗
+                response_think, response_result = self.extract_google_response(response)
+                input_tokens, output_tokens = self.extract_google_usage(response)
+        except Exception as e:
+            self.error_type, self.retry_after = __class__.classify_error(e)
+            self.error(f"{Localizer.get().log_task_fail}", e)
+            return True, None, None, None, None
+
+        return False, response_think, response_result, input_tokens, output_tokens
+
+    # 提取回复内容
+    def extract_google_response(self, response: types.GenerateContentResponse) -> tuple[str, str]:
+        response_think = ""
+        response_result = ""
+        if len(response.candidates) > 0 and len(response.candidates[-1].content.parts) > 0:
+            parts = response.candidates[-1].content.parts
+            think_messages = [v for v in parts if v.thought == True]
+            if len(think_messages) > 0:
+                response_think = __class__.RE_LINE_BREAK.sub("\n", think_messages[-1].text.strip())
+            result_messages = [v for v in parts if v.thought != True]
+            if len(result_messages) > 0:
+                response_result = result_messages[-1].text.strip()
+
+        return response_think, response_result
+
+    # 获取输入与输出消耗
+    def extract_google_usage(self, response: types.GenerateContentResponse) -> tuple[int, int]:
         # 获取输入消耗
         try:
             input_tokens = int(response.usage_metadata.prompt_token_count)
@@ -403,7 +1139,7 @@ class TaskRequester(Base):
         except Exception:
             output_tokens = 0
 
-        return False, response_think, response_result, input_tokens, output_tokens
+        return input_tokens, output_tokens
 
     # 生成请求参数
     def generate_anthropic_args(self, messages: list[dict[str, str]], thinking: bool, args: dict[str, float]) -> dict:
@@ -439,33 +1175,94 @@ class TaskRequester(Base):
             with __class__.LOCK:
                 client: anthropic.Anthropic = __class__.get_client(
                     url = self.platform.get("api_url"),
-                    key = __class__.get_key(self.platform.get("api_key")),
+                    key = self.key,
                     format = self.platform.get("api_format"),
                     timeout = self.config.request_timeout,
                 )
 
             # 发起请求
-            response: anthropic.types.Message = client.messages.create(
-                **self.generate_anthropic_args(messages, thinking, args)
-            )
+            if self.config.stream_request_enable == True:
+                # 流式请求，请求停止时提前结束
+                stream = client.messages.create(
+                    **self.generate_anthropic_args(messages, thinking, args), stream = True
+                )
+                streamed = self.consume_stream(self.iter_anthropic_stream(stream))
+                if streamed is None:
+                    self.error_type = Base.RequestError.OTHER
+                    return True, None, None, None, None
+                response_think, response_result, input_tokens, output_tokens = streamed
+            else:
+                response: anthropic.types.Message = client.messages.create(
+                    **self.generate_anthropic_args(messages, thinking, args)
+                )
 
-            # 提取回复内容
-            text_messages = [msg for msg in response.content if hasattr(msg, "text") and isinstance(msg.text, str)]
-            think_messages = [msg for msg in response.content if hasattr(msg, "thinking") and isinstance(msg.thinking, str)]
+                # 提取回复内容与消耗
+                response_think, response_result = self.extract_anthropic_response(response)
+                input_tokens, output_tokens = self.extract_anthropic_usage(response)
+        except Exception as e:
+            self.error_type, self.retry_after = __class__.classify_error(e)
+            self.error(f"{Localizer.get().log_task_fail}", e)
+            return True, None, None, None, None
 
-            if text_messages != []:
-                response_result = text_messages[-1].text.strip()
-            else:
-                response_result = ""
+        return False, response_think, response_result, input_tokens, output_tokens
 
-            if think_messages != []:
-                response_think = __class__.RE_LINE_BREAK.sub("\n", think_messages[-1].thinking.strip())
+    # 发起异步请求
+    async def request_anthropic_async(self, messages: list[dict[str, str]], thinking: bool, args: dict[str, float]) -> tuple[bool, str, str, int, int]:
+        try:
+            # 获取客户端
+            with __class__.LOCK:
+                client: anthropic.AsyncAnthropic = __class__.get_async_client(
+                    url = self.platform.get("api_url"),
+                    key = self.key,
+                    format = self.platform.get("api_format"),
+                    timeout = self.config.request_timeout,
+                )
+
+            # 发起请求
+            if self.config.stream_request_enable == True:
+                # 流式请求，请求停止时提前结束
+                stream = await client.messages.create(
+                    **self.generate_anthropic_args(messages, thinking, args), stream = True
+                )
+                streamed = await self.consume_stream_async(self.iter_anthropic_stream_async(stream))
+                if streamed is None:
+                    self.error_type = Base.RequestError.OTHER
+                    return True, None, None, None, None
+                response_think, response_result, input_tokens, output_tokens = streamed
             else:
-                response_think = ""
+                response: anthropic.types.Message = await client.messages.create(
+                    **self.generate_anthropic_args(messages, thinking, args)
+                )
+
+                # 提取回复内容与消耗
+                response_think, response_result = self.extract_anthropic_response(response)
+                input_tokens, output_tokens = self.extract_anthropic_usage(response)
         except Exception as e:
+            self.error_type, self.retry_after = __class__.classify_error(e)
             self.error(f"{Localizer.get().log_task_fail}", e)
             return True, None, None, None, None
 
+        return False, response_think, response_result, input_tokens, output_tokens
+
+    # 提取回复内容
+    def extract_anthropic_response(self, response: anthropic.types.Message) -> tuple[str, str]:
+        text_messages = [msg for msg in response.content if hasattr(msg, "text") and isinstance(msg.text, str)]
+        think_messages = [msg for msg in response.content if hasattr(msg, "thinking") and isinstance(msg.thinking, str)]
+
+        if text_messages != []:
+            response_result = text_messages[-1].text.strip()
+        else:
+            response_result = ""
+
+        if think_messages != []:
+            response_think = __class__.RE_LINE_BREAK.sub("\n", think_messages[-1].thinking.strip())
+        else:
+            response_think = ""
+
+        return response_think, response_result
+
+    # 获取输入与输出消耗
+    def extract_anthropic_usage(self, response: anthropic.types.Message) -> tuple[int, int]:
         # 获取输入消耗
         try:
             input_tokens = int(response.usage.input_tokens)
@@ -478,4 +1275,4 @@ class TaskRequester(Base):
         except Exception:
             output_tokens = 0
 
-        return False, response_think, response_result, input_tokens, output_tokens
\ No newline at end of file
+        return input_tokens, output_tokens
\ No newline at end of file
@@ -106,6 +106,9 @@ class FakeNameHelper():
         "雨夜雫",               # 雨夜的滴落
     ]
 
+    # 代码的匹配模式
+    PATTERN: re.Pattern = re.compile(r"\\n{1,2}\[\d+\]", flags = re.IGNORECASE)
+
     # 伪名映射表
     FAKE_NAME: list[str] = {}
     FAKE_NAME_MAPPING: dict[str, str] = {}
@@ -128,8 +131,9 @@ class FakeNameHelper():
             else:
                 return code
 
-        # 将代码转换为伪名
-        src = re.sub(r"\\n{1,2}\[\d+\]", lambda match: repl(match), src, flags = re.IGNORECASE)
+        # 将代码转换为伪名，不包含反斜杠的文本不可能包含代码
+        if "\\" in src:
+            src = cls.PATTERN.sub(repl, src)
 
         return src
 
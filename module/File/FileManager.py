@@ -1,12 +1,16 @@
-import copy
+import concurrent.futures
+import itertools
 import json
 import os
 import random
 import re
 from datetime import datetime
+from typing import Generator
+from typing import Iterable
 
 import openpyxl
 import openpyxl.worksheet.worksheet
+from openpyxl.worksheet._write_only import WriteOnlyWorksheet
 
 from base.Base import Base
 from model.Item import Item
@@ -25,12 +29,48 @@ from module.File.WOLFXLSX import WOLFXLSX
 from module.File.XLSX import XLSX
 from module.Localizer.Localizer import Localizer
 from module.TableManager import TableManager
+from module.Text.TextHelper import TextHelper
 
 class FileManager(Base):
 
     # 正则
     RE_BLANK = re.compile(r"[\r\n]+", flags = re.IGNORECASE)
 
+    # 读取器 (扩展名, 读取器)
+    # 读取器为 None 的扩展名对应多种格式，文件只打开一次，识别具体格式后交给对应的读取器处理
+    READERS: tuple[tuple[str, type], ...] = (
+        (".md", MD),
+        (".txt", TXT),
+        (".ass", ASS),
+        (".srt", SRT),
+        (".epub", EPUB),
+        (".xlsx", None),
+        (".rpy", RENPY),
+        (".trans", TRANS),
+        (".json", None),
+    )
+
+    # 对应多种格式的扩展名，以及各格式的条目的返回顺序，与逐个读取器依次读取时的顺序一致
+    FORMATS: dict[str, tuple[Item.FileType, ...]] = {
+        ".xlsx": (Item.FileType.XLSX, Item.FileType.WOLFXLSX),
+        ".json": (Item.FileType.KVJSON, Item.FileType.MESSAGEJSON),
+    }
+
+    # 行号跨文件累计的格式
+    ROW_CUMULATIVE: tuple[Item.FileType, ...] = (
+        Item.FileType.MD,
+        Item.FileType.TXT,
+        Item.FileType.ASS,
+        Item.FileType.EPUB,
+        Item.FileType.RENPY,
+        Item.FileType.TRANS,
+        Item.FileType.KVJSON,
+        Item.FileType.MESSAGEJSON,
+    )
+
+    # 待读取的文件数量达到该值时，使用进程池并行读取
+    PROCESS_POOL_THRESHOLD: int = 32
+
     def __init__(self, config: Config) -> None:
         super().__init__()
 
@@ -39,11 +79,19 @@ class FileManager(Base):
 
     # 读
     def read_from_path(self) -> tuple[Project, list[Item]]:
+        project, items = self.iter_from_path()
+        return project, list(items)
+
+    # 读取，返回项目与条目的生成器，调用方可以在文件读取的同时逐个接收条目
+    def iter_from_path(self) -> tuple[Project, Generator[Item, None, None]]:
         project: Project = Project.from_dict({
             "id": f"{datetime.now().strftime("%Y%m%d_%H%M%S")}_{random.randint(100000, 999999)}",
         })
 
-        items: list[Item] = []
+        return project, self.iter_items()
+
+    # 遍历输入路径并生成条目，出错时记录日志并结束生成
+    def iter_items(self) -> Generator[Item, None, None]:
         try:
             paths: list[str] = []
             input_folder: str = self.config.input_folder
@@ -53,41 +101,145 @@ class FileManager(Base):
                 for root, _, files in os.walk(input_folder):
                     paths.extend([f"{root}/{file}".replace("\\", "/") for file in files])
 
-            items.extend(MD(self.config).read_from_path([path for path in paths if path.lower().endswith(".md")]))
-            items.extend(TXT(self.config).read_from_path([path for path in paths if path.lower().endswith(".txt")]))
-            items.extend(ASS(self.config).read_from_path([path for path in paths if path.lower().endswith(".ass")]))
-            items.extend(SRT(self.config).read_from_path([path for path in paths if path.lower().endswith(".srt")]))
-            items.extend(EPUB(self.config).read_from_path([path for path in paths if path.lower().endswith(".epub")]))
-            items.extend(XLSX(self.config).read_from_path([path for path in paths if path.lower().endswith(".xlsx")]))
-            items.extend(WOLFXLSX(self.config).read_from_path([path for path in paths if path.lower().endswith(".xlsx")]))
-            items.extend(RENPY(self.config).read_from_path([path for path in paths if path.lower().endswith(".rpy")]))
-            items.extend(TRANS(self.config).read_from_path([path for path in paths if path.lower().endswith(".trans")]))
-            items.extend(KVJSON(self.config).read_from_path([path for path in paths if path.lower().endswith(".json")]))
-            items.extend(MESSAGEJSON(self.config).read_from_path([path for path in paths if path.lower().endswith(".json")]))
+            yield from self.generate_items(paths)
         except Exception as e:
             self.error(f"{Localizer.get().log_read_file_fail}", e)
 
-        return project, items
+    # 按顺序逐个生成条目
+    # 文件数量较多时使用进程池并行读取，每个文件读取完成后立即按原有顺序返回其中的条目
+    def generate_items(self, paths: list[str]) -> Generator[Item, None, None]:
+        tasks: list[tuple[int, str]] = [
+            (i, path)
+            for i, (extension, _) in enumerate(__class__.READERS)
+            for path in paths
+            if path.lower().endswith(extension)
+        ]
+
+        if len(tasks) < __class__.PROCESS_POOL_THRESHOLD:
+            yield from self.merge_items(
+                [i for i, _ in tasks],
+                (__class__.read_file(self.config, i, path) for i, path in tasks),
+            )
+        else:
+            with concurrent.futures.ProcessPoolExecutor() as executor:
+                yield from self.merge_items(
+                    [i for i, _ in tasks],
+                    executor.map(
+                        __class__.read_file,
+                        itertools.repeat(self.config),
+                        [i for i, _ in tasks],
+                        [path for _, path in tasks],
+                    ),
+                )
+
+    # 合并每个文件的读取结果，indexes 为每个结果对应的读取器序号
+    # 对于行号跨文件累计的格式，按文件顺序为行号加上偏移量，使其与逐个读取时保持一致
+    # 对于对应多种格式的扩展名，第一种格式的条目立即返回，其余格式的条目暂存到该扩展名的文件全部读取完成后依次返回
+    def merge_items(self, indexes: list[int], results: Iterable[list[Item]]) -> Generator[Item, None, None]:
+        offsets: dict[Item.FileType, int] = {}
+        deferred: dict[Item.FileType, list[Item]] = {}
+        last: int = None
+        for i, items in itertools.chain(zip(indexes, results), ((None, []),)):
+            # 读取器发生变化时，返回上一个扩展名暂存的条目
+            if i != last and last is not None:
+                for file_type in __class__.FORMATS.get(__class__.READERS[last][0], ()):
+                    yield from deferred.pop(file_type, [])
+            last = i
+
+            if len(items) == 0:
+                continue
+
+            file_type = items[0].get_file_type()
+            if file_type in __class__.ROW_CUMULATIVE:
+                offset = offsets.get(file_type, 0)
+                offsets[file_type] = offset + len(items)
+                for item in items:
+                    item.set_row(item.get_row() + offset)
+
+            formats = __class__.FORMATS.get(__class__.READERS[i][0])
+            if formats is None or file_type == formats[0]:
+                yield from items
+            else:
+                deferred.setdefault(file_type, []).extend(items)
+
+    # 读取单个文件，在子进程中执行
+    @staticmethod
+    def read_file(config: Config, i: int, abs_path: str) -> list[Item]:
+        extension, reader = __class__.READERS[i]
+        if reader is not None:
+            return reader(config).read_from_path([abs_path])
+        elif extension == ".xlsx":
+            return __class__.read_file_xlsx(config, abs_path)
+        elif extension == ".json":
+            return __class__.read_file_json(config, abs_path)
+        else:
+            return []
+
+    # 读取 .xlsx 文件，识别为 WOLF 翻译表格或普通表格
+    @staticmethod
+    def read_file_xlsx(config: Config, abs_path: str) -> list[Item]:
+        book: openpyxl.Workbook = openpyxl.load_workbook(abs_path, read_only = True)
+        try:
+            sheet: openpyxl.worksheet.worksheet.Worksheet = book.active
+
+            # 跳过空表格
+            if sheet.max_row == 0 or sheet.max_column == 0:
+                return []
+
+            # 判断是否为 WOLF 翻译表格文件
+            if WOLFXLSX(config).is_wold_xlsx(sheet):
+                return WOLFXLSX(config).read_from_sheet(abs_path, sheet)
+            else:
+                return XLSX(config).read_from_sheet(abs_path, sheet)
+        finally:
+            book.close()
+
+    # 读取 .json 文件，识别为 KVJSON 或 MESSAGEJSON
+    @staticmethod
+    def read_file_json(config: Config, abs_path: str) -> list[Item]:
+        # 获取文件编码
+        encoding = TextHelper.get_enconding(path = abs_path, add_sig_to_utf8 = True)
+
+        with open(abs_path, "r", encoding = encoding) as reader:
+            json_data = json.load(reader)
+
+        if isinstance(json_data, dict):
+            return KVJSON(config).read_from_data(abs_path, json_data, [])
+        elif isinstance(json_data, list):
+            return MESSAGEJSON(config).read_from_data(abs_path, json_data, [])
+        else:
+            return []
 
     # 导出
+    # 各个写入器只读取术语表而不修改它，因此无需复制术语表，所有写入器可以并发执行
     def write_to_path(self, glossary: list[dict[str, str | int | list[str]]]) -> None:
-        for entry in glossary:
-            entry["dst_choices"] = list(entry.get("dst_choices", set()))
-            entry["info_choices"] = list(entry.get("info_choices", set()))
+        glossary = tuple(
+            {
+                **entry,
+                "dst_choices": list(entry.get("dst_choices", set())),
+                "info_choices": list(entry.get("info_choices", set())),
+            }
+            for entry in glossary
+        )
 
-        self.write_to_path_xlsx(glossary)
-        self.write_to_path_json(glossary)
-        self.write_to_path_detail(glossary)
-        self.write_to_path_kvjson(glossary) if self.config.output_kvjson == True else None
+        writers = [
+            self.write_to_path_xlsx,
+            self.write_to_path_json,
+            self.write_to_path_detail,
+        ]
+        if self.config.output_kvjson == True:
+            writers.append(self.write_to_path_kvjson)
 
-    def write_to_path_xlsx(self, glossary: list[dict[str, str | int | list[str]]]) -> None:
-        try:
-            # 复制一份
-            glossary = copy.deepcopy(glossary)
+        with concurrent.futures.ThreadPoolExecutor(max_workers = len(writers)) as executor:
+            for writer in writers:
+                executor.submit(writer, glossary)
 
+    def write_to_path_xlsx(self, glossary: tuple[dict[str, str | int | list[str]], ...]) -> None:
+        try:
             # 新建工作表
-            book: openpyxl.Workbook = openpyxl.Workbook()
-            sheet: openpyxl.worksheet.worksheet.Worksheet = book.active
+            # 使用只写模式逐行写入，内存占用与耗时均与条目数量成线性关系
+            book: openpyxl.Workbook = openpyxl.Workbook(write_only = True)
+            sheet: WriteOnlyWorksheet = book.create_sheet()
 
             # 设置表头
             sheet.column_dimensions["A"].width = 24
@@ -101,17 +253,13 @@ class FileManager(Base):
             # 启用表头筛选
             sheet.auto_filter.ref = "A1:G1"
 
-            TableManager.set_cell_value(sheet, 1, 1, "src", 10)
-            TableManager.set_cell_value(sheet, 1, 2, "dst", 10)
-            TableManager.set_cell_value(sheet, 1, 3, "info", 10)
-            TableManager.set_cell_value(sheet, 1, 4, "regex", 10)
-            TableManager.set_cell_value(sheet, 1, 5, "count", 10)
+            header: list[str] = ["src", "dst", "info", "regex", "count"]
             if self.config.output_choices == True:
-                TableManager.set_cell_value(sheet, 1, 6, "dst_choices", 10)
-                TableManager.set_cell_value(sheet, 1, 7, "info_choices", 10)
+                header.extend(("dst_choices", "info_choices"))
+            sheet.append([TableManager.generate_write_only_cell(sheet, v, 10) for v in header])
 
             # 将数据写入工作表
-            for row, entry in enumerate(glossary):
+            for entry in glossary:
                 src: str = entry.get("src")
                 dst: str = entry.get("dst")
                 dst_choices: set[str] = entry.get("dst_choices", set())
@@ -119,54 +267,41 @@ class FileManager(Base):
                 info_choices: set[str] = entry.get("info_choices", set())
                 count: int = entry.get("count", 0)
 
-                TableManager.set_cell_value(sheet, row + 2, 1, src, 10)
-                TableManager.set_cell_value(sheet, row + 2, 2, dst, 10)
-                TableManager.set_cell_value(sheet, row + 2, 3, info, 10)
-                TableManager.set_cell_value(sheet, row + 2, 4, "", 10)
-                TableManager.set_cell_value(sheet, row + 2, 5, count, 10)
+                row: list = [src, dst, info, "", count]
                 if self.config.output_choices == True:
-                    TableManager.set_cell_value(sheet, row + 2, 6, "\n".join(dst_choices), 10)
-                    TableManager.set_cell_value(sheet, row + 2, 7, "\n".join(info_choices), 10)
+                    row.extend(("\n".join(dst_choices), "\n".join(info_choices)))
+                sheet.append([TableManager.generate_write_only_cell(sheet, v, 10) for v in row])
 
             # 保存工作簿
             book.save(f"{self.config.output_folder}/output.xlsx")
         except Exception as e:
             self.error(f"{Localizer.get().log_read_file_fail}", e)
 
-    def write_to_path_json(self, glossary: list[dict[str, str | int | list[str]]]) -> None:
+    def write_to_path_json(self, glossary: tuple[dict[str, str | int | list[str]], ...]) -> None:
         try:
-            # 复制一份
-            glossary = copy.deepcopy(glossary)
-
+            # 生成只包含输出字段的投影，不修改原始数据
             if self.config.output_choices == True:
-                [v.pop("context", None) for v in glossary]
+                excluded = ("context",)
             else:
-                [v.pop("context", None) for v in glossary]
-                [v.pop("dst_choices", None) for v in glossary]
-                [v.pop("info_choices", None) for v in glossary]
+                excluded = ("context", "dst_choices", "info_choices")
+            projection = [{k: v for k, v in entry.items() if k not in excluded} for entry in glossary]
 
             # 保存 JSON
             with open(f"{self.config.output_folder}/output.json", "w", encoding = "utf-8") as writer:
-                writer.write(json.dumps(glossary, indent = 4, ensure_ascii = False))
+                writer.write(json.dumps(projection, indent = 4, ensure_ascii = False))
         except Exception as e:
             self.error(f"{Localizer.get().log_read_file_fail}", e)
 
-    def write_to_path_kvjson(self, glossary: list[dict[str, str | int | list[str]]]) -> None:
+    def write_to_path_kvjson(self, glossary: tuple[dict[str, str | int | list[str]], ...]) -> None:
         try:
-            # 复制一份
-            glossary = copy.deepcopy(glossary)
-
             # 保存 KVJSON
             with open(f"{self.config.output_folder}/output_kv.json", "w", encoding = "utf-8") as writer:
                 writer.write(json.dumps({v.get("src"): v.get("dst") for v in glossary}, indent = 4, ensure_ascii = False))
         except Exception as e:
             self.error(f"{Localizer.get().log_read_file_fail}", e)
 
-    def write_to_path_detail(self, glossary: list[dict[str, str | int | list[str]]]) -> None:
+    def write_to_path_detail(self, glossary: tuple[dict[str, str | int | list[str]], ...]) -> None:
         try:
-            # 复制一份
-            glossary = copy.deepcopy(glossary)
-
             # 保存日志
             with open(f"{self.config.output_folder}/output_detail.txt", "w", encoding = "utf-8") as writer:
                 for entry in glossary:
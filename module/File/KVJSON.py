@@ -29,58 +29,62 @@ class KVJSON(Base):
     def read_from_path(self, abs_paths: list[str]) -> list[Item]:
         items:list[Item] = []
         for abs_path in abs_paths:
-            # 获取相对路径
-            rel_path = os.path.relpath(abs_path, self.input_path)
-
             # 获取文件编码
             encoding = TextHelper.get_enconding(path = abs_path, add_sig_to_utf8 = True)
 
             # 数据处理
             with open(abs_path, "r", encoding = encoding) as reader:
-                json_data: dict[str, str] = json.load(reader)
+                self.read_from_data(abs_path, json.load(reader), items)
+
+        return items
+
+    # 从已解析的数据读取，读取到的条目追加到 items 中，行号在多个文件间累计
+    def read_from_data(self, abs_path: str, json_data: dict[str, str], items: list[Item]) -> list[Item]:
+        # 获取相对路径
+        rel_path = os.path.relpath(abs_path, self.input_path)
 
-                # 格式校验
-                if not isinstance(json_data, dict):
-                    continue
+        # 格式校验
+        if not isinstance(json_data, dict):
+            return items
 
-                # 读取数据
-                for k, v in json_data.items():
-                    if isinstance(k, str) and isinstance(v, str):
-                        src = k
-                        dst = v
-                        if src == "":
-                            items.append(
-                                Item.from_dict({
-                                    "src": src,
-                                    "dst": dst,
-                                    "row": len(items),
-                                    "file_type": Item.FileType.KVJSON,
-                                    "file_path": rel_path,
-                                    "status": Base.ProjectStatus.EXCLUDED,
-                                })
-                            )
-                        elif dst != "" and src != dst:
-                            items.append(
-                                Item.from_dict({
-                                    "src": src,
-                                    "dst": dst,
-                                    "row": len(items),
-                                    "file_type": Item.FileType.KVJSON,
-                                    "file_path": rel_path,
-                                    "status": Base.ProjectStatus.PROCESSED_IN_PAST,
-                                })
-                            )
-                        else:
-                            items.append(
-                                Item.from_dict({
-                                    "src": src,
-                                    "dst": dst,
-                                    "row": len(items),
-                                    "file_type": Item.FileType.KVJSON,
-                                    "file_path": rel_path,
-                                    "status": Base.ProjectStatus.NONE,
-                                })
-                            )
+        # 读取数据
+        for k, v in json_data.items():
+            if isinstance(k, str) and isinstance(v, str):
+                src = k
+                dst = v
+                if src == "":
+                    items.append(
+                        Item.from_dict({
+                            "src": src,
+                            "dst": dst,
+                            "row": len(items),
+                            "file_type": Item.FileType.KVJSON,
+                            "file_path": rel_path,
+                            "status": Base.ProjectStatus.EXCLUDED,
+                        })
+                    )
+                elif dst != "" and src != dst:
+                    items.append(
+                        Item.from_dict({
+                            "src": src,
+                            "dst": dst,
+                            "row": len(items),
+                            "file_type": Item.FileType.KVJSON,
+                            "file_path": rel_path,
+                            "status": Base.ProjectStatus.PROCESSED_IN_PAST,
+                        })
+                    )
+                else:
+                    items.append(
+                        Item.from_dict({
+                            "src": src,
+                            "dst": dst,
+                            "row": len(items),
+                            "file_type": Item.FileType.KVJSON,
+                            "file_path": rel_path,
+                            "status": Base.ProjectStatus.NONE,
+                        })
+                    )
 
         return items
 
@@ -48,48 +48,52 @@ class MESSAGEJSON(Base):
     def read_from_path(self, abs_paths: list[str]) -> list[Item]:
         items: list[Item] = []
         for abs_path in abs_paths:
-            # 获取相对路径
-            rel_path = os.path.relpath(abs_path, self.input_path)
-
             # 获取文件编码
             encoding = TextHelper.get_enconding(path = abs_path, add_sig_to_utf8 = True)
 
             # 数据处理
             with open(abs_path, "r", encoding = encoding) as reader:
-                json_data: list[dict[str, dict]] = json.load(reader)
-
-                # 格式校验
-                if not isinstance(json_data, list):
-                    continue
-
-                for entry in json_data:
-                    # 有效性校验
-                    entry_message: str = entry.get("message", None)
-                    if not isinstance(entry, dict) or entry_message is None:
-                        continue
-
-                    # 添加数据
-                    name = None
-                    result_name = entry.get("name", None)
-                    result_names = entry.get("names", None)
-                    if isinstance(result_name, str):
-                        name = result_name
-                    elif isinstance(result_names, list):
-                        name = [v for v in result_names if isinstance(v, str)]
-
-                    # 添加数据
-                    items.append(
-                        Item.from_dict({
-                            "src": entry_message,
-                            "dst": entry_message,
-                            "name_src": name,
-                            "name_dst": name,
-                            "row": len(items),
-                            "file_type": Item.FileType.MESSAGEJSON,
-                            "file_path": rel_path,
-                            "text_type": Item.TextType.KAG,
-                        })
-                    )
+                self.read_from_data(abs_path, json.load(reader), items)
+
+        return items
+
+    # 从已解析的数据读取，读取到的条目追加到 items 中，行号在多个文件间累计
+    def read_from_data(self, abs_path: str, json_data: list[dict[str, dict]], items: list[Item]) -> list[Item]:
+        # 获取相对路径
+        rel_path = os.path.relpath(abs_path, self.input_path)
+
+        # 格式校验
+        if not isinstance(json_data, list):
+            return items
+
+        for entry in json_data:
+            # 有效性校验
+            entry_message: str = entry.get("message", None)
+            if not isinstance(entry, dict) or entry_message is None:
+                continue
+
+            # 添加数据
+            name = None
+            result_name = entry.get("name", None)
+            result_names = entry.get("names", None)
+            if isinstance(result_name, str):
+                name = result_name
+            elif isinstance(result_names, list):
+                name = [v for v in result_names if isinstance(v, str)]
+
+            # 添加数据
+            items.append(
+                Item.from_dict({
+                    "src": entry_message,
+                    "dst": entry_message,
+                    "name_src": name,
+                    "name_dst": name,
+                    "row": len(items),
+                    "file_type": Item.FileType.MESSAGEJSON,
+                    "file_path": rel_path,
+                    "text_type": Item.TextType.KAG,
+                })
+            )
 
         return items
 
@@ -3,6 +3,7 @@ import re
 import shutil
 
 import openpyxl
+import openpyxl.cell
 import openpyxl.styles
 import openpyxl.worksheet.worksheet
 
@@ -46,76 +47,91 @@ class WOLFXLSX(Base):
     def read_from_path(self, abs_paths: list[str]) -> list[Item]:
         items:list[Item] = []
         for abs_path in abs_paths:
-            # 获取相对路径
-            rel_path = os.path.relpath(abs_path, self.input_path)
+            # 数据处理
+            # 以只读模式打开，逐行读取需要的列，避免在内存中构建完整的单元格对象
+            book: openpyxl.Workbook = openpyxl.load_workbook(abs_path, read_only = True)
+            try:
+                sheet: openpyxl.worksheet.worksheet.Worksheet = book.active
 
-            # 将原始文件复制一份
-            os.makedirs(os.path.dirname(f"{self.output_path}/cache/temp/{rel_path}"), exist_ok = True)
-            shutil.copy(abs_path, f"{self.output_path}/cache/temp/{rel_path}")
+                # 跳过空表格
+                if sheet.max_row == 0 or sheet.max_column == 0:
+                    continue
 
-            # 数据处理
-            book: openpyxl.Workbook = openpyxl.load_workbook(abs_path)
-            sheet: openpyxl.worksheet.worksheet.Worksheet = book.active
+                # 判断是否为 WOLF 翻译表格文件
+                if not self.is_wold_xlsx(sheet):
+                    continue
 
-            # 跳过空表格
-            if sheet.max_row == 0 or sheet.max_column == 0:
-                continue
+                items.extend(self.read_from_sheet(abs_path, sheet))
+            finally:
+                book.close()
 
-            # 判断是否为 WOLF 翻译表格文件
-            if not self.is_wold_xlsx(sheet):
-                continue
+        return items
 
-            for row in range(2, sheet.max_row + 1):
-                src: str = sheet.cell(row = row, column = 6).value
-                dst: str = sheet.cell(row = row, column = 7).value
+    # 从已打开的工作表读取
+    def read_from_sheet(self, abs_path: str, sheet: openpyxl.worksheet.worksheet.Worksheet) -> list[Item]:
+        items:list[Item] = []
 
-                # 跳过读取失败的行
-                # 数据不存在时为 None，存在时可能是 str int float 等多种类型
-                if src is None:
-                    continue
+        # 获取相对路径
+        rel_path = os.path.relpath(abs_path, self.input_path)
+
+        # 将原始文件复制一份
+        os.makedirs(os.path.dirname(f"{self.output_path}/cache/temp/{rel_path}"), exist_ok = True)
+        shutil.copy(abs_path, f"{self.output_path}/cache/temp/{rel_path}")
+
+        # 只读模式下的行数来自文件中记录的表格范围，部分软件导出的文件中记录的范围不正确，因此需要重新计算
+        sheet.reset_dimensions()
 
-                src: str = str(src)
-                dst: str = str(dst) if dst is not None else ""
-
-                if (
-                    src == ""
-                    or self.get_fg_color_index(sheet, row, 6) not in WOLFXLSX.FILL_COLOR_WHITELIST
-                ):
-                    items.append(
-                        Item.from_dict({
-                            "src": src,
-                            "dst": dst,
-                            "row": row,
-                            "file_type": Item.FileType.WOLFXLSX,
-                            "file_path": rel_path,
-                            "text_type": Item.TextType.WOLF,
-                            "status": Base.ProjectStatus.EXCLUDED,
-                        })
-                    )
-                elif dst != "" and src != dst:
-                    items.append(
-                        Item.from_dict({
-                            "src": src,
-                            "dst": dst,
-                            "row": row,
-                            "file_type": Item.FileType.WOLFXLSX,
-                            "file_path": rel_path,
-                            "text_type": Item.TextType.WOLF,
-                            "status": Base.ProjectStatus.PROCESSED_IN_PAST,
-                        })
-                    )
-                else:
-                    items.append(
-                        Item.from_dict({
-                            "src": src,
-                            "dst": dst,
-                            "row": row,
-                            "file_type": Item.FileType.WOLFXLSX,
-                            "file_path": rel_path,
-                            "text_type": Item.TextType.WOLF,
-                            "status": Base.ProjectStatus.NONE,
-                        })
-                    )
+        for row, (src_cell, dst_cell) in enumerate(sheet.iter_rows(min_row = 2, min_col = 6, max_col = 7), start = 2):
+            src: str = src_cell.value
+            dst: str = dst_cell.value
+
+            # 跳过读取失败的行
+            # 数据不存在时为 None，存在时可能是 str int float 等多种类型
+            if src is None:
+                continue
+
+            src: str = str(src)
+            dst: str = str(dst) if dst is not None else ""
+
+            if (
+                src == ""
+                or self.get_fg_color_index(src_cell) not in WOLFXLSX.FILL_COLOR_WHITELIST
+            ):
+                items.append(
+                    Item.from_dict({
+                        "src": src,
+                        "dst": dst,
+                        "row": row,
+                        "file_type": Item.FileType.WOLFXLSX,
+                        "file_path": rel_path,
+                        "text_type": Item.TextType.WOLF,
+                        "status": Base.ProjectStatus.EXCLUDED,
+                    })
+                )
+            elif dst != "" and src != dst:
+                items.append(
+                    Item.from_dict({
+                        "src": src,
+                        "dst": dst,
+                        "row": row,
+                        "file_type": Item.FileType.WOLFXLSX,
+                        "file_path": rel_path,
+                        "text_type": Item.TextType.WOLF,
+                        "status": Base.ProjectStatus.PROCESSED_IN_PAST,
+                    })
+                )
+            else:
+                items.append(
+                    Item.from_dict({
+                        "src": src,
+                        "dst": dst,
+                        "row": row,
+                        "file_type": Item.FileType.WOLFXLSX,
+                        "file_path": rel_path,
+                        "text_type": Item.TextType.WOLF,
+                        "status": Base.ProjectStatus.NONE,
+                    })
+                )
 
         return items
 
@@ -156,29 +172,34 @@ class WOLFXLSX(Base):
             book.save(abs_path)
 
     # 是否为 WOLF 翻译表格文件
+    # 只读取表头行，兼容只读模式打开的工作表
     def is_wold_xlsx(self, sheet: openpyxl.worksheet.worksheet.Worksheet) -> bool:
-        value: str = sheet.cell(row = 1, column = 1).value
+        header: tuple = next(sheet.iter_rows(min_row = 1, max_row = 1, max_col = 4, values_only = True), ())
+        header = tuple(header) + (None,) * (4 - len(header))
+
+        value: str = header[0]
         if not isinstance(value, str) or "code" not in value.lower():
             return False
 
-        value: str = sheet.cell(row = 1, column = 2).value
+        value: str = header[1]
         if not isinstance(value, str) or "flag" not in value.lower():
             return False
 
-        value: str = sheet.cell(row = 1, column = 3).value
+        value: str = header[2]
         if not isinstance(value, str) or "type" not in value.lower():
             return False
 
-        value: str = sheet.cell(row = 1, column = 4).value
+        value: str = header[3]
         if not isinstance(value, str) or "info" not in value.lower():
             return False
 
         return True
 
     # 获取单元格填充颜色索引
-    def get_fg_color_index(self, sheet: openpyxl.worksheet.worksheet.Worksheet, row: int, column: int) -> int:
-        fill = sheet.cell(row = row, column = column).fill
-        if fill.fill_type is not None:
+    # 只读模式下不存在的单元格没有填充属性
+    def get_fg_color_index(self, cell: openpyxl.cell.Cell) -> int:
+        fill = getattr(cell, "fill", None)
+        if fill is not None and fill.fill_type is not None:
             fg_color = fill.fgColor
             if fg_color:
                 if isinstance(fg_color, openpyxl.styles.Color):
@@ -25,66 +25,79 @@ class XLSX(Base):
     def read_from_path(self, abs_paths: list[str]) -> list[Item]:
         items:list[Item] = []
         for abs_path in abs_paths:
-            # 获取相对路径
-            rel_path = os.path.relpath(abs_path, self.input_path)
-
             # 数据处理
-            book: openpyxl.Workbook = openpyxl.load_workbook(abs_path)
-            sheet: openpyxl.worksheet.worksheet.Worksheet = book.active
+            # 以只读模式打开，逐行读取需要的列，避免在内存中构建完整的单元格对象
+            book: openpyxl.Workbook = openpyxl.load_workbook(abs_path, read_only = True)
+            try:
+                sheet: openpyxl.worksheet.worksheet.Worksheet = book.active
 
-            # 跳过空表格
-            if sheet.max_row == 0 or sheet.max_column == 0:
-                continue
+                # 跳过空表格
+                if sheet.max_row == 0 or sheet.max_column == 0:
+                    continue
 
-            # 判断是否为 WOLF 翻译表格文件
-            if self.is_wold_xlsx(sheet):
-                continue
+                # 判断是否为 WOLF 翻译表格文件
+                if self.is_wold_xlsx(sheet):
+                    continue
 
-            for row in range(1, sheet.max_row + 1):
-                src = sheet.cell(row = row, column = 1).value
-                dst = sheet.cell(row = row, column = 2).value
+                items.extend(self.read_from_sheet(abs_path, sheet))
+            finally:
+                book.close()
 
-                # 跳过读取失败的行
-                # 数据不存在时为 None，存在时可能是 str int float 等多种类型
-                if src is None:
-                    continue
+        return items
 
-                src = str(src)
-                dst = str(dst) if dst is not None else ""
-
-                if src == "":
-                    items.append(
-                        Item.from_dict({
-                            "src": src,
-                            "dst": dst,
-                            "row": row,
-                            "file_type": Item.FileType.XLSX,
-                            "file_path": rel_path,
-                            "status": Base.ProjectStatus.EXCLUDED,
-                        })
-                    )
-                elif dst != "" and src != dst:
-                    items.append(
-                        Item.from_dict({
-                            "src": src,
-                            "dst": dst,
-                            "row": row,
-                            "file_type": Item.FileType.XLSX,
-                            "file_path": rel_path,
-                            "status": Base.ProjectStatus.PROCESSED_IN_PAST,
-                        })
-                    )
-                else:
-                    items.append(
-                        Item.from_dict({
-                            "src": src,
-                            "dst": dst,
-                            "row": row,
-                            "file_type": Item.FileType.XLSX,
-                            "file_path": rel_path,
-                            "status": Base.ProjectStatus.NONE,
-                        })
-                    )
+    # 从已打开的工作表读取
+    def read_from_sheet(self, abs_path: str, sheet: openpyxl.worksheet.worksheet.Worksheet) -> list[Item]:
+        items:list[Item] = []
+
+        # 获取相对路径
+        rel_path = os.path.relpath(abs_path, self.input_path)
+
+        # 只读模式下的行数来自文件中记录的表格范围，部分软件导出的文件中记录的范围不正确，因此需要重新计算
+        sheet.reset_dimensions()
+
+        for row, (src, dst) in enumerate(sheet.iter_rows(min_row = 1, max_col = 2, values_only = True), start = 1):
+
+            # 跳过读取失败的行
+            # 数据不存在时为 None，存在时可能是 str int float 等多种类型
+            if src is None:
+                continue
+
+            src = str(src)
+            dst = str(dst) if dst is not None else ""
+
+            if src == "":
+                items.append(
+                    Item.from_dict({
+                        "src": src,
+                        "dst": dst,
+                        "row": row,
+                        "file_type": Item.FileType.XLSX,
+                        "file_path": rel_path,
+                        "status": Base.ProjectStatus.EXCLUDED,
+                    })
+                )
+            elif dst != "" and src != dst:
+                items.append(
+                    Item.from_dict({
+                        "src": src,
+                        "dst": dst,
+                        "row": row,
+                        "file_type": Item.FileType.XLSX,
+                        "file_path": rel_path,
+                        "status": Base.ProjectStatus.PROCESSED_IN_PAST,
+                    })
+                )
+            else:
+                items.append(
+                    Item.from_dict({
+                        "src": src,
+                        "dst": dst,
+                        "row": row,
+                        "file_type": Item.FileType.XLSX,
+                        "file_path": rel_path,
+                        "status": Base.ProjectStatus.NONE,
+                    })
+                )
 
         return items
 
@@ -124,20 +137,24 @@ class XLSX(Base):
             book.save(abs_path)
 
     # 是否为 WOLF 翻译表格文件
+    # 只读取表头行，兼容只读模式打开的工作表
     def is_wold_xlsx(self, sheet: openpyxl.worksheet.worksheet.Worksheet) -> bool:
-        value: str = sheet.cell(row = 1, column = 1).value
+        header: tuple = next(sheet.iter_rows(min_row = 1, max_row = 1, max_col = 4, values_only = True), ())
+        header = tuple(header) + (None,) * (4 - len(header))
+
+        value: str = header[0]
         if not isinstance(value, str) or "code" not in value.lower():
             return False
 
-        value: str = sheet.cell(row = 1, column = 2).value
+        value: str = header[1]
         if not isinstance(value, str) or "flag" not in value.lower():
             return False
 
-        value: str = sheet.cell(row = 1, column = 3).value
+        value: str = header[2]
         if not isinstance(value, str) or "type" not in value.lower():
             return False
 
-        value: str = sheet.cell(row = 1, column = 4).value
+        value: str = header[3]
         if not isinstance(value, str) or "info" not in value.lower():
             return False
 
@@ -0,0 +1,131 @@
+from typing import Callable
+
+import numpy
+
+from base.Base import Base
+from model.Item import Item
+
+class ItemTable():
+
+    # 条目的列式视图，状态统计、过滤与切分片段均以数组运算完成
+    # 原文相关的列只在原文发生变化时重新计算，状态列在每次使用前刷新
+
+    # 翻译状态编码
+    STATUS: tuple[Base.ProjectStatus, ...] = tuple(Base.ProjectStatus)
+    STATUS_CODE: dict[Base.ProjectStatus, int] = {v: i for i, v in enumerate(STATUS)}
+
+    def __init__(self, items: list[Item]) -> None:
+        super().__init__()
+
+        # 初始化
+        self.items: list[Item] = items
+        self.srcs: list[str] = [None] * len(items)
+        self.file_paths: numpy.ndarray = numpy.zeros(len(items), dtype = numpy.int32)
+        self.line_counts: numpy.ndarray = numpy.zeros(len(items), dtype = numpy.int64)
+        self.token_counts: numpy.ndarray = numpy.full(len(items), -1, dtype = numpy.int64)
+        self.status: numpy.ndarray = numpy.zeros(len(items), dtype = numpy.uint8)
+
+        # 文件路径编码
+        self.file_path_code: dict[str, int] = {}
+
+        # 刷新
+        self.refresh()
+
+    # 刷新原文相关的列，只处理原文发生变化的条目
+    def refresh(self) -> None:
+        for i, item in enumerate(self.items):
+            src = item.get_src()
+            if src is self.srcs[i]:
+                continue
+
+            self.srcs[i] = src
+            self.file_paths[i] = self.file_path_code.setdefault(item.get_file_path(), len(self.file_path_code))
+            self.line_counts[i] = sum(1 for line in src.splitlines() if line.strip())
+            self.token_counts[i] = -1
+
+        self.refresh_status()
+
+    # 刷新状态列
+    def refresh_status(self) -> None:
+        code = __class__.STATUS_CODE
+        self.status = numpy.fromiter((code.get(item.get_status(), 0) for item in self.items), dtype = numpy.uint8, count = len(self.items))
+
+    # 刷新 Token 数量列，只计算尚未计算过的条目
+    def refresh_token_counts(self, mask: numpy.ndarray, num_threads: int) -> None:
+        indexes = numpy.flatnonzero(mask & (self.token_counts < 0))
+        if len(indexes) == 0:
+            return None
+
+        items = [self.items[i] for i in indexes]
+        Item.count_tokens(items, num_threads)
+        self.token_counts[indexes] = [item.get_token_count() for item in items]
+
+    # 获取指定状态的掩码
+    def get_status_mask(self, status: Base.ProjectStatus) -> numpy.ndarray:
+        return self.status == __class__.STATUS_CODE.get(status, -1)
+
+    # 获取条目数量（根据翻译状态）
+    def get_count_by_status(self, status: Base.ProjectStatus) -> int:
+        self.refresh_status()
+        return int(numpy.count_nonzero(self.get_status_mask(status)))
+
+    # 过滤，返回需要排除的条目的掩码
+    # 相同的原文只判断一次
+    def filter(self, function: Callable[[str], bool], progress: Callable[[int, int], None] = None) -> numpy.ndarray:
+        self.refresh()
+
+        results: dict[str, bool] = {}
+        for i, src in enumerate(self.srcs):
+            if src not in results:
+                results[src] = function(src)
+                progress(i + 1, len(self.srcs)) if progress is not None else None
+        progress(len(self.srcs), len(self.srcs)) if progress is not None else None
+
+        return numpy.fromiter((results.get(src) for src in self.srcs), dtype = numpy.bool_, count = len(self.srcs))
+
+    # 设置掩码范围内的条目的翻译状态，返回受影响的条目
+    def set_status(self, mask: numpy.ndarray, status: Base.ProjectStatus) -> list[Item]:
+        items = [self.items[i] for i in numpy.flatnonzero(mask)]
+        for item in items:
+            item.set_status(status)
+        self.status[mask] = __class__.STATUS_CODE.get(status)
+
+        return items
+
+    # 生成条目片段
+    # 与逐条累加的贪心切分结果完全一致：片段从第一条未翻译条目开始，在行数超限、Token 超限或跨文件之前结束
+    def generate_chunks(self, token_threshold: int, line_limit: int, num_threads: int) -> list[list[Item]]:
+        self.refresh()
+
+        # 筛选未翻译的条目
+        mask = self.get_status_mask(Base.ProjectStatus.NONE)
+        self.refresh_token_counts(mask, num_threads)
+        indexes = numpy.flatnonzero(mask)
+        if len(indexes) == 0:
+            return []
+
+        # 累计行数与 Token 数量
+        line_sums = numpy.concatenate(([0], numpy.cumsum(self.line_counts[indexes])))
+        token_sums = numpy.concatenate(([0], numpy.cumsum(self.token_counts[indexes])))
+
+        # 每个位置所在的同一文件的连续区间的结束位置
+        file_paths = self.file_paths[indexes]
+        breaks = numpy.flatnonzero(file_paths[1:] != file_paths[:-1]) + 1
+        run_ends = numpy.append(breaks, len(indexes))
+        file_ends = run_ends[numpy.searchsorted(run_ends, numpy.arange(len(indexes)), side = "right")]
+
+        chunks: list[list[Item]] = []
+        start = 0
+        while start < len(indexes):
+            end = min(
+                int(numpy.searchsorted(line_sums, line_sums[start] + line_limit, side = "right")) - 1,
+                int(numpy.searchsorted(token_sums, token_sums[start] + token_threshold, side = "right")) - 1,
+                int(file_ends[start]),
+            )
+
+            # 每个片段的第一条不判断是否超限，以避免特别长的文本导致死循环
+            end = max(end, start + 1)
+            chunks.append([self.items[i] for i in indexes[start:end]])
+            start = end
+
+        return chunks
\ No newline at end of file
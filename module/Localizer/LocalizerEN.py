@@ -89,15 +89,20 @@ class LocalizerEN(LocalizerZH):
     engine_task_generation: str = "Task generation completed, {COUNT} tasks generated in total …"
     engine_task_rule_filter: str = "Rule filtering completed, {COUNT} entries that do not require translation were filtered in total …"
     engine_task_language_filter: str = "Language filtering completed, {COUNT} entries not containing the target language were filtered in total …"
+    engine_task_pre_replacement_invalid: str = "Invalid pre-replacement rule skipped - {SRC}"
+    engine_task_preprocess: str = "Text preprocessing completed, {COUNT} items processed in total …"
+    engine_task_pre_replacement_hit: str = "Pre-replacement completed, {RULE} rules matched {HIT} times in total …"
     engine_task_context_search: str = "Context searhing completed, {COUNT} entries were processed in total …"
-    engine_max_round: str = "Max Rounds"
-    engine_current_round: str = "Current Round"
+    engine_max_attempts: str = "Max Attempts Per Line"
     engine_api_url: str = "API URL"
     engine_api_name: str = "API Name"
     engine_api_model: str = "API Model"
     engine_response_think: str = "Model Thinking:"
     engine_response_result: str = "Model Response:"
     engine_task_success: str = "Task time {TIME} seconds, {LINES} lines of text, input tokens {PT}, output tokens {CT}"
+    engine_task_cache_hit: str = ", cache hit ratio {RATIO}%"
+    engine_task_first_entry: str = ", first entry in {TIME} seconds"
+    engine_task_hedge: str = "Hedged requests - {ISSUED} issued, {WON} won"
     engine_task_too_many: str = "Too many real-time tasks, details hidden for performance …"
     api_tester_key: str = "Testing Key:"
     api_tester_messages: str = "Task Prompts:"
@@ -196,6 +201,7 @@ class LocalizerEN(LocalizerZH):
     task_page_card_speed: str = "Average Speed"
     task_page_card_token: str = "Total Tokens"
     task_page_card_task: str = "Real Time Tasks"
+    task_page_card_limit: str = "Concurrency Limit"
     task_page_alert_pause: str = "Stopped tasks can be resumed at any time. Confirm to stop the task … ?"
     task_page_continue: str = "Continue Task"
     task_page_export: str = "Export Task Data"
@@ -218,6 +224,14 @@ class LocalizerEN(LocalizerZH):
         "<br>"
         "Please refer to the API platform's documentation for settings, 0 = unlimited"
     )
+    basic_settings_page_tpm_threshold_title: str = "Tokens Per Minute Threshold"
+    basic_settings_page_tpm_threshold_content: str = (
+        "Maximum total number of tokens consumed per minute, i.e., the <font color='darkgoldenrod'><b>TPM</b></font> threshold"
+        "<br>"
+        "Some platforms may limit the token consumption rate"
+        "<br>"
+        "Please refer to the API platform's documentation for settings, 0 = unlimited"
+    )
     basic_settings_page_token_threshold_title: str = "Task Length Threshold"
     basic_settings_page_token_threshold_content: str = "The maximum number of text tokens contained in each task"
     basic_settings_page_request_timeout_title: str = "Request Timeout"
@@ -227,13 +241,23 @@ class LocalizerEN(LocalizerZH):
         "If no reply is received after the timeout, the task will be considered failed"
     )
     basic_settings_page_max_round_title: str = "Maximum Rounds"
-    basic_settings_page_max_round_content: str = "After completing a round of tasks, failed tasks will be retried in a new round until all are completed or the round threshold is reached"
+    basic_settings_page_max_round_content: str = "Unfinished lines of failed tasks are immediately split into smaller tasks and retried, each line is attempted at most the round threshold number of times"
 
     # 专家设置
     expert_settings_page_output_choices_title: str = "Output Choices Data"
     expert_settings_page_output_choices_description: str = "Include choices data in the output for proofreading, disabled by default"
     expert_settings_page_output_kvjson_title: str = "Output KVJSON File"
     expert_settings_page_output_kvjson_description: str = "Generate KVJSON format data file when outputting results, disabled by default"
+    expert_settings_page_response_cache_enable_title: str = "Response Cache"
+    expert_settings_page_response_cache_enable_description: str = "Cache model responses in the output folder, identical requests in later runs will reuse cached results at no cost, enabled by default"
+    expert_settings_page_async_request_enable_title: str = "Async Request Mode"
+    expert_settings_page_async_request_enable_description: str = "Run all requests concurrently on a single event loop, suited for very high concurrency, significantly reduces memory usage and thread overhead, disabled by default"
+    expert_settings_page_cache_database_enable_title: str = "Database Cache"
+    expert_settings_page_cache_database_enable_description: str = "Store task cache in an SQLite database, significantly reduces cache save and load time for large projects, disabled by default"
+    expert_settings_page_request_hedge_enable_title: str = "Hedged Requests"
+    expert_settings_page_request_hedge_enable_description: str = "When a request takes longer than a percentile of recent requests (95th by default), send an identical request and use whichever returns first, reducing waits caused by slow requests, extra requests are capped at 10% of all requests, disabled by default"
+    expert_settings_page_stream_request_enable_title: str = "Streaming Requests"
+    expert_settings_page_stream_request_enable_description: str = "Receive model responses as a stream, parsing glossary entries as soon as each line is complete, stopping the task interrupts in-flight requests immediately, disabled by default"
 
     # 质量类通用
     quality_import: str = "Import"
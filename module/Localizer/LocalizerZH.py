@@ -89,15 +89,20 @@ class LocalizerZH():
     engine_task_generation: str = "任务生成已完成，共生成 {COUNT} 个任务 …"
     engine_task_rule_filter: str = "规则过滤已完成，共过滤 {COUNT} 个无需翻译的条目 …"
     engine_task_language_filter: str = "语言过滤已完成，共过滤 {COUNT} 个不包含目标语言的条目 …"
+    engine_task_pre_replacement_invalid: str = "前置替换规则无效，已跳过 - {SRC}"
+    engine_task_preprocess: str = "文本预处理已完成，共处理 {COUNT} 个条目 …"
+    engine_task_pre_replacement_hit: str = "前置替换已完成，共有 {RULE} 条规则命中 {HIT} 次 …"
     engine_task_context_search: str = "参考文本搜索已完成，共处理 {COUNT} 个条目 …"
-    engine_max_round: str = "最大轮次"
-    engine_current_round: str = "当前轮次"
+    engine_max_attempts: str = "每个条目的最大尝试次数"
     engine_api_url: str = "接口地址"
     engine_api_name: str = "接口名称"
     engine_api_model: str = "接口模型"
     engine_response_think: str = "模型思考内容："
     engine_response_result: str = "模型回复内容："
     engine_task_success: str = "任务耗时 {TIME} 秒，文本行数 {LINES} 行，输入消耗 {PT} Tokens，输出消耗 {CT} Tokens"
+    engine_task_cache_hit: str = "，缓存命中率 {RATIO}%"
+    engine_task_first_entry: str = "，首个条目耗时 {TIME} 秒"
+    engine_task_hedge: str = "对冲请求 - 已发送 {ISSUED} 个，胜出 {WON} 个"
     engine_task_too_many: str = "实时任务较多，暂时停止显示详细结果以提升性能 …"
     api_tester_key: str = "测试密钥："
     api_tester_messages: str = "任务提示词："
@@ -196,6 +201,7 @@ class LocalizerZH():
     task_page_card_speed: str = "平均速度"
     task_page_card_token: str = "累计消耗"
     task_page_card_task: str = "实时任务数"
+    task_page_card_limit: str = "并发上限"
     task_page_alert_pause: str = "停止的任务可以随时继续执行，是否确定停止任务 … ？"
     task_page_continue: str = "继续任务"
     task_page_export: str = "导出任务数据"
@@ -218,6 +224,14 @@ class LocalizerZH():
         ""
         ""
     )
+    basic_settings_page_tpm_threshold_title: str = "每分钟 Token 数量阈值"
+    basic_settings_page_tpm_threshold_content: str = (
+        "每分钟消耗的 Token 总数量的最大值，即 <font color='darkgoldenrod'><b>TPM</b></font> 阈值"
+        "<br>"
+        "部分平台会对 Token 的消耗速率进行限制，请参考 API 平台的文档进行设置，0 = 无限制"
+        ""
+        ""
+    )
     basic_settings_page_token_threshold_title: str = "任务长度阈值"
     basic_settings_page_token_threshold_content: str = "每个任务所包含的文本的最大 Token 数量"
     basic_settings_page_request_timeout_title: str = "超时时间阈值"
@@ -227,13 +241,23 @@ class LocalizerZH():
         ""
     )
     basic_settings_page_max_round_title: str = "任务轮次阈值"
-    basic_settings_page_max_round_content: str = "当完成一轮任务后，将在新的轮次中对失败的任务进行重试，直到全部完成或达到轮次阈值"
+    basic_settings_page_max_round_content: str = "失败的任务中未完成的条目会被立即切分为更小的任务重试，每个条目最多执行的次数即为轮次阈值"
 
     # 专家设置
     expert_settings_page_output_choices_title: str = "输出候选数据"
     expert_settings_page_output_choices_description: str = "在输出结果时包含候选数据以供校对使用，默认禁用"
     expert_settings_page_output_kvjson_title: str = "输出 KVJSON 文件"
     expert_settings_page_output_kvjson_description: str = "在输出结果时生成 KVJSON 格式的数据文件，默认禁用"
+    expert_settings_page_response_cache_enable_title: str = "请求结果缓存"
+    expert_settings_page_response_cache_enable_description: str = "将模型的回复缓存至输出文件夹中，重复执行时相同的请求将直接使用缓存结果且不产生消耗，默认启用"
+    expert_settings_page_async_request_enable_title: str = "异步请求模式"
+    expert_settings_page_async_request_enable_description: str = "在单个事件循环中并发执行所有请求，适合需要同时执行大量请求的场景，可以显著降低高并发时的内存占用与线程开销，默认禁用"
+    expert_settings_page_cache_database_enable_title: str = "数据库缓存"
+    expert_settings_page_cache_database_enable_description: str = "使用 SQLite 数据库保存任务缓存，条目数量较多时可以显著降低保存与读取缓存的耗时，默认禁用"
+    expert_settings_page_request_hedge_enable_title: str = "对冲请求"
+    expert_settings_page_request_hedge_enable_description: str = "请求耗时超过近期请求耗时的分位数（默认为 95%）时，再发送一个相同的请求并使用先返回的结果，可以减少慢请求导致的等待，额外的请求数量不超过请求总数的 10%，默认禁用"
+    expert_settings_page_stream_request_enable_title: str = "流式请求"
+    expert_settings_page_stream_request_enable_description: str = "以流式方式接收模型的回复，每收到完整的一行即解析其中的术语条目，停止任务时可以立即中断正在进行的请求，默认禁用"
 
     # 质量类通用
     quality_import: str = "导入"
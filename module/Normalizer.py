@@ -1,4 +1,5 @@
 import itertools
+import re
 import unicodedata
 
 class Normalizer():
@@ -75,6 +76,12 @@ class Normalizer():
         "ﾟ": "゜",  # 半浊音符号
     })
 
+    # 自定义规则的转换表，使用 str.translate 一次完成所有字符的替换
+    TRANSLATE_TABLE: dict[int, str] = str.maketrans(CUSTOM_RULE)
+
+    # 自定义规则中所有字符的匹配模式，str.translate 对非 ASCII 文本需要逐字符查表，因此只在包含这些字符时才转换
+    PATTERN: re.Pattern = re.compile(f"[{"".join(re.escape(v) for v in CUSTOM_RULE)}]")
+
     # 规范化
     @classmethod
     def normalize(CLS, text: str) -> str:
@@ -85,7 +92,8 @@ class Normalizer():
         text = unicodedata.normalize("NFC", text)
 
         # 应用自定义的规则
-        text = "".join([CLS.CUSTOM_RULE.get(char, char) for char in text])
+        if CLS.PATTERN.search(text) is not None:
+            text = text.translate(CLS.TRANSLATE_TABLE)
 
         # 返回结果
         return text
\ No newline at end of file
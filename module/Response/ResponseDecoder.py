@@ -1,3 +1,6 @@
+import json
+import time
+
 import json_repair as repair
 
 from base.Base import Base
@@ -7,6 +10,14 @@ class ResponseDecoder(Base):
     def __init__(self) -> None:
         super().__init__()
 
+        # 流式解码的状态
+        self.buffer: str = ""
+        self.started: bool = False
+        self.thinking: bool = False
+        self.glossary: list[dict[str, str]] = []
+        self.start_time: float = time.monotonic()
+        self.first_entry_latency: float = None
+
     # 解析文本
     def decode(self, response: str) -> tuple[list[str], list[dict[str, str]]]:
         dsts: list[str] = []
@@ -14,19 +25,87 @@ class ResponseDecoder(Base):
 
         # 按行解析失败时，尝试按照普通 JSON 字典进行解析
         for line in response.splitlines():
-            json_data = repair.loads(line)
-            if isinstance(json_data, dict):
-                if all(v in json_data for v in ("src", "dst", "type")):
-                    src: str = json_data.get("src")
-                    dst: str = json_data.get("dst")
-                    type: str = json_data.get("type")
-                    glossary.append(
-                        {
-                            "src": src if isinstance(src, str) else "",
-                            "dst": dst if isinstance(dst, str) else "",
-                            "info": type if isinstance(type, str) else "",
-                        }
-                    )
+            entry = self.decode_line(line)
+            if entry is not None:
+                glossary.append(entry)
 
         # 返回默认值
-        return dsts, glossary
\ No newline at end of file
+        return dsts, glossary
+
+    # 解析一行文本，不是术语条目时返回 None
+    # 不包含全部键名的行不可能是术语条目，直接跳过，其余的行中首尾为花括号的先使用标准库解析
+    # 标准库解析失败或首尾不是花括号时再尝试修复，修复时不再重复标准库解析
+    def decode_line(self, line: str) -> dict[str, str] | None:
+        if "src" not in line or "dst" not in line or "type" not in line:
+            return None
+
+        json_data = None
+        stripped = line.strip()
+        if stripped.startswith("{") and stripped.endswith("}"):
+            try:
+                json_data = json.loads(stripped)
+            except Exception:
+                pass
+
+        if json_data is None:
+            json_data = repair.loads(line, skip_json_loads = True)
+
+        if isinstance(json_data, dict):
+            if all(v in json_data for v in ("src", "dst", "type")):
+                src: str = json_data.get("src")
+                dst: str = json_data.get("dst")
+                type: str = json_data.get("type")
+                return {
+                    "src": src if isinstance(src, str) else "",
+                    "dst": dst if isinstance(dst, str) else "",
+                    "info": type if isinstance(type, str) else "",
+                }
+
+        return None
+
+    # 流式解码，每收到一段回复文本调用一次，返回本次新解析出的术语条目
+    # 回复以 <think> 开头时，跳过 </think> 之前的思考内容
+    def feed(self, text: str) -> list[dict[str, str]]:
+        self.buffer = self.buffer + text
+
+        # 判断是否以思考内容开头
+        if self.started == False:
+            stripped = self.buffer.lstrip()
+            if stripped == "" or (len(stripped) < len("<think>") and "<think>".startswith(stripped)):
+                return []
+
+            self.started = True
+            self.thinking = stripped.startswith("<think>")
+
+        # 跳过思考内容
+        if self.thinking == True:
+            if "</think>" not in self.buffer:
+                return []
+
+            self.thinking = False
+            self.buffer = self.buffer.split("</think>", 1)[-1]
+
+        # 只解析已经完整的行
+        if "\n" not in self.buffer:
+            return []
+
+        lines = self.buffer.split("\n")
+        self.buffer = lines.pop()
+
+        return self.add_lines(lines)
+
+    # 流式解码结束，解析剩余的文本
+    def flush(self) -> list[dict[str, str]]:
+        lines = [self.buffer] if self.thinking == False else []
+        self.buffer = ""
+
+        return self.add_lines(lines)
+
+    # 解析并记录术语条目
+    def add_lines(self, lines: list[str]) -> list[dict[str, str]]:
+        entries = [v for v in (self.decode_line(line) for line in lines if line.strip() != "") if v is not None]
+        if len(entries) > 0 and self.first_entry_latency is None:
+            self.first_entry_latency = time.monotonic() - self.start_time
+        self.glossary.extend(entries)
+
+        return entries
\ No newline at end of file
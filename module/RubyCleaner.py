@@ -25,9 +25,16 @@ class RubyCleaner():
         (re.compile(rf'\[ruby text\s*=\s*.*?\]', flags = re.IGNORECASE), ""),
     )
 
+    # 所有规则合并而成的匹配模式，用于快速判断文本中是否包含注音
+    # 规则之间存在先后依赖，因此只在包含注音时才依次应用各条规则
+    PATTERN: re.Pattern = re.compile("|".join(f"(?:{pattern.pattern})" for pattern, _ in RULE), flags = re.IGNORECASE)
+
     @classmethod
     def clean(cls, text: str) -> str:
+        if cls.PATTERN.search(text) is None:
+            return text
+
         for pattern, replacement in cls.RULE:
-            text = re.sub(pattern, replacement, text)
+            text = pattern.sub(replacement, text)
 
         return text
\ No newline at end of file
@@ -5,6 +5,8 @@ from typing import Any
 import openpyxl
 import openpyxl.styles
 import openpyxl.worksheet.worksheet
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.worksheet._write_only import WriteOnlyWorksheet
 from PyQt5.QtCore import QModelIndex
 from PyQt5.QtCore import Qt
 from PyQt5.QtWidgets import QTableWidgetItem
@@ -18,6 +20,9 @@ class TableManager():
         REPLACEMENT = "REPLACEMENT"
         TEXT_PRESERVE = "TEXT_PRESERVE"
 
+    # 单元格样式缓存 {字号: (字体, 对齐方式)}
+    CELL_STYLES: dict[int, tuple[openpyxl.styles.Font, openpyxl.styles.Alignment]] = {}
+
     def __init__(self, type: str, data: list[dict[str, str]], table: TableWidget) -> None:
         super().__init__()
 
@@ -434,12 +439,44 @@ class TableManager():
     # 设置单元格值
     @classmethod
     def set_cell_value(cls, sheet: openpyxl.worksheet.worksheet.Worksheet, row: int, column: int, value: Any, font_size: int = 9) -> None:
+        font, alignment = cls.get_cell_style(font_size)
+
+        cell = sheet.cell(row = row, column = column)
+        cell.value = cls.clean_cell_value(value)
+        cell.font = font
+        cell.alignment = alignment
+
+    # 生成只写模式下的单元格，用于逐行写入的只写工作表
+    @classmethod
+    def generate_write_only_cell(cls, sheet: WriteOnlyWorksheet, value: Any, font_size: int = 9) -> WriteOnlyCell:
+        font, alignment = cls.get_cell_style(font_size)
+
+        cell = WriteOnlyCell(sheet, value = cls.clean_cell_value(value))
+        cell.font = font
+        cell.alignment = alignment
+
+        return cell
+
+    # 处理单元格值
+    @classmethod
+    def clean_cell_value(cls, value: Any) -> Any:
         if value is None:
             value = ""
         # 如果单元格内容以单引号 ' 开头，Excel 会将其视为普通文本而不是公式
         elif isinstance(value, str) and value.startswith("=") == True:
             value = "'" + value
 
-        sheet.cell(row = row, column = column).value = value
-        sheet.cell(row = row, column = column).font = openpyxl.styles.Font(size = font_size)
-        sheet.cell(row = row, column = column).alignment  = openpyxl.styles.Alignment(wrap_text = True, vertical = "center", horizontal = "left")
\ No newline at end of file
+        return value
+
+    # 获取单元格样式，相同字号的单元格共用同一组样式对象
+    @classmethod
+    def get_cell_style(cls, font_size: int) -> tuple[openpyxl.styles.Font, openpyxl.styles.Alignment]:
+        style = cls.CELL_STYLES.get(font_size)
+        if style is None:
+            style = (
+                openpyxl.styles.Font(size = font_size),
+                openpyxl.styles.Alignment(wrap_text = True, vertical = "center", horizontal = "left"),
+            )
+            cls.CELL_STYLES[font_size] = style
+
+        return style
\ No newline at end of file
@@ -0,0 +1,84 @@
+from collections import deque
+from typing import Iterator
+
+class Automaton():
+
+    # Aho-Corasick 多模式匹配自动机
+    # 一次扫描即可找出文本中所有模式串的出现位置，耗时与模式串数量无关
+
+    def __init__(self, patterns: list[str]) -> None:
+        super().__init__()
+
+        # 初始化
+        self.patterns: list[str] = patterns
+
+        # 节点数据，0 号节点为根节点
+        self.goto: list[dict[str, int]] = [{}]
+        self.fail: list[int] = [0]
+        self.output: list[tuple[int, ...]] = [()]
+        self.output_link: list[int] = [0]
+
+        # 构建
+        self.build()
+
+    # 构建自动机
+    def build(self) -> None:
+        # 构建字典树，空模式串无法匹配任何位置，直接跳过
+        for index, pattern in enumerate(self.patterns):
+            if pattern == "":
+                continue
+
+            node = 0
+            for char in pattern:
+                child = self.goto[node].get(char)
+                if child is None:
+                    child = len(self.goto)
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append(())
+                    self.output_link.append(0)
+                    self.goto[node][char] = child
+                node = child
+            self.output[node] = self.output[node] + (index,)
+
+        # 按层序构建失配指针与输出链接
+        queue: deque[int] = deque(self.goto[0].values())
+        while len(queue) > 0:
+            node = queue.popleft()
+            for char, child in self.goto[node].items():
+                queue.append(child)
+
+                # 第一层节点的失配指针总是指向根节点
+                if node == 0:
+                    fail = 0
+                else:
+                    fail = self.fail[node]
+                    while fail != 0 and char not in self.goto[fail]:
+                        fail = self.fail[fail]
+                    fail = self.goto[fail].get(char, 0)
+
+                self.fail[child] = fail
+                self.output_link[child] = fail if len(self.output[fail]) > 0 else self.output_link[fail]
+
+    # 遍历所有匹配结果，返回 (结束位置, 模式串索引)，结束位置不包含在匹配范围内
+    def iter(self, text: str) -> Iterator[tuple[int, int]]:
+        goto = self.goto
+        fail = self.fail
+        output = self.output
+        output_link = self.output_link
+
+        node = 0
+        for i, char in enumerate(text):
+            while node != 0 and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+
+            match = node if len(output[node]) > 0 else output_link[node]
+            while match != 0:
+                for index in output[match]:
+                    yield i + 1, index
+                match = output_link[match]
+
+    # 找出文本中出现过的所有模式串的索引
+    def search(self, text: str) -> set[int]:
+        return {index for _, index in self.iter(text)}
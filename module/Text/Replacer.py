@@ -0,0 +1,107 @@
+import re
+
+from module.Text.Automaton import Automaton
+
+class Replacer():
+
+    # 批量替换引擎，所有规则对每段文本只扫描一遍，替换结果不会再被其他规则替换
+    # 普通规则构建为一个自动机，按最左最长的原则选择不重叠的匹配结果
+    # 正则规则合并为一个匹配模式，同一位置按规则顺序选择第一个匹配的规则
+    # 包含编号反向引用的正则规则合并后会引用到错误的分组，这类规则在合并的模式之后单独应用
+    # 先应用普通规则，再应用正则规则，并记录每条规则的命中次数
+
+    # 编号反向引用与条件分组的匹配模式
+    NUMBERED_REFERENCE: re.Pattern = re.compile(r"(?<!\\)(?:\\\\)*(?:\\[1-9]|\(\?\(\d)")
+
+    def __init__(self, rules: list[tuple[str, str, bool]]) -> None:
+        super().__init__()
+
+        # 初始化，规则格式为 (原文, 替换文本, 是否为正则)，正则规则必须是有效的规则
+        self.rules: list[tuple[str, str, bool]] = rules
+        self.hits: list[int] = [0] * len(rules)
+
+        # 普通规则，相同原文的规则只有第一条生效
+        self.literal_index: dict[str, int] = {}
+        for i, (src, _, regex) in enumerate(rules):
+            if regex == False and src != "":
+                self.literal_index.setdefault(src, i)
+        self.literal_rules: list[int] = list(self.literal_index.values())
+        self.automaton: Automaton = Automaton([rules[i][0] for i in self.literal_rules]) if len(self.literal_rules) > 0 else None
+
+        # 正则规则
+        self.patterns: dict[int, re.Pattern] = {i: re.compile(src) for i, (src, _, regex) in enumerate(rules) if regex == True}
+        self.combined, self.standalone = self.combine()
+
+    # 合并正则规则，返回 (合并的匹配模式, 需要单独应用的规则)，合并失败时所有规则单独应用
+    def combine(self) -> tuple[re.Pattern | None, list[int]]:
+        combinable = [i for i in self.patterns if __class__.NUMBERED_REFERENCE.search(self.rules[i][0]) is None]
+        standalone = [i for i in self.patterns if i not in combinable]
+        if len(combinable) == 0:
+            return None, standalone
+
+        try:
+            return re.compile("|".join(f"(?P<_rule_{i}>{self.rules[i][0]})" for i in combinable)), standalone
+        except re.error:
+            return None, list(self.patterns)
+
+    # 替换
+    def replace(self, text: str) -> str:
+        if self.automaton is not None:
+            text = self.replace_literal(text)
+
+        if self.combined is not None:
+            text = self.combined.sub(self.replace_combined, text)
+
+        for i in self.standalone:
+            text, count = self.patterns[i].subn(self.rules[i][1], text)
+            self.hits[i] = self.hits[i] + count
+
+        return text
+
+    # 替换普通规则
+    def replace_literal(self, text: str) -> str:
+        # 记录每个起始位置上最长的匹配结果
+        longest: dict[int, tuple[int, int]] = {}
+        for end, index in self.automaton.iter(text):
+            start = end - len(self.automaton.patterns[index])
+            if start not in longest or end > longest[start][0]:
+                longest[start] = (end, index)
+
+        if len(longest) == 0:
+            return text
+
+        # 从左到右选择不重叠的匹配结果
+        parts: list[str] = []
+        last = 0
+        for start in sorted(longest):
+            if start < last:
+                continue
+
+            end, index = longest[start]
+            rule = self.literal_rules[index]
+            parts.append(text[last:start])
+            parts.append(self.rules[rule][1])
+            self.hits[rule] = self.hits[rule] + 1
+            last = end
+        parts.append(text[last:])
+
+        return "".join(parts)
+
+    # 替换合并的正则规则，使用规则自身的匹配模式在同一位置重新匹配，以正确展开替换文本中的分组引用
+    def replace_combined(self, match: re.Match) -> str:
+        i = int(match.lastgroup.removeprefix("_rule_"))
+        self.hits[i] = self.hits[i] + 1
+
+        dst = self.rules[i][1]
+        if "\\" not in dst:
+            return dst
+
+        result = self.patterns[i].match(match.string, match.start())
+        if result is None or result.end() != match.end():
+            return match.group(0)
+
+        return result.expand(dst)
+
+    # 获取每条规则的命中次数
+    def get_hits(self) -> list[tuple[str, str, int]]:
+        return [(src, dst, hit) for (src, dst, _), hit in zip(self.rules, self.hits)]
\ No newline at end of file
@@ -0,0 +1,149 @@
+import hashlib
+import json
+import re
+from typing import Callable
+
+from base.Base import Base
+from model.Item import Item
+from module.Config import Config
+from module.FakeNameHelper import FakeNameHelper
+from module.Localizer.Localizer import Localizer
+from module.Normalizer import Normalizer
+from module.RubyCleaner import RubyCleaner
+from module.Text.Replacer import Replacer
+
+class TextPreprocessor(Base):
+
+    # 文本预处理流水线，每次任务开始时根据配置构建一次，替换规则在构建时完成编译
+    # 所有条目在派发任务之前完成预处理，请求线程中只读取预处理的结果
+    # 相同的 (角色姓名, 原文) 只处理一次
+    # 注入伪名之前的结果与流水线指纹一起保存在条目中，继续任务时指纹一致的条目无需重新处理
+    # 伪名映射表在每次任务开始时重置，因此注入伪名总是在本次任务中完成
+
+    # 流水线的版本，预处理的逻辑发生变化时需要更新，以使已保存的预处理结果失效
+    VERSION: int = 1
+
+    def __init__(self, config: Config) -> None:
+        super().__init__()
+
+        # 初始化
+        self.config = config
+        self.results: dict[tuple[str, str], tuple[list[str], list[str]]] = {}
+
+        # 编译前置替换规则
+        rules = self.compile_replacements()
+        self.replacer: Replacer = Replacer(rules)
+
+        # 流水线指纹
+        self.fingerprint: str = self.get_fingerprint(rules)
+
+    # 计算流水线指纹，同样的版本与替换规则得到同样的预处理结果
+    def get_fingerprint(self, rules: list[tuple[str, str, bool]]) -> str:
+        data = json.dumps(
+            {
+                "version": __class__.VERSION,
+                "rules": rules,
+            },
+            indent = None,
+            ensure_ascii = False,
+        )
+
+        return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+    # 编译前置替换规则，返回 (原文, 替换文本, 是否为正则) 的列表，无效的规则会被跳过
+    def compile_replacements(self) -> list[tuple[str, str, bool]]:
+        if self.config.pre_replacement_enable == False:
+            return []
+
+        rules: list[tuple[str, str, bool]] = []
+        for v in self.config.pre_replacement_data:
+            src: str = v.get("src")
+            dst: str = v.get("dst")
+            if not isinstance(src, str) or src == "":
+                continue
+            dst = dst if isinstance(dst, str) else ""
+
+            if v.get("regex", False) != True:
+                rules.append((src, dst, False))
+            else:
+                try:
+                    re.compile(src).sub(dst, "")
+                    rules.append((src, dst, True))
+                except re.error as e:
+                    self.warning(Localizer.get().engine_task_pre_replacement_invalid.replace("{SRC}", src), e)
+
+        return rules
+
+    # 获取前置替换规则的命中次数，返回 (原文, 替换文本, 命中次数) 的列表，相同的文本只统计一次，复用已保存的结果时不统计
+    def get_replacement_hits(self) -> list[tuple[str, str, int]]:
+        return self.replacer.get_hits()
+
+    # 预处理所有条目，返回预处理结果发生变化的条目
+    def prepare(self, items: list[Item], progress: Callable[[int, int], None] = None) -> list[Item]:
+        changed: list[Item] = []
+        for i, item in enumerate(items):
+            if item.get_preprocessed_src(self.fingerprint) is None:
+                changed.append(item)
+
+            self.process(item)
+            progress(i + 1, len(items)) if progress is not None else None
+
+        return changed
+
+    # 获取条目的预处理结果
+    def get(self, items: list[Item]) -> list[str]:
+        srcs: list[str] = []
+        for item in items:
+            srcs.extend(self.process(item))
+
+        return srcs
+
+    # 预处理单个条目，结果保存在条目中，不修改条目的原文
+    def process(self, item: Item) -> list[str]:
+        name: str = item.get_first_name_src()
+        key = (name, item.get_src())
+        result = self.results.get(key)
+        if result is None:
+            lines = item.get_preprocessed_src(self.fingerprint)
+            if lines is None:
+                lines = self.preprocess(name, item.get_src())
+
+            # 注入伪名
+            result = (lines, [FakeNameHelper.inject(line) for line in lines])
+            self.results[key] = result
+
+        lines, srcs = result
+        if item.get_preprocessed_src(self.fingerprint) is None:
+            item.set_preprocessed_src(self.fingerprint, lines)
+
+        return srcs
+
+    # 预处理文本，返回注入伪名之前的结果
+    def preprocess(self, name: str, src: str) -> list[str]:
+        # 注入姓名，只注入到预处理的结果中
+        text: str = src if name is None else f"【{name}】{src}"
+
+        # 拆分文本
+        lines: list[str] = []
+        for line in text.split("\n"):
+            # 正规化
+            line = Normalizer.normalize(line)
+
+            # 清理注音
+            line = RubyCleaner.clean(line)
+
+            # 前置替换
+            line = self.pre_replacement(line)
+
+            if line == "":
+                pass
+            elif line.strip() == "":
+                pass
+            else:
+                lines.append(line)
+
+        return lines
+
+    # 前置替换
+    def pre_replacement(self, src: str) -> str:
+        return self.replacer.replace(src)
\ No newline at end of file
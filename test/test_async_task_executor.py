@@ -0,0 +1,75 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from module.Engine.AsyncTaskExecutor import AsyncTaskExecutor
+from module.Engine.Engine import Engine
+
+class TestAsyncTaskExecutor(unittest.TestCase):
+
+    def test_callbacks_run_off_the_event_loop(self) -> None:
+        threads: list[threading.Thread] = []
+        results: list[int] = []
+        done = threading.Event()
+
+        async def task() -> int:
+            threads.append(threading.current_thread())
+            return 1
+
+        def callback(future) -> None:
+            # 阻塞的回调不应影响事件循环中的其他任务
+            time.sleep(0.2)
+            results.append(future.result())
+            threads.append(threading.current_thread())
+            done.set()
+
+        with AsyncTaskExecutor(max_workers = 4) as executor:
+            executor.submit(task).add_done_callback(callback)
+            self.assertTrue(done.wait(5.0))
+
+        self.assertEqual(results, [1])
+        self.assertIs(threads[0], executor.thread)
+        self.assertIsNot(threads[1], executor.thread)
+
+    def test_blocking_callbacks_do_not_serialize_tasks(self) -> None:
+        async def task() -> None:
+            await asyncio.sleep(0.1)
+
+        def callback(future) -> None:
+            time.sleep(0.3)
+
+        start_time = time.monotonic()
+        with AsyncTaskExecutor(max_workers = 8) as executor:
+            for _ in range(AsyncTaskExecutor.CALLBACK_WORKERS):
+                executor.submit(task).add_done_callback(callback)
+
+        # 回调并行执行，总耗时远小于逐个执行的耗时
+        self.assertLess(time.monotonic() - start_time, 0.1 + 0.3 * 2)
+
+    def test_task_counted_until_callbacks_finish(self) -> None:
+        counts: list[int] = []
+
+        async def task() -> None:
+            await asyncio.sleep(0.1)
+
+        def callback(future) -> None:
+            counts.append(Engine.get().get_running_task_count())
+
+        with AsyncTaskExecutor(max_workers = 4) as executor:
+            executor.submit(task).add_done_callback(callback)
+
+        self.assertEqual(counts, [1])
+        self.assertEqual(Engine.get().get_running_task_count(), 0)
+
+    def test_exception_propagates(self) -> None:
+        async def task() -> None:
+            raise ValueError("error")
+
+        with AsyncTaskExecutor(max_workers = 4) as executor:
+            future = executor.submit(task)
+
+        self.assertIsInstance(future.exception(), ValueError)
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
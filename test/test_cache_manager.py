@@ -0,0 +1,60 @@
+import os
+import tempfile
+import unittest
+
+from model.Item import Item
+from model.Project import Project
+from module.CacheManager import CacheManager
+
+class TestCacheManager(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.folder = tempfile.TemporaryDirectory()
+        self.output_folder = self.folder.name
+        self.journal_path = f"{self.output_folder}/cache/items.journal"
+
+        self.project = Project()
+        self.items = [Item(src = f"src_{i}") for i in range(4)]
+        self.cache_manager = CacheManager(service = False)
+        self.cache_manager.set_items(self.items)
+        self.cache_manager.save_to_file(self.project, self.items, self.output_folder)
+
+    def tearDown(self) -> None:
+        self.cache_manager.wait_for_compact()
+        self.folder.cleanup()
+
+    def load(self) -> list[Item]:
+        cache_manager = CacheManager(service = False)
+        cache_manager.load_from_file(self.output_folder)
+        return cache_manager.get_items()
+
+    def test_checkpoint_appends_dirty_items(self) -> None:
+        self.items[1].set_dst("dst_1")
+        self.cache_manager.mark_dirty([self.items[1]])
+        self.cache_manager.checkpoint(self.project, self.output_folder)
+
+        self.assertEqual(self.cache_manager.dirty, set())
+        self.assertEqual(self.cache_manager.journal_count, 1)
+        self.assertEqual([item.get_dst() for item in self.load()], ["", "dst_1", "", ""])
+
+    def test_failed_append_keeps_dirty_items(self) -> None:
+        # 日志文件路径被目录占用，追加必然失败
+        os.makedirs(self.journal_path)
+
+        self.items[2].set_dst("dst_2")
+        self.cache_manager.mark_dirty([self.items[2]])
+        self.cache_manager.checkpoint(self.project, self.output_folder)
+
+        self.assertEqual(self.cache_manager.dirty, {2})
+        self.assertEqual(self.cache_manager.journal_count, 0)
+        self.assertIsNone(self.cache_manager.compact_thread)
+
+        # 恢复后在下次保存时重新写入
+        os.rmdir(self.journal_path)
+        self.cache_manager.checkpoint(self.project, self.output_folder)
+
+        self.assertEqual(self.cache_manager.dirty, set())
+        self.assertEqual([item.get_dst() for item in self.load()], ["", "", "dst_2", ""])
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
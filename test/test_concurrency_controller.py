@@ -0,0 +1,97 @@
+import unittest
+
+from base.Base import Base
+from module.Engine.ConcurrencyController import ConcurrencyController
+
+class FakeClock():
+
+    def __init__(self) -> None:
+        self.now: float = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+class TestConcurrencyController(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.clock = FakeClock()
+        self.controller = ConcurrencyController(max_limit = 16, clock = self.clock)
+
+    # 每次间隔足够长的时间，避免受到冷却时间的影响
+    def release(self, error_type: Base.RequestError, latency: float = 1.0, retry_after: float = None, step: float = 0.0) -> None:
+        self.clock.now = self.clock.now + step
+        self.controller.release(latency, error_type, retry_after)
+
+    def test_additive_increase(self) -> None:
+        self.release(Base.RequestError.RATE_LIMIT)
+        self.assertEqual(self.controller.get_limit(), 8)
+
+        # 一轮并发全部成功后上限增加约 1
+        for _ in range(8):
+            self.release(Base.RequestError.NONE)
+        self.assertAlmostEqual(self.controller.limit, 9.0, delta = 0.1)
+
+        # 不超过最大并发数
+        for _ in range(1000):
+            self.release(Base.RequestError.NONE)
+        self.assertEqual(self.controller.get_limit(), 16)
+
+    def test_multiplicative_decrease_on_rate_limit(self) -> None:
+        self.release(Base.RequestError.RATE_LIMIT, retry_after = 3.0)
+        self.assertEqual(self.controller.limit, 16 * ConcurrencyController.DECREASE_RATIO_RATE_LIMIT)
+
+        # 等待服务端要求的时间之后才能派发新的任务
+        self.assertFalse(self.controller.acquire(timeout = 0))
+        self.clock.now = 3.0
+        self.assertTrue(self.controller.acquire(timeout = 0))
+
+    def test_multiplicative_decrease_on_timeout(self) -> None:
+        self.release(Base.RequestError.TIMEOUT)
+        self.assertEqual(self.controller.limit, 16 * ConcurrencyController.DECREASE_RATIO_ERROR)
+
+        # 冷却时间内不重复下降
+        self.release(Base.RequestError.TIMEOUT, step = 1.0)
+        self.assertEqual(self.controller.limit, 16 * ConcurrencyController.DECREASE_RATIO_ERROR)
+
+        self.release(Base.RequestError.SERVER, step = ConcurrencyController.DECREASE_COOLDOWN)
+        self.assertEqual(self.controller.limit, 16 * ConcurrencyController.DECREASE_RATIO_ERROR ** 2)
+
+        # 不低于 1
+        for _ in range(100):
+            self.release(Base.RequestError.RATE_LIMIT, step = ConcurrencyController.DECREASE_COOLDOWN)
+        self.assertEqual(self.controller.limit, 1.0)
+
+    def test_client_error_keeps_limit(self) -> None:
+        self.release(Base.RequestError.CLIENT)
+        self.assertEqual(self.controller.limit, 16.0)
+
+    def test_latency_spike_decreases(self) -> None:
+        for _ in range(20):
+            self.release(Base.RequestError.NONE, latency = 1.0, step = 1.0)
+        self.assertEqual(self.controller.limit, 16.0)
+
+        for _ in range(20):
+            self.release(Base.RequestError.NONE, latency = 5.0, step = 1.0)
+        self.assertLess(self.controller.limit, 16.0)
+
+    def test_baseline_drift(self) -> None:
+        for _ in range(20):
+            self.release(Base.RequestError.NONE, latency = 1.0, step = 1.0)
+        self.assertAlmostEqual(self.controller.latency_baseline, 1.0)
+
+        # 延迟缓慢升高时基线跟随当前延迟，上限保持不变
+        latency = 1.0
+        for _ in range(400):
+            latency = latency * 1.005
+            self.release(Base.RequestError.NONE, latency = latency, step = 1.0)
+        self.assertGreater(latency, ConcurrencyController.LATENCY_RATIO * 3)
+        self.assertGreater(self.controller.latency_baseline, latency / ConcurrencyController.LATENCY_RATIO)
+        self.assertEqual(self.controller.limit, 16.0)
+
+        # 出现更低的延迟时基线立即下降
+        for _ in range(50):
+            self.release(Base.RequestError.NONE, latency = 0.5, step = 1.0)
+        self.assertLess(self.controller.latency_baseline, 1.0)
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
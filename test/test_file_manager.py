@@ -0,0 +1,62 @@
+import json
+import os
+import tempfile
+import unittest
+
+from module.Config import Config
+from module.File.FileManager import FileManager
+from module.File.KVJSON import KVJSON
+from module.File.MESSAGEJSON import MESSAGEJSON
+from module.File.TXT import TXT
+
+class TestFileManager(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.folder = tempfile.TemporaryDirectory()
+        self.config = Config(input_folder = self.folder.name, output_folder = self.folder.name)
+
+    def tearDown(self) -> None:
+        self.folder.cleanup()
+
+    def write(self, name: str, data: str | dict | list) -> str:
+        path = f"{self.folder.name}/{name}"
+        with open(path, "w", encoding = "utf-8") as writer:
+            writer.write(data if isinstance(data, str) else json.dumps(data, ensure_ascii = False))
+
+        return path
+
+    # 与逐个读取器依次读取所有文件的结果比较
+    def assert_same_as_sequential(self, paths: list[str]) -> None:
+        expected = (
+            TXT(self.config).read_from_path([v for v in paths if v.endswith(".txt")])
+            + KVJSON(self.config).read_from_path([v for v in paths if v.endswith(".json")])
+            + MESSAGEJSON(self.config).read_from_path([v for v in paths if v.endswith(".json")])
+        )
+        result = list(FileManager(self.config).generate_items(paths))
+
+        self.assertEqual(
+            [(v.get_file_type(), v.get_file_path(), v.get_row(), v.get_src()) for v in result],
+            [(v.get_file_type(), v.get_file_path(), v.get_row(), v.get_src()) for v in expected],
+        )
+
+    def test_interleaved_json_formats_keep_reader_order(self) -> None:
+        paths = [
+            self.write("a.json", [{"message": "message_a_0"}, {"message": "message_a_1"}]),
+            self.write("b.json", {"kv_b_0": "", "kv_b_1": ""}),
+            self.write("c.txt", "line_c_0\nline_c_1"),
+            self.write("d.json", [{"message": "message_d_0"}]),
+            self.write("e.json", {"kv_e_0": ""}),
+        ]
+
+        self.assert_same_as_sequential(paths)
+
+    def test_process_pool_keeps_reader_order(self) -> None:
+        paths = [
+            self.write(f"{i:02}.json", [{"message": f"message_{i}"}] if i % 2 == 0 else {f"kv_{i}": ""})
+            for i in range(FileManager.PROCESS_POOL_THRESHOLD + 2)
+        ]
+
+        self.assert_same_as_sequential(paths)
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,51 @@
+import concurrent.futures
+import threading
+import unittest
+from unittest import mock
+
+from base.Base import Base
+from module.Engine.NERAnalyzer.NERAnalyzer import NERAnalyzer
+
+class TestNERAnalyzerCallback(unittest.TestCase):
+
+    # 不启动缓存管理器的定时任务，也不注册事件，只初始化回调用到的属性
+    def setUp(self) -> None:
+        self.analyzer = NERAnalyzer.__new__(NERAnalyzer)
+        self.analyzer.lock = threading.Lock()
+        self.analyzer.controller = mock.Mock()
+        self.analyzer.task_limiter = mock.Mock()
+        self.analyzer.cache_manager = mock.MagicMock()
+        self.analyzer.glossary = mock.Mock()
+        self.analyzer.config = mock.Mock()
+        self.analyzer.extras = {}
+        self.analyzer.emit = mock.Mock()
+        self.analyzer.error = mock.Mock()
+
+        self.task = mock.Mock(key = "a", error_type = Base.RequestError.NONE, token_estimate = 10, items = [])
+
+    # 模拟重试计时器立即触发，任务以新的密钥重新派发并覆盖请求结果
+    def redispatch(self, task) -> bool:
+        task.key = "b"
+        task.error_type = Base.RequestError.NONE
+        return True
+
+    def callback(self, result: dict) -> None:
+        future = concurrent.futures.Future()
+        future.set_result(result)
+        with mock.patch.object(NERAnalyzer, "retry_task", side_effect = self.redispatch):
+            self.analyzer.task_done_callback(future, self.task, None, mock.Mock())
+
+    def test_adjust_uses_key_of_finished_attempt(self) -> None:
+        self.callback({"input_tokens": 20, "output_tokens": 5})
+
+        self.analyzer.task_limiter.adjust.assert_called_once_with(15, key = "a")
+        self.analyzer.error.assert_not_called()
+
+    def test_failed_attempt_not_adjusted_after_redispatch(self) -> None:
+        self.task.error_type = Base.RequestError.RATE_LIMIT
+        self.callback({})
+
+        self.analyzer.task_limiter.adjust.assert_not_called()
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
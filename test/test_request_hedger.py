@@ -0,0 +1,96 @@
+import threading
+import time
+import unittest
+from unittest import mock
+
+from base.Base import Base
+from module.Config import Config
+from module.Engine.Engine import Engine
+from module.Engine.KeyPool import KeyPool
+from module.Engine.RequestHedger import RequestHedger
+from module.Engine.TaskRequester import TaskRequester
+
+class TestRequestHedger(unittest.TestCase):
+
+    # 近期请求耗时均为 50ms，对冲的等待时间同样为 50ms
+    def setUp(self) -> None:
+        RequestHedger.reset(0.95, 1.0)
+        for _ in range(RequestHedger.MIN_SAMPLES):
+            RequestHedger.record(0.05)
+
+        self.config = Config(request_hedge_enable = True)
+        self.platform = {"api_key": ["a", "b"]}
+        self.pool = KeyPool(["a", "b"])
+        self.calls: list[str] = []
+        self.lock = threading.Lock()
+
+    # 模拟单个请求，第一个请求为主请求，流式请求每收到一段就检查是否被取消
+    def fake_request_once(self, durations: tuple[float, float]):
+        test = self
+
+        def request_once(self: TaskRequester, messages: list[dict], key: str = None, pool: KeyPool = None) -> tuple[bool, str, str, int, int]:
+            with test.lock:
+                index = len(test.calls)
+                test.calls.append(key)
+
+            self.key = key
+            self.error_type = Base.RequestError.NONE
+            deadline = time.monotonic() + durations[index]
+            while time.monotonic() < deadline:
+                if self.cancelled == True:
+                    self.error_type = Base.RequestError.OTHER
+                    return True, None, None, None, None
+                time.sleep(0.005)
+
+            self.latency = durations[index]
+            return False, "", f"result_{index}", 1, 1
+
+        return request_once
+
+    def test_slow_primary_issues_one_hedge_and_hedge_wins(self) -> None:
+        requester = TaskRequester(self.config, self.platform)
+        with mock.patch.object(TaskRequester, "request_once", self.fake_request_once((2.0, 0.1))):
+            start_time = time.monotonic()
+            response = requester.request([], "a", self.pool)
+            elapsed = time.monotonic() - start_time
+
+        self.assertEqual(response, (False, "", "result_1", 1, 1))
+        self.assertEqual(len(self.calls), 2)
+        self.assertEqual(self.calls[0], "a")
+        self.assertEqual(requester.key, self.calls[1])
+        self.assertEqual(RequestHedger.get_stats(), (1, 1))
+        self.assertLess(elapsed, 1.0)
+
+        # 对冲请求结束后不再计入引擎的任务数量
+        time.sleep(0.05)
+        self.assertEqual(Engine.get().get_running_task_count(), 0)
+
+    def test_fast_primary_issues_no_hedge(self) -> None:
+        requester = TaskRequester(self.config, self.platform)
+        with mock.patch.object(TaskRequester, "request_once", self.fake_request_once((0.0, 0.0))):
+            response = requester.request([], "a", self.pool)
+
+        self.assertEqual(response, (False, "", "result_0", 1, 1))
+        self.assertEqual(self.calls, ["a"])
+        self.assertEqual(RequestHedger.get_stats(), (0, 0))
+
+    def test_primary_runs_on_calling_thread(self) -> None:
+        threads: list[str] = []
+        fake = self.fake_request_once((0.2, 0.5))
+
+        def request_once(self: TaskRequester, *args) -> tuple[bool, str, str, int, int]:
+            threads.append(threading.current_thread().name)
+            return fake(self, *args)
+
+        requester = TaskRequester(self.config, self.platform)
+        with mock.patch.object(TaskRequester, "request_once", request_once):
+            response = requester.request([], "a", self.pool)
+
+        # 主请求先成功，对冲请求被取消
+        self.assertEqual(response, (False, "", "result_0", 1, 1))
+        self.assertEqual(threads[0], threading.current_thread().name)
+        self.assertTrue(threads[1].startswith("HEDGE_"))
+        self.assertEqual(RequestHedger.get_stats(), (1, 0))
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
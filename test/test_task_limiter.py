@@ -0,0 +1,120 @@
+import unittest
+
+from base.Base import Base
+from module.Engine.Engine import Engine
+from module.Engine.TaskLimiter import TaskLimiter
+
+class FakeClock():
+
+    def __init__(self) -> None:
+        self.now: float = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now = self.now + seconds
+
+class TestTaskLimiter(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.clock = FakeClock()
+        Engine.get().set_status(Base.TaskStatus.NERING)
+
+    def tearDown(self) -> None:
+        Engine.get().set_status(Base.TaskStatus.IDLE)
+
+    def create(self, rps: int = 0, rpm: int = 0, tpm: int = 0, burst: float = None) -> TaskLimiter:
+        return TaskLimiter(rps = rps, rpm = rpm, tpm = tpm, burst = burst, clock = self.clock, sleep = self.clock.sleep)
+
+    def test_rpm_refill_per_key(self) -> None:
+        limiter = self.create(rpm = 60, burst = 2.0)
+
+        # 每个密钥的突发量为 2 个请求，用完后每秒恢复 1 个
+        self.assertEqual(limiter.try_acquire(key = "a"), 0)
+        self.assertEqual(limiter.try_acquire(key = "a"), 0)
+        self.assertAlmostEqual(limiter.try_acquire(key = "a"), 1.0)
+
+        # 其他密钥不受影响
+        self.assertEqual(limiter.try_acquire(key = "b"), 0)
+
+        self.clock.now = 0.5
+        self.assertAlmostEqual(limiter.try_acquire(key = "a"), 0.5)
+        self.clock.now = 1.0
+        self.assertEqual(limiter.try_acquire(key = "a"), 0)
+        self.assertGreater(limiter.try_acquire(key = "a"), 0)
+
+    def test_tpm_refill_per_key(self) -> None:
+        limiter = self.create(tpm = 6000, burst = 1.0)
+
+        # 容量为 100 个 Token，每秒恢复 100 个
+        self.assertEqual(limiter.try_acquire(tokens = 100, key = "a"), 0)
+        self.assertAlmostEqual(limiter.try_acquire(tokens = 50, key = "a"), 0.5)
+        self.assertEqual(limiter.try_acquire(tokens = 100, key = "b"), 0)
+
+        self.clock.now = 0.5
+        self.assertEqual(limiter.try_acquire(tokens = 50, key = "a"), 0)
+
+    def test_burst_cap(self) -> None:
+        limiter = self.create(rpm = 60, burst = 3.0)
+
+        # 长时间空闲后最多积攒 3 秒的额度
+        self.clock.now = 3600.0
+        for _ in range(3):
+            self.assertEqual(limiter.try_acquire(), 0)
+        self.assertAlmostEqual(limiter.try_acquire(), 1.0)
+
+        # 同时设置每秒限制时，突发量不超过每秒的限制
+        limiter = self.create(rps = 2, rpm = 600, burst = 6.0)
+        self.clock.now = 7200.0
+        self.assertEqual(limiter.try_acquire(), 0)
+        self.assertEqual(limiter.try_acquire(), 0)
+        self.assertGreater(limiter.try_acquire(), 0)
+
+    def test_oversized_request_passes_when_full(self) -> None:
+        limiter = self.create(tpm = 6000, burst = 1.0)
+
+        # 超过容量的请求在令牌桶装满时放行
+        self.assertEqual(limiter.try_acquire(tokens = 500, key = "a"), 0)
+        self.assertAlmostEqual(limiter.try_acquire(tokens = 500, key = "a"), 5.0)
+
+    def test_debt_repayment_after_adjust(self) -> None:
+        limiter = self.create(tpm = 6000, burst = 1.0)
+
+        # 预估 50 个 Token，实际消耗 250 个，欠额需要先还清
+        self.assertEqual(limiter.try_acquire(tokens = 50, key = "a"), 0)
+        limiter.adjust(200, key = "a")
+        self.assertAlmostEqual(limiter.try_acquire(tokens = 50, key = "a"), 2.0)
+
+        # 实际消耗少于预估时返还，但不超过容量
+        limiter.adjust(-1000, key = "a")
+        self.assertEqual(limiter.try_acquire(tokens = 100, key = "a"), 0)
+        self.assertGreater(limiter.try_acquire(tokens = 1, key = "a"), 0)
+
+    def test_wait_sleeps_until_refilled(self) -> None:
+        limiter = self.create(rpm = 60, burst = 1.0)
+
+        self.assertTrue(limiter.wait(key = "a"))
+        self.assertTrue(limiter.wait(key = "a"))
+        self.assertAlmostEqual(self.clock.now, 1.0)
+        self.assertTrue(all(v <= TaskLimiter.SLEEP_SLICE for v in self.clock.sleeps))
+
+    def test_stop_wakes_waiter(self) -> None:
+        limiter = self.create(rpm = 1, burst = 1.0)
+        self.assertTrue(limiter.wait(key = "a"))
+
+        # 需要等待 60 秒，第二次休眠后停止任务，等待应当在下一个时间片内结束
+        def sleep(seconds: float) -> None:
+            self.clock.sleep(seconds)
+            if len(self.clock.sleeps) == 2:
+                Engine.get().set_status(Base.TaskStatus.STOPPING)
+        limiter.sleep = sleep
+
+        self.assertFalse(limiter.wait(key = "a"))
+        self.assertEqual(len(self.clock.sleeps), 2)
+        self.assertLessEqual(self.clock.now, 2 * TaskLimiter.SLEEP_SLICE)
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
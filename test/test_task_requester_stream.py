@@ -0,0 +1,104 @@
+import unittest
+from unittest import mock
+
+import httpx
+import openai
+
+from base.Base import Base
+from module.Config import Config
+from module.Engine.TaskRequester import TaskRequester
+
+class FakeStream():
+
+    def __init__(self, chunks: list[openai.types.chat.ChatCompletionChunk]) -> None:
+        self.chunks = chunks
+        self.closed = False
+
+    def __iter__(self):
+        return iter(self.chunks)
+
+    def close(self) -> None:
+        self.closed = True
+
+class FakeClient():
+
+    # 模拟 OpenAI 兼容接口，reject_stream_options 为 True 时拒绝 stream_options 参数
+    def __init__(self, text: str, reject_stream_options: bool = False) -> None:
+        self.text = text
+        self.reject_stream_options = reject_stream_options
+        self.calls: list[dict] = []
+        self.chat = self
+        self.completions = self
+
+    def create(self, **kwargs) -> FakeStream | openai.types.chat.ChatCompletion:
+        self.calls.append(kwargs)
+        if self.reject_stream_options == True and "stream_options" in kwargs:
+            response = httpx.Response(400, request = httpx.Request("POST", "http://localhost/v1/chat/completions"))
+            raise openai.BadRequestError("Unrecognized request argument supplied: stream_options", response = response, body = None)
+
+        if kwargs.get("stream") != True:
+            return openai.types.chat.ChatCompletion.model_validate({
+                "id": "0",
+                "object": "chat.completion",
+                "created": 0,
+                "model": "sakura",
+                "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": self.text}}],
+                "usage": {"prompt_tokens": 3, "completion_tokens": 5, "total_tokens": 8},
+            })
+
+        # 每个字符作为一段流式回复
+        chunks = [
+            openai.types.chat.ChatCompletionChunk.model_validate({
+                "id": "0",
+                "object": "chat.completion.chunk",
+                "created": 0,
+                "model": "sakura",
+                "choices": [{"index": 0, "delta": {"content": char}}],
+            })
+            for char in self.text
+        ]
+        return FakeStream(chunks)
+
+class TestTaskRequesterStream(unittest.TestCase):
+
+    TEXT: str = "  ダリヤ -> 达莉亚\nヴォルフ -> 沃尔夫  \n"
+
+    def setUp(self) -> None:
+        TaskRequester.reset()
+
+    def request(self, client: FakeClient, api_format: Base.APIFormat, stream: bool) -> tuple[bool, str, str, int, int]:
+        config = Config(stream_request_enable = stream)
+        platform = {"api_url": "http://localhost/v1", "api_format": api_format, "model": "sakura", "thinking": False}
+        requester = TaskRequester(config, platform)
+        with mock.patch.object(TaskRequester, "get_client", return_value = client):
+            return requester.request_once([{"role": "user", "content": ""}], key = "k")
+
+    def test_sakura_stream_matches_non_stream(self) -> None:
+        streamed = self.request(FakeClient(__class__.TEXT), Base.APIFormat.SAKURALLM, stream = True)
+        non_streamed = self.request(FakeClient(__class__.TEXT), Base.APIFormat.SAKURALLM, stream = False)
+
+        self.assertFalse(streamed[0])
+        self.assertEqual(streamed[1:3], non_streamed[1:3])
+        self.assertEqual(streamed[2], "{\"0\": \"ダリヤ -> 达莉亚\", \"1\": \"ヴォルフ -> 沃尔夫\"}")
+
+    def test_stream_options_dropped_when_rejected(self) -> None:
+        client = FakeClient("{}", reject_stream_options = True)
+        response = self.request(client, Base.APIFormat.OPENAI, stream = True)
+
+        self.assertFalse(response[0])
+        self.assertIn("stream_options", client.calls[0])
+        self.assertNotIn("stream_options", client.calls[1])
+
+        # 记住不支持该参数的接口，之后不再发送
+        self.request(client, Base.APIFormat.OPENAI, stream = True)
+        self.assertEqual(len(client.calls), 3)
+        self.assertNotIn("stream_options", client.calls[2])
+
+    def test_stream_options_sent_when_accepted(self) -> None:
+        client = FakeClient("{}")
+        self.request(client, Base.APIFormat.OPENAI, stream = True)
+
+        self.assertEqual(client.calls[0].get("stream_options"), {"include_usage": True})
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file